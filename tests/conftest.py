@@ -0,0 +1,25 @@
+import pytest
+
+import veertrace
+from dumps import RANDOM_CYCLES, writeRandomDump
+
+
+# opens a new random dump of every signal (see writeRandomDump) without a
+# cache, further options going to VCDHandler
+@pytest.fixture(scope="session")
+def openRandom(tmp_path_factory):
+    def openRandom(cycles=RANDOM_CYCLES, overrides=None, **options):
+        path = str(tmp_path_factory.mktemp("random") / "random.vcd")
+        writeRandomDump(path, cycles, overrides=overrides)
+        return veertrace.VCDHandler(path, use_cache=False, **options)
+    return openRandom
+
+# the random dump a test module runs on, modules needing other signals override it
+@pytest.fixture(scope="module")
+def source(openRandom):
+    return openRandom()
+
+# values of every signal at every cycle of source
+@pytest.fixture(scope="module")
+def rows(source):
+    return [source.getValueDict(cycle) for cycle in range(source.final_cycle + 1)]
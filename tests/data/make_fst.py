@@ -0,0 +1,93 @@
+# Regenerates the FST fixtures: design.vcd and the same changes written as FST by
+# GTKWave's fstapi writer (through pylibfst), once per pack type, with aliases,
+# with each alias as a separate variable, split into several value change blocks
+# and repacked as a whole:
+#   pip install pylibfst && python tests/data/make_fst.py
+import os
+import random
+
+from pylibfst import ffi, lib
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TOP  = "TOP.tb_top.rvtop.VeeR."
+CYCLES = 300
+
+# reference: (width, VCD identifier), references sharing an identifier are aliases
+VARIABLES = {
+    TOP + "clk"                                        : (1,  "!"),
+    TOP + "dec.decode.freeze"                          : (1,  "\""),
+    TOP + "dec.decode.flush_final_e3"                  : (1,  "\""),
+    TOP + "dec.decode.dec_i0_decode_d"                 : (1,  "#"),
+    TOP + "dec.ib.ibval[3:0]"                          : (4,  "$"),
+    TOP + "dec.arf.gpr_banks[0].gpr[1].gprff.dout[31:0]" : (32, "%"),
+    TOP + "dec.arf.gpr_banks[0].gpr[1].gprff.en"       : (1,  "&"),
+    TOP + "dec.arf.gpr_banks[0].gpr[2].gprff.dout[31:0]" : (32, "'"),
+    "TOP.tb_top.wide[69:0]"                            : (70, "("),
+}
+WIDTHS = {ident: width for width, ident in VARIABLES.values()}
+
+def changes():
+    rnd = random.Random(7)
+    signals = [ident for ident in sorted(WIDTHS) if ident != "!"]
+    yield 0, [("!", "0")] + [(ident, "x" * WIDTHS[ident] if ident in ("'", "(") else "0") for ident in signals]
+    for cycle in range(CYCLES):
+        yield 10 * cycle + 5, [("!", "1")]
+        values = []
+        for ident in signals:
+            if rnd.random() < 0.4:
+                width = WIDTHS[ident]
+                if rnd.random() < 0.05:
+                    values.append((ident, "".join(rnd.choice("01xz") for _ in range(width))))
+                else:
+                    values.append((ident, format(rnd.getrandbits(width), "0{}b".format(width))))
+        yield 10 * cycle + 6, values
+        yield 10 * cycle + 10, [("!", "0")]
+
+def writeVCD(path):
+    lines = ["$timescale 1ns $end"]
+    for reference, (width, ident) in VARIABLES.items():
+        scopes = reference.split(".")[:-1]
+        lines += ["$scope module {} $end".format(scope) for scope in scopes]
+        lines.append("$var wire {} {} {} $end".format(width, ident, reference.split(".")[-1]))
+        lines += ["$upscope $end"] * len(scopes)
+    lines.append("$enddefinitions $end")
+    for time, values in changes():
+        lines.append("#{}".format(time))
+        for ident, value in values:
+            lines.append(value + ident if WIDTHS[ident] == 1 else "b{} {}".format(value, ident))
+    with open(path, "w") as fd:
+        fd.write("\n".join(lines) + "\n")
+
+def writeFST(path, pack, aliases=True, flush_every=None, repack=False):
+    writer = lib.fstWriterCreate(path.encode(), 1)
+    lib.fstWriterSetPackType(writer, pack)
+    lib.fstWriterSetTimescale(writer, -9)
+    lib.fstWriterSetRepackOnClose(writer, int(repack))
+    handles = {}
+    for reference, (width, ident) in VARIABLES.items():
+        scopes = reference.split(".")[:-1]
+        for scope in scopes:
+            lib.fstWriterSetScope(writer, lib.FST_ST_VCD_MODULE, scope.encode(), ffi.NULL)
+        alias = handles[ident][0] if aliases and ident in handles else 0
+        handle = lib.fstWriterCreateVar(writer, lib.FST_VT_VCD_WIRE, lib.FST_VD_IMPLICIT, width, reference.split(".")[-1].encode(), alias)
+        if not alias:
+            handles.setdefault(ident, []).append(handle)
+        for _ in scopes:
+            lib.fstWriterSetUpscope(writer)
+    for n, (time, values) in enumerate(changes()):
+        lib.fstWriterEmitTimeChange(writer, time)
+        for ident, value in values:
+            for handle in handles[ident]:
+                lib.fstWriterEmitValueChange(writer, handle, value.encode())
+        if flush_every and n % flush_every == flush_every - 1:
+            lib.fstWriterFlushContext(writer)
+    lib.fstWriterClose(writer)
+
+if __name__ == "__main__":
+    writeVCD(os.path.join(HERE, "design.vcd"))
+    for pack, name in ((0, "zlib"), (1, "fastlz"), (2, "lz4")):
+        writeFST(os.path.join(HERE, "design_{}.fst".format(name)), pack)
+    writeFST(os.path.join(HERE, "design_noalias.fst"), 0, aliases=False)
+    writeFST(os.path.join(HERE, "design_blocks.fst"), 2, flush_every=150)
+    writeFST(os.path.join(HERE, "design_repacked.fst"), 1, flush_every=200, repack=True)
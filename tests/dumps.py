@@ -0,0 +1,89 @@
+import random
+import re
+
+import veertrace
+
+
+# cycles of the random dumps the index tests run on
+RANDOM_CYCLES = 300
+
+# writes a VCD of the given cycles with a 10 time unit clock period, rising at
+# 5 + 10 * cycle, or rising at the given edges (at least 3 apart). signals maps
+# references (without the clock) to (width, value of cycle), values change 1
+# after the rising edge. With comments, $comment blocks holding lines that look
+# like timestamps are spread in between
+def writeDump(path, signals, cycles, comments=False, edges=None):
+    clock = veertrace.VEER_TOP + "clk"
+    references = [clock] + list(signals)
+    idents = {reference: _ident(i) for i, reference in enumerate(references)}
+    widths = dict((reference, width) for reference, (width, _) in signals.items())
+    widths[clock] = 1
+
+    lines = ["$timescale 1ns $end"]
+    scope = []
+    for reference in sorted(references):
+        path_, name = reference.rsplit(".", 1)
+        target = path_.split(".")
+        common = 0
+        while common < min(len(scope), len(target)) and scope[common] == target[common]:
+            common += 1
+        lines += ["$upscope $end"] * (len(scope) - common)
+        lines += ["$scope module {} $end".format(part) for part in target[common:]]
+        scope = target
+        lines.append("$var wire {} {} {} $end".format(widths[reference], idents[reference], name))
+    lines += ["$upscope $end"] * len(scope)
+    lines += ["$enddefinitions $end", "#0", "$dumpvars"]
+    lines += [_change(idents[reference], widths[reference], 0) for reference in references]
+    lines.append("$end")
+
+    for cycle in range(cycles):
+        edge = edges[cycle] if edges else 10 * cycle + 5
+        lines += ["#{}".format(edge), _change(idents[clock], 1, 1)]
+        if comments and cycle % 7 == 1:
+            lines += ["$comment", "#999", "#{}".format(edge + 2), "$end"]
+        lines.append("#{}".format(edge + 1))
+        lines += [_change(idents[reference], width, value(cycle)) for reference, (width, value) in signals.items()]
+        if comments and cycle % 11 == 2:
+            lines.append("$comment #1 $end")
+        lines += ["#{}".format(edge + 2 if edges else edge + 5), _change(idents[clock], 1, 0)]
+    with open(path, "w") as fd:
+        fd.write("\n".join(lines) + "\n")
+
+def _ident(i):
+    return "".join(chr(33 + digit) for digit in _digits(i + 1))
+
+def _digits(n):
+    digits = []
+    while n:
+        n, digit = divmod(n - 1, 94)
+        digits.append(digit)
+    return digits
+
+def _change(ident, width, value):
+    if width == 1:
+        return "{}{}".format(value & 1, ident)
+    return "b{:b} {}".format(value, ident)
+
+# writes a dump of every signal the viewer reads, with random values: each
+# signal changes in about a third of the cycles, to one of a few values of its
+# own so that PCs and registers repeat, single bits mostly to 0. overrides maps
+# keys to (value of cycle), for signals a test needs to control
+def writeRandomDump(path, cycles=RANDOM_CYCLES, seed=1, overrides=None):
+    overrides = overrides or {}
+    rnd = random.Random(seed)
+    source = veertrace.WaveformSource()
+    signals = {}
+    for key, reference in source.signals.items():
+        if key == "clk":
+            continue
+        match = re.search(r"\[(\d+):(\d+)\]$", reference)
+        width = int(match.group(1)) - int(match.group(2)) + 1 if match else 1
+        if key in overrides:
+            signals[reference] = (width, overrides[key])
+            continue
+        pool = [0, 0, 0, 0, 0, 1] if width == 1 else [rnd.getrandbits(width) for _ in range(6)]
+        values = [0]
+        for cycle in range(cycles):
+            values.append(rnd.choice(pool) if rnd.random() < 0.35 else values[-1])
+        signals[reference] = (width, values[1:].__getitem__)
+    writeDump(path, signals, cycles)
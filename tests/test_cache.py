@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+import pytest
+
+import veertrace
+from dumps import writeDump
+
+
+CLK = veertrace.VEER_TOP + "clk"
+X1  = veertrace.VEER_GPR + "gpr[1].gprff.dout[31:0]"
+X2  = veertrace.VEER_GPR + "gpr[2].gprff.dout[31:0]"
+
+SIGNALS = {
+    X1 : (32, lambda cycle: cycle * 13),
+    X2 : (32, lambda cycle: cycle // 3),
+}
+
+@pytest.fixture
+def dump(tmp_path):
+    path = str(tmp_path / "cached.vcd")
+    writeDump(path, SIGNALS, 50)
+    return path
+
+def readTracks(path):
+    tracks = veertrace.VCDStreamReader(path, [CLK, X1, X2]).read()
+    return tracks, veertrace.SignalStore.fromTracks(tracks.values())
+
+def checkLoaded(loaded, tracks, store):
+    assert loaded is not None
+    cached, cached_store, meta = loaded
+    assert meta == {"timescale": "1ns"}
+    assert np.array_equal(cached_store.times, store.times) and np.array_equal(cached_store.values, store.values)
+    for reference, track in tracks.items():
+        assert np.array_equal(cached[reference].times, track.times)
+        assert np.array_equal(cached[reference].values, track.values)
+
+def testHandlerReadsCache(dump, tmp_path, monkeypatch):
+    parsed = veertrace.VCDHandler(dump, cache_dir=str(tmp_path / "cache"))
+    assert len(os.listdir(tmp_path / "cache")) == 1
+    monkeypatch.setattr(veertrace.VCDStreamReader, "read", lambda self, *args: pytest.fail("dump parsed again"))
+    cached = veertrace.VCDHandler(dump, cache_dir=str(tmp_path / "cache"))
+    assert cached.final_cycle == parsed.final_cycle
+    assert [cached.getValueDict(cycle) for cycle in range(50)] == [parsed.getValueDict(cycle) for cycle in range(50)]
+
+# column offsets whose digits grow once the header holds them, across all lengths of
+# a header that does not pad them to an alignment
+def testHeaderLengthSettles(dump, tmp_path, monkeypatch):
+    monkeypatch.setattr(veertrace, "TRACE_CACHE_ALIGN", 1)
+    tracks, store = readTracks(dump)
+    cache = veertrace.TraceCache(dump, tracks, str(tmp_path / "cache"))
+    for padding in range(0, 1200, 7):
+        cache.save(tracks, store, {"timescale": "1ns", "padding": "x" * padding})
+        loaded = cache.load()
+        loaded[2].pop("padding")
+        checkLoaded(loaded, tracks, store)
+
+def testChangedDumpInvalidatesCache(dump, tmp_path):
+    tracks, store = readTracks(dump)
+    cache_dir = str(tmp_path / "cache")
+    veertrace.TraceCache(dump, tracks, cache_dir).save(tracks, store, {"timescale": "1ns"})
+    checkLoaded(veertrace.TraceCache(dump, tracks, cache_dir).load(), tracks, store)
+    # other signals
+    assert veertrace.TraceCache(dump, [CLK, X1], cache_dir).load() is None
+    # same contents, newer mtime
+    stat = os.stat(dump)
+    os.utime(dump, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert veertrace.TraceCache(dump, tracks, cache_dir).load() is None
+    # same size and mtime, other contents
+    with open(dump, "r+b") as fd:
+        fd.seek(-2, os.SEEK_END)
+        fd.write(b"1" if fd.read(1) == b"0" else b"0")
+    os.utime(dump, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert veertrace.TraceCache(dump, tracks, cache_dir).load() is None
+
+# the cache goes next to the dump, or to TRACE_CACHE_DIR where it cannot be written
+def testFallbackCacheDirectory(dump, tmp_path, monkeypatch):
+    fallback = str(tmp_path / "home")
+    monkeypatch.setattr(veertrace, "TRACE_CACHE_DIR", fallback)
+    tracks, store = readTracks(dump)
+    assert veertrace.TraceCache(dump, tracks).save(tracks, store, {"timescale": "1ns"}) == dump + veertrace.TRACE_CACHE_SUFFIX
+    os.remove(dump + veertrace.TRACE_CACHE_SUFFIX)
+
+    os.mkdir(dump + veertrace.TRACE_CACHE_SUFFIX)
+    path = veertrace.TraceCache(dump, tracks).save(tracks, store, {"timescale": "1ns"})
+    assert os.path.dirname(path) == fallback
+    checkLoaded(veertrace.TraceCache(dump, tracks).load(), tracks, store)
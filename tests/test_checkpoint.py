@@ -0,0 +1,62 @@
+import veertrace
+from dumps import writeDump
+
+
+CLK  = veertrace.VEER_TOP + "clk"
+X1   = veertrace.VEER_GPR + "gpr[1].gprff.dout[31:0]"
+X1EN = veertrace.VEER_GPR + "gpr[1].gprff.en"
+
+SIGNALS = {
+    X1   : (32, lambda cycle: cycle * 13),
+    X1EN : (1,  lambda cycle: int(cycle % 3 != 0)),
+}
+
+def writeCommentedDump(path):
+    writeDump(path, SIGNALS, 60, comments=True)
+
+def testTimestampsInCommentsAreSkipped(tmp_path):
+    path = str(tmp_path / "commented.vcd")
+    writeCommentedDump(path)
+    references = [CLK, X1, X1EN]
+    full = veertrace.VCDStreamReader(path, references).read()
+    # small chunks so comments also straddle block boundaries
+    for chunk_size in (64, 1 << 20):
+        index = veertrace.CheckpointIndex(path, references, CLK, 2, chunk_size)
+        assert 999 not in index.cp_times.tolist()
+        assert index.edges.tolist() == [10 * cycle + 5 for cycle in range(60)]
+        for time in range(0, 610):
+            for reference in references:
+                assert index.valueAt(reference, time) == full[reference][time], (reference, time)
+
+def testIndexedHandlerMatchesFullParse(tmp_path):
+    path = str(tmp_path / "commented.vcd")
+    writeCommentedDump(path)
+    full = veertrace.VCDHandler(path, use_cache=False, indexed=False)
+    indexed = veertrace.VCDHandler(path, indexed=True, index_interval=3)
+    assert indexed.final_cycle == full.final_cycle == 59
+    for cycle in range(full.final_cycle + 1):
+        assert indexed.getValueDict(cycle) == full.getValueDict(cycle), cycle
+
+# in index mode the searched signals are extracted on demand into tracks of their own
+def testIndexedSearchMatchesFullParse(tmp_path):
+    path = str(tmp_path / "commented.vcd")
+    writeCommentedDump(path)
+    full = veertrace.VCDHandler(path, use_cache=False, indexed=False)
+    indexed = veertrace.VCDHandler(path, indexed=True, index_interval=3)
+    for text in ("x1_en", "x1 > 300 and not x1_en", "x1 & 4"):
+        expected = full.getConditionIndex(veertrace.SignalCondition(text, full.signals)).cycles()
+        found = indexed.getConditionIndex(veertrace.SignalCondition(text, indexed.signals)).cycles()
+        assert found.tolist() == expected.tolist(), text
+    assert indexed.sampleKey("x1", [0, 5, 59]).tolist() == full.sampleKey("x1", [0, 5, 59]).tolist()
+
+def testIndexClosesDump(tmp_path):
+    path = str(tmp_path / "commented.vcd")
+    writeCommentedDump(path)
+    with veertrace.CheckpointIndex(path, [CLK, X1], CLK, 2) as index:
+        # the first lookup may go backwards from where no cursor is yet
+        assert index.valueAt(X1, 0) == 0
+        assert index.valueAt(X1, 106) == 13 * 10
+    assert index._fd.closed and index._mm.closed
+    with veertrace.VCDHandler(path, indexed=True) as handler:
+        assert handler.getValueDict(11)["x1"] == 13 * 10
+    assert handler.index._mm.closed
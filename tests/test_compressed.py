@@ -0,0 +1,79 @@
+import bz2
+import gzip
+import lzma
+import shutil
+import subprocess
+
+import pytest
+
+import veertrace
+from dumps import writeRandomDump
+
+
+# stdlib writers, zst is written by the zstd tool
+COMPRESSORS = {".gz": gzip.open, ".xz": lzma.open, ".bz2": bz2.open, ".zst": None}
+
+@pytest.fixture(scope="module")
+def dump(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("compressed") / "random.vcd")
+    writeRandomDump(path, 100)
+    with open(path, "rb") as fd:
+        return path, fd.read()
+
+def compressed(dump, suffix):
+    path, data = dump
+    if suffix == ".zst" and shutil.which("zstd") is None:
+        pytest.skip("no zstd tool")
+    if suffix == ".zst":
+        subprocess.run(["zstd", "-qf", "-o", path + suffix], input=data, check=True)
+    else:
+        with COMPRESSORS[suffix](path + suffix, "wb") as fd:
+            fd.write(data)
+    return path + suffix
+
+# reads of any size give the dump back, across the chunks of the decompressing thread
+@pytest.mark.parametrize("suffix", sorted(COMPRESSORS))
+def testReadSizes(dump, suffix):
+    path = compressed(dump, suffix)
+    for size in (1, 1000, 4096, 5000, len(dump[1]) + 1):
+        with veertrace.openDump(path, chunk_size=4096) as fd:
+            chunks = []
+            while True:
+                chunk = fd.read(size)
+                if not chunk:
+                    break
+                assert len(chunk) <= size
+                chunks.append(chunk)
+        assert all(len(chunk) == size for chunk in chunks[:-1])
+        assert b"".join(chunks) == dump[1]
+    with veertrace.openDump(path, chunk_size=4096) as fd:
+        assert fd.read(10) == dump[1][:10]
+        assert fd.read() == dump[1][10:]
+        assert fd.read(10) == b""
+
+@pytest.mark.parametrize("suffix", sorted(COMPRESSORS))
+def testCompressedMatchesPlain(dump, suffix):
+    path = compressed(dump, suffix)
+    plain = veertrace.VCDHandler(dump[0], use_cache=False)
+    handler = veertrace.VCDHandler(path, use_cache=False)
+    assert handler.final_cycle == plain.final_cycle
+    for cycle in range(0, plain.final_cycle + 1, 7):
+        assert handler.getValueDict(cycle) == plain.getValueDict(cycle)
+
+# the zstd tool is waited for when the reader closes early, and fails loudly on a bad file
+def testZstdProcessIsReaped(dump, tmp_path, monkeypatch):
+    if shutil.which("zstd") is None:
+        pytest.skip("no zstd tool")
+    monkeypatch.setattr(veertrace, "zstandard", None)
+    path = compressed(dump, ".zst")
+    stream = veertrace._zstdOpen(path)
+    assert stream.read(100) == dump[1][:100]
+    stream.close()
+    assert stream._process.returncode is not None
+
+    broken = str(tmp_path / "broken.vcd.zst")
+    with open(broken, "wb") as fd:
+        fd.write(b"not zstd at all")
+    with pytest.raises(ValueError, match="zstd exited"):
+        with veertrace.openDump(broken) as fd:
+            fd.read()
@@ -0,0 +1,36 @@
+import pytest
+
+import veertrace
+from dumps import writeDump
+
+# rising edges of an uneven clock whose first edge is well after t=0
+EDGES = [37, 40, 52, 55, 90, 200, 203, 1000]
+
+X1 = veertrace.WaveformSource().signals["x1"]
+
+@pytest.fixture(scope="module")
+def dump(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("cycles") / "uneven.vcd")
+    writeDump(path, {X1: (32, lambda cycle: 3 * cycle + 1)}, len(EDGES), edges=EDGES)
+    return path
+
+@pytest.fixture(scope="module", params=[False, True], ids=["parsed", "indexed"])
+def source(dump, request):
+    return veertrace.VCDHandler(dump, use_cache=False, indexed=request.param, index_interval=3)
+
+def testCyclesAreRisingEdges(source):
+    assert source.final_cycle == len(EDGES) - 1
+    assert list(source.edges) == EDGES
+    assert [source.cycleTime(cycle) for cycle in range(len(EDGES))] == EDGES
+
+def testCycleAt(source):
+    for time in range(EDGES[-1] + 20):
+        # the last edge at or before time, cycle 0 before the first one
+        assert source.cycleAt(time) == max(len([edge for edge in EDGES if edge <= time]) - 1, 0)
+    assert source.cycleAt(-1) == 0
+    assert source.cycleAt(10 ** 9) == source.final_cycle
+
+def testValuesSampledAtEdges(source):
+    # x1 is written 1 after every edge, so a cycle sees the value of the one before
+    assert [source.getValueDict(cycle)["x1"] for cycle in range(source.final_cycle + 1)] == \
+           [0] + [3 * cycle + 1 for cycle in range(source.final_cycle)]
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+import veertrace
+
+
+# every field of the table against the CycleFrame of its cycle, over several
+# chunks of columns
+def testCycleTableMatchesFrames(source, monkeypatch):
+    monkeypatch.setattr(veertrace, "CYCLE_TABLE_CHUNK", 64)
+    table = veertrace.cycleTable(source)
+    assert len(table) == source.final_cycle + 1
+    fields = [name for name in table.dtype.names if name not in ("cycle", "time", "bypass")]
+    for cycle, row in enumerate(table):
+        frame = source.getFrame(cycle)
+        assert (row["cycle"], row["time"]) == (cycle, frame.time)
+        for name in fields:
+            assert np.array_equal(np.asarray(getattr(frame, name)).astype(np.int64), row[name].astype(np.int64)), (cycle, name)
+
+def testCycleTableBypassPaths(source):
+    table = veertrace.cycleTable(source)
+    for i, text in enumerate(veertrace.BYPASS_PATHS.values()):
+        cycles = source.getConditionIndex(veertrace.SignalCondition(text, source.signals)).cycles()
+        assert np.flatnonzero(table["bypass"][:, i]).tolist() == cycles.tolist(), text
+    assert dict(zip(veertrace.BYPASS_PATHS, table["bypass"].sum(axis=0).tolist())) == veertrace.bypassStatistics(source)
+
+def testCycleTableWindow(source):
+    assert np.array_equal(veertrace.cycleTable(source, 37, 150), veertrace.cycleTable(source)[37:151])
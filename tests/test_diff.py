@@ -0,0 +1,54 @@
+import pytest
+
+import veertrace
+from dumps import RANDOM_CYCLES
+
+
+# runs of the same random dump, x5 or the i0 retired PC differing from a cycle on.
+# The changes of a cycle are sampled at the next one
+RUNS = {
+    "base" : {},
+    "x5"   : {"x5": lambda cycle: cycle * 3 + (cycle >= 120)},
+    "pc"   : {"i0_pc_e5": lambda cycle: cycle * 2 + (cycle >= 150)},
+}
+
+@pytest.fixture(scope="module")
+def runs(openRandom):
+    sources = {}
+    for name, overrides in RUNS.items():
+        overrides = dict({"x5": lambda cycle: cycle * 3, "i0_pc_e5": lambda cycle: cycle * 2}, **overrides)
+        sources[name] = openRandom(overrides=overrides)
+    return sources
+
+@pytest.mark.parametrize("align", veertrace.DIFF_ALIGNMENTS)
+def testSameRunsDoNotDiverge(runs, align):
+    diff = veertrace.TraceDiff(runs["base"], runs["base"], align)
+    assert diff.nextDivergence() is None
+    assert all(not diff.fieldsAt(cycle) for cycle in range(RANDOM_CYCLES))
+    assert all(diff.alignedCycle(cycle) == cycle for cycle in range(RANDOM_CYCLES))
+
+def testCycleDivergence(runs):
+    diff = veertrace.TraceDiff(runs["base"], runs["x5"], "cycle")
+    assert diff.nextDivergence() == 121
+    assert diff.nextDivergence(121) is None
+    assert diff.previousDivergence(200) == 121
+    assert diff.fieldsAt(120) == []
+    assert diff.fieldsAt(121) == diff.fieldsAt(RANDOM_CYCLES - 1) == ["x5"]
+
+# compared after every cycle an instruction retires in
+def testRetiredGPRDivergence(runs):
+    retired = runs["base"].getRetireIndex().cycles.tolist()
+    first = min(cycle + 1 for cycle in retired if cycle + 1 >= 121)
+    diff = veertrace.TraceDiff(runs["base"], runs["x5"], "retire")
+    assert diff.nextDivergence() == first
+    assert diff.fieldsAt(first) == ["x5"]
+    assert diff.fieldsAt(first - 1) == []
+
+def testRetiredPCDivergence(runs):
+    base = runs["base"]
+    first = min(cycle for cycle in range(151, base.final_cycle + 1) if
+                base.getValueDict(cycle)["e5d.i0valid"] and not base.getValueDict(cycle)["freeze"])
+    diff = veertrace.TraceDiff(base, runs["pc"], "retire")
+    assert diff.nextDivergence() == first
+    assert "retired_pc" in diff.fieldsAt(first)
+    assert not diff.fieldsAt(first - 1)
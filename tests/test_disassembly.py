@@ -0,0 +1,108 @@
+import os
+import re
+import threading
+
+import pytest
+
+import veertrace
+
+PROGRAM = os.path.join(os.path.dirname(__file__), "data", "program.dis")
+
+# the lookup the viewer used to do: a dict of instruction texts by zero padded
+# PC string, where only the exact first byte of an instruction is found
+def _oldInstructions(file):
+    instructions = {}
+    with open(file, "r") as fd:
+        for line in fd:
+            if re.match(r"\s*[0-9a-fA-F]+:\s+[0-9a-fA-f]+\s+\w+", line):
+                pc = re.sub(r"\s|:", "", re.match(r"\s*[0-9a-fA-F]+:", line).group())
+                pc = (8-len(pc))*'0' + pc
+                instructions[pc] = re.sub(r"\s+", " ", re.sub(r"^\s+", "", re.search(r"\s+[a-zA-Z.]+\s+.*", line).group()))
+    return instructions
+
+@pytest.fixture(scope="module")
+def disassembly():
+    return veertrace.DisassemblyHandler(PROGRAM)
+
+def testParsedProgram(disassembly):
+    assert disassembly.symbols == {"_start": 0x80000000, "trap_vector": 0x80000014, "main": 0x8000001c,
+                                   "square.part.0": 0x80000030, "handler$1": 0x80000100}
+    assert len(disassembly.pcs) == 18
+    assert list(disassembly.sizes[:6]) == [4, 4, 4, 4, 2, 2]
+    assert disassembly._getInstruction(0x80000008) == "addi sp,sp,-8 # 80001000 <stack_top>"
+    assert disassembly._getInstruction(0x80000024) == "jal ra,80000030 <square.part.0>"
+    assert disassembly._getInstruction(0x80000014) == "mret"
+
+def testInstructionsMatchOldLookup(disassembly):
+    old = _oldInstructions(PROGRAM)
+    assert len(old) == len(disassembly.pcs) == 18
+    for pc in range(0x7ffffff0, 0x80000110):
+        text = disassembly._getInstruction(pc)
+        if "{:08x}".format(pc) in old:
+            assert text == old["{:08x}".format(pc)].strip()
+        elif text != "invalid":
+            # PCs between the first and the last byte of an instruction find it
+            start = max(start for start in disassembly.pcs if start < pc)
+            assert pc - start < disassembly.sizes[disassembly.pcs.index(start)]
+            assert text == old["{:08x}".format(start)].strip()
+
+def testPCsInsideInstructions(disassembly):
+    # 4 byte instructions
+    for pc in range(0x80000000, 0x80000004):
+        assert disassembly._getInstruction(pc) == "li ra,0"
+    assert disassembly._getInstruction(0x80000033) == "mul a0,a0,a0"
+    # compressed instructions
+    assert disassembly._getInstruction(0x80000010) == disassembly._getInstruction(0x80000011) == "nop"
+    assert disassembly._getInstruction(0x8000001d) == "addi sp,sp,-16"
+    assert disassembly._getInstruction(0x8000001e) == "sw ra,12(sp)"
+    assert disassembly.getMnemonic(0x8000002d) == "ret"
+    # before the first instruction, after the last and in the gap between sections
+    for pc in (0x7fffffff, 0x80000036, 0x800000ff, 0x80000104):
+        assert disassembly._getInstruction(pc) == "invalid"
+        assert disassembly.getMnemonic(pc) == "invalid"
+
+def testSymbolRanges(disassembly):
+    assert disassembly.getSymbol(0x7fffffff) is None
+    assert disassembly.getSymbol(0x80000000) == ("_start", 0)
+    assert disassembly.getSymbol(0x80000013) == ("_start", 0x13)
+    assert disassembly.getSymbol(0x8000002c) == ("main", 0x10)
+    # a symbol reaches until the next one, over the gap between sections
+    assert disassembly.getSymbol(0x800000fe) == ("square.part.0", 0xce)
+    assert disassembly.getSymbol(0x90000000) == ("handler$1", 0xfffff00)
+    assert disassembly.getSymbolText(0x80000030) == "square.part.0"
+    assert disassembly.getSymbolText(0x80000024) == "main+0x8"
+    assert disassembly.getSymbolText(0x7fffffff) == ""
+
+# every line cut at a block boundary is completed by the next block
+@pytest.mark.parametrize("block", [1, 7, 16, 37, 64, 333])
+def testLinesAcrossBlocks(disassembly, monkeypatch, block):
+    monkeypatch.setattr(veertrace, "DISASSEMBLY_BLOCK", block)
+    blocks = veertrace.DisassemblyHandler(PROGRAM)
+    assert blocks.symbols == disassembly.symbols
+    assert list(blocks.pcs) == list(disassembly.pcs)
+    assert list(blocks.sizes) == list(disassembly.sizes)
+    assert blocks.mnemonics == disassembly.mnemonics
+    assert blocks.operands == disassembly.operands
+
+def testUnterminatedLastLine(disassembly, tmp_path):
+    path = tmp_path / "program.dis"
+    with open(PROGRAM, "r") as fd:
+        path.write_text(fd.read().rstrip("\n"))
+    assert list(veertrace.DisassemblyHandler(str(path)).pcs) == list(disassembly.pcs)
+
+def testBackgroundLoading(disassembly, monkeypatch):
+    gate = threading.Event()
+    parse = veertrace.DisassemblyHandler._parseFile
+    monkeypatch.setattr(veertrace.DisassemblyHandler, "_parseFile", lambda self, file: gate.wait() and parse(self, file))
+    loading = veertrace.DisassemblyHandler(PROGRAM, background=True)
+    try:
+        assert loading.isLoading()
+        assert loading._getInstruction(0x80000000) == loading.getMnemonic(0x80000000) == "loading…"
+        assert loading.getSymbol(0x80000000) is None and loading.getSymbolText(0x80000000) == ""
+    finally:
+        gate.set()
+    loading.requireLoaded()
+    assert not loading.isLoading()
+    assert loading._getInstruction(0x80000000) == "li ra,0"
+    assert loading.getSymbolText(0x80000024) == "main+0x8"
+    assert loading.symbols == disassembly.symbols
@@ -0,0 +1,47 @@
+import random
+
+import numpy as np
+import pytest
+
+import veertrace
+from dumps import RANDOM_CYCLES
+
+
+# the events over many signals would be active all along on random values
+def sparse(seed):
+    rnd = random.Random(seed)
+    return [int(rnd.random() < 0.03) for _ in range(RANDOM_CYCLES)].__getitem__
+
+@pytest.fixture(scope="module")
+def source(openRandom):
+    keys = veertrace.EVENT_TYPES["bypass"][0] + veertrace.EVENT_TYPES["lsu_bypass"][0]
+    return openRandom(overrides={key: sparse(i) for i, key in enumerate(keys)})
+
+# each event against its signals read cycle by cycle
+@pytest.mark.parametrize("event", sorted(veertrace.EVENT_TYPES))
+def testEventIndexMatchesCycles(source, rows, event):
+    keys, zero = veertrace.EVENT_TYPES[event]
+    active = [any((row[key] == 0) if zero else (row[key] != 0) for key in keys) for row in rows]
+    cycles = [cycle for cycle, value in enumerate(active) if value]
+    starts = [cycle for cycle in cycles if cycle == 0 or not active[cycle - 1]]
+    index = source.getEventIndex(event)
+
+    assert index.cycles().tolist() == cycles
+    assert index.starts.tolist() == starts
+    assert index.count() == len(cycles)
+    assert index.count(50, 149) == len([cycle for cycle in cycles if 50 <= cycle <= 149])
+    for cycle in range(-1, len(rows) + 1):
+        assert index.active(cycle) == (0 <= cycle < len(rows) and active[cycle])
+        assert index.next(cycle) == min([start for start in starts if start > cycle], default=None)
+        assert index.previous(cycle) == max([start for start in starts if start < cycle], default=None)
+        assert index.nextActive(cycle) == min([other for other in cycles if other > cycle], default=None)
+        assert index.previousActive(cycle) == max([other for other in cycles if other < cycle], default=None)
+
+def testUnionMergesAdjacentStretches():
+    low = veertrace.EventIndex.fromChanges([np.array([0, 12, 30])], [np.array([False, True, False])], np.arange(0, 100, 2))
+    high = veertrace.EventIndex.fromChanges([np.array([0, 30, 40])], [np.array([False, True, False])], np.arange(0, 100, 2))
+    union = veertrace.EventIndex.union([low, high])
+    assert (low.starts.tolist(), low.ends.tolist()) == ([6], [14])
+    assert (high.starts.tolist(), high.ends.tolist()) == ([15], [19])
+    assert (union.starts.tolist(), union.ends.tolist()) == ([6], [19])
+    assert len(veertrace.EventIndex.union([])) == 0
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+import veertrace
+
+
+DATA = os.path.join(os.path.dirname(__file__), "data")
+TOP  = veertrace.VEER_TOP
+
+# the signals of tests/data/design.vcd, freeze and flush_final_e3 being aliases
+REFERENCES = [
+    TOP + "clk",
+    TOP + "dec.decode.freeze",
+    TOP + "dec.decode.flush_final_e3",
+    TOP + "dec.decode.dec_i0_decode_d",
+    TOP + "dec.ib.ibval[3:0]",
+    TOP + "dec.arf.gpr_banks[0].gpr[1].gprff.dout[31:0]",
+    TOP + "dec.arf.gpr_banks[0].gpr[1].gprff.en",
+    TOP + "dec.arf.gpr_banks[0].gpr[2].gprff.dout[31:0]",
+    "TOP.tb_top.wide[69:0]",
+]
+
+# the same changes written by GTKWave's fstapi, see tests/data/make_fst.py
+FST_FIXTURES = [
+    "design_zlib.fst",          # zlib value changes, aliases
+    "design_fastlz.fst",        # FastLZ
+    "design_lz4.fst",           # LZ4, LZ4 hierarchy
+    "design_noalias.fst",       # every reference its own handle
+    "design_blocks.fst",        # several value change blocks
+    "design_repacked.fst",      # gzip wrapped whole, FastLZ blocks
+]
+
+def readTracks(reader):
+    tracks = reader.read()
+    veertrace._freezeTracks(tracks.values())
+    return tracks
+
+@pytest.fixture(scope="module")
+def vcdTracks():
+    return readTracks(veertrace.VCDStreamReader(os.path.join(DATA, "design.vcd"), REFERENCES))
+
+@pytest.mark.parametrize("fixture", FST_FIXTURES)
+def testFSTReaderMatchesVCDReader(fixture, vcdTracks):
+    reader = veertrace.FSTReader(os.path.join(DATA, fixture), REFERENCES)
+    tracks = readTracks(reader)
+    assert sorted(tracks) == sorted(REFERENCES)
+    assert reader.timescale == "1ns"
+    assert reader.end_time == 3000
+    for reference in REFERENCES:
+        assert tracks[reference].size == vcdTracks[reference].size, reference
+        for time in range(0, 3010):
+            assert tracks[reference][time] == vcdTracks[reference][time], (reference, time)
+    aliased = tracks[TOP + "dec.decode.freeze"] is tracks[TOP + "dec.decode.flush_final_e3"]
+    assert aliased == (fixture != "design_noalias.fst")
+
+@pytest.mark.parametrize("fixture", ["design_lz4.fst", "design_repacked.fst"])
+def testFSTHandlerMatchesVCDHandler(fixture):
+    vcd = veertrace.openWaveform(os.path.join(DATA, "design.vcd"), use_cache=False)
+    fst = veertrace.openWaveform(os.path.join(DATA, fixture), use_cache=False)
+    assert isinstance(fst, veertrace.FSTHandler)
+    assert fst.final_cycle == vcd.final_cycle == 299
+    assert fst.edges.tolist() == vcd.edges.tolist()
+    for cycle in range(vcd.final_cycle + 1):
+        assert fst.getValueDict(cycle) == vcd.getValueDict(cycle), cycle
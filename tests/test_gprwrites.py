@@ -0,0 +1,35 @@
+import pytest
+
+# (cycle, value, PC) of every write of each register, read cycle by cycle
+@pytest.fixture(scope="module")
+def writes(source, rows):
+    writes = {}
+    for i in range(1, 32):
+        writes[i] = []
+        for cycle, values in enumerate(rows):
+            if values["x{}_en".format(i)]:
+                pc = -1
+                for p in range(2):
+                    if values["i{}_wen_wb".format(p)] and values["e5_i{}_rd".format(p)] == i:
+                        pc = (values["i{}_pc_e5".format(p)] << 1) & 0xFFFFFFFF
+                writes[i].append((cycle, rows[min(cycle + 1, source.final_cycle)]["x{}".format(i)], pc))
+    return writes
+
+def testGPRWriteIndexMatchesCycles(source, writes):
+    index = source.getGPRWriteIndex()
+    assert any(pc != -1 for register in writes for _, _, pc in writes[register])
+    assert any(pc == -1 for register in writes for _, _, pc in writes[register])
+    for register in range(1, 32):
+        assert index.count(register) == len(writes[register])
+        cycles, values, pcs = index.writes(register)
+        assert list(zip(cycles.tolist(), values.tolist(), pcs.tolist())) == writes[register]
+
+@pytest.mark.parametrize("register", [1, 5, 17, 31])
+def testGPRWriteLookups(source, writes, register):
+    index = source.getGPRWriteIndex()
+    for cycle in range(source.final_cycle + 2):
+        before = [write for write in writes[register] if write[0] < cycle]
+        assert index.lastWrite(register, cycle) == (before[-1] if before else None)
+    for first, last in ((0, source.final_cycle), (37, 150), (80, 80), (150, 37)):
+        cycles, values, pcs = index.writes(register, first, last)
+        assert list(zip(cycles.tolist(), values.tolist(), pcs.tolist())) == [write for write in writes[register] if first <= write[0] <= last]
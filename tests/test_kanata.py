@@ -0,0 +1,88 @@
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+import veertrace
+from dumps import writeRandomDump
+
+FIRST  = 0x80000010
+SECOND = 0x80000014
+
+# values of every exported signal by the cycle they are seen at: FIRST is
+# fetched at cycle 2, goes through E1..E5 from 3 to 7 and writes x5, SECOND
+# follows a cycle behind and is flushed from E2 by flush_final_e3 at cycle 5
+def _pipeline():
+    seen = {key: {} for key in veertrace.KanataExporter(veertrace.WaveformSource()).keys}
+    for pc, fetch in ((FIRST, 2), (SECOND, 3)):
+        seen["ibval"][fetch] = 1
+        seen["dec_i0_pc_d"][fetch] = pc >> 1
+        seen["dec_i0_decode_d"][fetch] = 1
+    for stage in range(1, 6):
+        seen["e{}d.i0valid".format(stage)][2 + stage] = 1
+        seen["i0_pc_e{}".format(stage)][2 + stage] = FIRST >> 1
+    for stage in range(1, 3):
+        seen["e{}d.i0valid".format(stage)][3 + stage] = 1
+        seen["i0_pc_e{}".format(stage)][3 + stage] = SECOND >> 1
+    seen["flush_final_e3"][5] = 1
+    seen["i0_wen_wb"][7] = 1
+    seen["e5_i0_rd"][7] = 5
+    # a value written in a cycle is seen from the next one on
+    return {key: (lambda cycle, values=values: values.get(cycle + 1, 0)) for key, values in seen.items()}
+
+EXPECTED = """Kanata\t0004
+C=\t0
+C\t2
+I\t0\t0\t0
+L\t0\t0\t80000010
+S\t0\t0\tIB
+C\t1
+S\t0\t0\tE1
+I\t1\t1\t0
+L\t1\t0\t80000014
+S\t1\t0\tIB
+C\t1
+S\t0\t0\tE2
+S\t1\t0\tE1
+C\t1
+S\t0\t0\tE3
+S\t1\t0\tE2
+C\t1
+S\t0\t0\tE4
+R\t1\t0\t1
+C\t1
+S\t0\t0\tE5
+L\t0\t1\twb x5
+C\t1
+R\t0\t0\t0
+"""
+
+@pytest.fixture(scope="module")
+def dump(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("kanata") / "pipeline.vcd")
+    writeRandomDump(path, 12, overrides=_pipeline())
+    return path
+
+@pytest.fixture(scope="module")
+def source(dump):
+    return veertrace.VCDHandler(dump, use_cache=False)
+
+def testExportPipeline(source):
+    fd = io.StringIO()
+    assert veertrace.KanataExporter(source).export(fd) == 2
+    assert fd.getvalue() == EXPECTED
+
+def testExportWindow(source):
+    fd = io.StringIO()
+    assert veertrace.KanataExporter(source).export(fd, 5, 7) == 2
+    assert fd.getvalue() == "\n".join(["Kanata\t0004", "C=\t5", "I\t0\t0\t0", "L\t0\t0\t80000010", "S\t0\t0\tE3",
+                                      "I\t1\t1\t0", "L\t1\t0\t80000014", "S\t1\t0\tE2", "C\t1", "S\t0\t0\tE4", "R\t1\t0\t1",
+                                      "C\t1", "S\t0\t0\tE5", "L\t0\t1\twb x5"]) + "\n"
+
+def testKanataScript(dump, tmp_path):
+    output = tmp_path / "pipeline.log"
+    script = os.path.join(os.path.dirname(veertrace.__file__), "veerkanata.py")
+    subprocess.run([sys.executable, script, dump, "-o", str(output)], check=True)
+    assert output.read_text() == EXPECTED
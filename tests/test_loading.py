@@ -0,0 +1,63 @@
+import os
+import threading
+
+import pytest
+
+import veertrace
+
+
+DATA = os.path.join(os.path.dirname(__file__), "data")
+FIRST_GROUPS = ("IB", "IFU", "GPR")
+FREEZE = veertrace.VEER_DEC_DECODE + "freeze"
+
+# holds the background read of the pending groups until the test lets it go,
+# and records the references every reader is asked for
+@pytest.fixture
+def gated(monkeypatch):
+    reads = []
+    gate = threading.Event()
+    for backend in (veertrace.VCDStreamReader, veertrace.FSTReader):
+        def read(self, *args, read=backend.read):
+            if reads:
+                gate.wait()
+            reads.append(set(self.references))
+            return read(self, *args)
+        monkeypatch.setattr(backend, "read", read)
+    return reads, gate
+
+# the first read only parses the signals of the groups asked for, the other
+# groups read as pending (0) until the background read of their signals is in
+@pytest.mark.parametrize("dump", ["design.vcd", "design_lz4.fst"])
+def testFirstGroupsAreReadFirst(gated, dump):
+    reads, gate = gated
+    path = os.path.join(DATA, dump)
+    full = veertrace.openWaveform(path, use_cache=False)
+    del reads[:]
+
+    lazy = veertrace.openWaveform(path, use_cache=False, groups=FIRST_GROUPS)
+    first = set(lazy._groupSignals(FIRST_GROUPS + ("CLK",)))
+    assert reads == [first]
+    assert lazy.isLoading() and "DECODE" in lazy.pending_groups and "GPR" not in lazy.pending_groups
+    assert FREEZE not in lazy.tracks
+    frozen = next(cycle for cycle in range(full.final_cycle + 1) if full.getValueDict(cycle)["freeze"])
+    assert lazy.getValueDict(frozen)["x1"] == full.getValueDict(frozen)["x1"]
+    assert lazy.getValueDict(frozen)["freeze"] == 0
+
+    gate.set()
+    lazy.requireGroups(["DECODE"])
+    assert reads == [first, set(veertrace.WaveformSource().signals.values()) - first]
+    assert lazy.pending_groups == []
+    for cycle in range(full.final_cycle + 1):
+        assert lazy.getValueDict(cycle) == full.getValueDict(cycle), cycle
+
+def testFailedBackgroundReadIsRaised(monkeypatch):
+    read = veertrace.VCDStreamReader.read
+    def failing(self, *args):
+        if FREEZE in self.references:
+            raise ValueError("truncated dump")
+        return read(self, *args)
+    monkeypatch.setattr(veertrace.VCDStreamReader, "read", failing)
+    lazy = veertrace.VCDHandler(os.path.join(DATA, "design.vcd"), use_cache=False, groups=FIRST_GROUPS)
+    lazy.requireGroups(["GPR"])
+    with pytest.raises(ValueError, match="truncated dump"):
+        lazy.requireGroups(["DECODE"])
@@ -0,0 +1,68 @@
+import re
+
+import numpy as np
+import pytest
+
+import veertrace
+from dumps import writeDump, writeRandomDump
+
+
+CLK = veertrace.VEER_TOP + "clk"
+X1  = veertrace.VEER_GPR + "gpr[1].gprff.dout[31:0]"
+WIDE = "TOP.tb_top.wide[69:0]"
+
+# $comment blocks holding timestamp lines every few cycles, so the split points
+# of most range counts fall next to or inside one
+@pytest.fixture(scope="module")
+def commented(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("parallel") / "commented.vcd")
+    writeDump(path, {X1: (32, lambda cycle: cycle * 13), WIDE: (70, lambda cycle: cycle << 60)}, 80, comments=True)
+    return path
+
+@pytest.fixture(scope="module")
+def random(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("parallel") / "random.vcd")
+    writeRandomDump(path)
+    return path
+
+def checkSame(tracks, serial):
+    assert tracks.keys() == serial.keys()
+    for reference, track in tracks.items():
+        assert track.times == serial[reference].times, reference
+        assert track.values == serial[reference].values, reference
+
+def testRangesStartOutsideComments(commented):
+    with open(commented, "rb") as fd:
+        data = fd.read()
+    comments = [match.span() for match in re.finditer(rb"\$comment.*?\$end", data, re.S)]
+    for count in range(2, 60):
+        reader = veertrace.VCDStreamReader(commented, [CLK, X1])
+        with open(commented, "rb") as fd:
+            reader._parseHeader(fd)
+            ranges = reader._splitRanges(fd, count)
+        assert ranges[0][0] == reader.data_offset and ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+            assert data[start:start+1] == b"#" and data[start-1:start] == b"\n"
+            assert not any(low <= start < high for low, high in comments), (count, start)
+
+# ranges parsed by a pool of 2, more of them than workers
+@pytest.mark.parametrize("count", [2, 5, 13, 31])
+def testParallelMatchesSerialOnComments(commented, count):
+    references = [CLK, X1, WIDE]
+    serial = veertrace.VCDStreamReader(commented, references).read()
+    reader = veertrace.VCDStreamReader(commented, references)
+    with open(commented, "rb") as fd:
+        reader._parseHeader(fd)
+        ranges = reader._splitRanges(fd, count)
+    reader._parseParallel(ranges, 2)
+    checkSame(reader.tracks, serial)
+
+@pytest.mark.parametrize("workers", [2, 4])
+def testParallelMatchesSerial(random, workers):
+    references = veertrace.WaveformSource().signals.values()
+    serial = veertrace.VCDStreamReader(random, references).read()
+    checkSame(veertrace.VCDStreamReader(random, references).read(workers=workers), serial)
+    handler = veertrace.VCDHandler(random, use_cache=False, workers=workers)
+    other = veertrace.VCDHandler(random, use_cache=False)
+    assert np.array_equal(handler.store.values, other.store.values) and np.array_equal(handler.store.times, other.store.times)
@@ -0,0 +1,31 @@
+import time
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+import veerisualize
+
+
+# cycles cached once the worker has prefetched count frames around cycle
+def prefetched(prefetcher, cycle, direction, count):
+    prefetcher.getFrame(cycle, direction)
+    deadline = time.monotonic() + 10
+    while len(prefetcher._frames) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    with prefetcher._lock:
+        return sorted(c for c, _ in prefetcher._frames)
+
+def testPrefetchAround(source):
+    prefetcher = veerisualize.FramePrefetcher(source, depth=8)
+    assert prefetched(prefetcher, 100, -1, 11) == list(range(92, 103))
+    assert prefetcher.hitRate() == 0
+    prefetcher.getFrame(99, -1)
+    assert prefetcher.hitRate() == 0.5
+
+# stepping back through a checkpoint index still only prefetches later frames
+def testIndexedPrefetchesForward(openRandom):
+    source = openRandom(indexed=True, index_interval=4)
+    prefetcher = veerisualize.FramePrefetcher(source, depth=8)
+    assert prefetched(prefetcher, 100, -1, 9) == list(range(100, 109))
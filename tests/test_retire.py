@@ -0,0 +1,37 @@
+import pytest
+
+@pytest.fixture(scope="module", params=[False, True], ids=["parsed", "indexed"])
+def source(openRandom, request):
+    return openRandom(indexed=request.param)
+
+# (cycle, PC, written GPR) of every retirement, read cycle by cycle, i0 first
+@pytest.fixture(scope="module")
+def retired(rows):
+    entries = []
+    for cycle, values in enumerate(rows):
+        if values["freeze"]:
+            continue
+        for p in range(2):
+            if values["e5d.i{}valid".format(p)]:
+                rd = values["e5_i{}_rd".format(p)] if values["i{}_wen_wb".format(p)] else 0
+                entries.append((cycle, (values["i{}_pc_e5".format(p)] << 1) & 0xFFFFFFFF, rd))
+    return entries
+
+def testRetireIndexMatchesCycles(source, retired):
+    index = source.getRetireIndex()
+    assert len(index) == len(retired) > 0
+    assert [index.entry(position) for position in range(len(index))] == retired
+    assert [index.nth(position) for position in range(len(index))] == [cycle for cycle, _, _ in retired]
+    assert index.nth(-1) is index.nth(len(index)) is None
+    for cycle in range(-1, source.final_cycle + 2):
+        assert index.position(cycle) == len([entry for entry in retired if entry[0] < cycle])
+
+def testRetireIndexPCLookups(source, retired):
+    index = source.getRetireIndex()
+    pcs = sorted(set(pc for _, pc, _ in retired))
+    assert len(pcs) < len(retired)
+    for pc in pcs[:4] + [0x12345678]:
+        positions = [position for position, entry in enumerate(retired) if entry[1] == pc]
+        for cycle in range(-1, source.final_cycle + 2):
+            assert index.nextPC(pc, cycle) == min([position for position in positions if retired[position][0] > cycle], default=None)
+            assert index.previousPC(pc, cycle) == max([position for position in positions if retired[position][0] < cycle], default=None)
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+import veertrace
+
+
+# PC decoded in i0 every 7th cycle and in i1 every 11th, with decode mostly high
+PC = 0x1234
+
+OVERRIDES = {
+    "dec_i0_pc_d"     : lambda cycle: PC >> 1 if cycle % 7 == 3 else cycle,
+    "dec_i1_pc_d"     : lambda cycle: PC >> 1 if cycle % 11 == 5 else cycle + 1,
+    "dec_i0_decode_d" : lambda cycle: int(cycle % 5 != 0),
+    "dec_i1_decode_d" : lambda cycle: int(cycle % 3 != 0),
+}
+
+# expression and the same condition on the values of a cycle
+CONDITIONS = [
+    ("e4d.i0valid and not freeze",           lambda v: v["e4d.i0valid"] and not v["freeze"]),
+    ("x5 == x6 or x7 > 0x80000000",          lambda v: v["x5"] == v["x6"] or v["x7"] > 0x80000000),
+    ("(x3 >> 4) & 3 == 2",                   lambda v: (v["x3"] >> 4) & 3 == 2),
+    ("e5_i0_rd != 0 and i0_wen_wb",          lambda v: v["e5_i0_rd"] != 0 and v["i0_wen_wb"]),
+    ("x1 % 3 == 1 or (x2 + 1) * 2 < x1",     lambda v: v["x1"] % 3 == 1 or (v["x2"] + 1) * 2 < v["x1"]),
+    ("1 < e5_i0_rd <= 20",                   lambda v: 1 < v["e5_i0_rd"] <= 20),
+    ("ibval",                                lambda v: v["ibval"]),
+]
+
+@pytest.fixture(scope="module")
+def source(openRandom):
+    return openRandom(overrides=OVERRIDES)
+
+def checkMatches(source, condition, cycles):
+    for cycle in range(-1, source.final_cycle + 2):
+        assert source.nextMatch(condition, cycle) == min([other for other in cycles if other > cycle], default=None)
+        assert source.previousMatch(condition, cycle) == max([other for other in cycles if other < cycle], default=None)
+
+@pytest.mark.parametrize("text, condition", CONDITIONS, ids=[text for text, _ in CONDITIONS])
+def testConditionMatchesCycles(source, rows, text, condition):
+    cycles = [cycle for cycle, row in enumerate(rows) if condition(row)]
+    assert 0 < len(cycles) < len(rows)
+    checkMatches(source, veertrace.SignalCondition(text, source.signals), cycles)
+
+def testPCQuery(source, rows):
+    cycles = [cycle for cycle, row in enumerate(rows) if
+              (row["dec_i0_decode_d"] and row["dec_i0_pc_d"] << 1 == PC) or (row["dec_i1_decode_d"] and row["dec_i1_pc_d"] << 1 == PC)]
+    assert cycles
+    checkMatches(source, veertrace.SignalCondition.fromQuery(" 0x1234 ", source.signals), cycles)
+
+def testSymbolQuery(source, rows, tmp_path):
+    path = str(tmp_path / "program.dis")
+    with open(path, "w") as fd:
+        fd.write("00001234 <loop>:\n    1234:\t00000013          \tnop\n")
+    disassembly = veertrace.DisassemblyHandler(path)
+    found = veertrace.SignalCondition.fromQuery("loop", source.signals, disassembly)
+    assert found.text == veertrace.SignalCondition.fromPC(PC, source.signals).text
+    # signal keys win over symbols, expressions do not need the disassembly
+    assert veertrace.SignalCondition.fromQuery("x5", source.signals, disassembly).text == "x5"
+    disassembly.isLoading = lambda: True
+    assert veertrace.SignalCondition.fromQuery("x5 > 3", source.signals, disassembly).keys == ["x5"]
+    assert veertrace.SignalCondition.fromQuery("0x1234", source.signals, disassembly).text == found.text
+
+# the symbols of a disassembly still loading are not waited for
+def testSymbolWhileLoading(source, monkeypatch):
+    gate = threading.Event()
+    monkeypatch.setattr(veertrace.DisassemblyHandler, "_parseFile", lambda self, file: gate.wait())
+    disassembly = veertrace.DisassemblyHandler("program.dis", background=True)
+    try:
+        with pytest.raises(ValueError, match="still loading"):
+            veertrace.SignalCondition.fromQuery("loop", source.signals, disassembly)
+    finally:
+        gate.set()
+
+# hex words are not taken for PCs, nor bare numbers for constant conditions
+@pytest.mark.parametrize("query", ["1234", "beef", "add", "face"])
+def testHexWordsNeedPrefix(source, query):
+    with pytest.raises(ValueError, match="PCs are written 0x"):
+        veertrace.SignalCondition.fromQuery(query, source.signals)
+
+def testInvalidConditions(source):
+    with pytest.raises(ValueError, match="Unknown signal"):
+        veertrace.SignalCondition("x1 == nosuchsignal", source.signals)
+    with pytest.raises(ValueError, match="Invalid expression"):
+        veertrace.SignalCondition("x1 ==", source.signals)
+    with pytest.raises(ValueError, match="Unsupported expression"):
+        veertrace.SignalCondition("x1 ** 2", source.signals)
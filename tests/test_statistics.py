@@ -0,0 +1,117 @@
+import csv
+import json
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+import veerstats
+import veertrace
+from dumps import writeRandomDump
+
+PROGRAM = os.path.join(os.path.dirname(__file__), "data", "program.dis")
+
+# retired PCs walk over the program of PROGRAM, past its end and into the gap after it
+OVERRIDES = {
+    "i0_pc_e5" : lambda cycle: (0x80000000 + 2 * (cycle % 31)) >> 1,
+    "i1_pc_e5" : lambda cycle: (0x8000001c + 2 * (cycle % 13)) >> 1,
+}
+
+# whole trace, windows and windows reaching past either end. freeze and
+# flush_final_e3 rise at 29, freeze at 150 as well
+WINDOWS = [(None, None), (40, 211), (29, 150), (-5, 17), (250, 1000)]
+
+@pytest.fixture(scope="module")
+def dump(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("statistics") / "random.vcd")
+    writeRandomDump(path, overrides=OVERRIDES)
+    return path
+
+@pytest.fixture(scope="module")
+def source(dump):
+    return veertrace.VCDHandler(dump, use_cache=False)
+
+@pytest.fixture(scope="module")
+def disassembly():
+    return veertrace.DisassemblyHandler(PROGRAM)
+
+# value of a condition of PIPELINE_CONDITIONS or BYPASS_PATHS on the values of
+# a cycle, the text being Python once the keys are looked up
+def _evaluate(text, values):
+    return bool(eval(re.sub(r"[A-Za-z_][\w.]*", lambda m: "v[{!r}]".format(m.group()) if m.group() in values else m.group(), text), {"v": values}))
+
+def _window(source, first, last):
+    return max(first or 0, 0), min(source.final_cycle if last is None else last, source.final_cycle)
+
+@pytest.mark.parametrize("first, last", WINDOWS)
+def testPipelineStatistics(source, rows, first, last):
+    stats = veertrace.pipelineStatistics(source, first=first, last=last)
+    first, last = _window(source, first, last)
+    window = range(first, last + 1)
+    assert (stats["first_cycle"], stats["last_cycle"], stats["cycles"]) == (first, last, len(window))
+
+    count = lambda name: sum(_evaluate(veertrace.PIPELINE_CONDITIONS[name], rows[cycle]) for cycle in window)
+    ratio = lambda name: count(name) / len(window)
+    # stretches of a signal starting in the window
+    events = lambda key: sum(1 for cycle in window if rows[cycle][key] and (cycle == 0 or not rows[cycle - 1][key]))
+
+    assert stats["ipc"] == {"i0": ratio("i0_retired"), "i1": ratio("i1_retired"), "total": (count("i0_retired") + count("i1_retired")) / len(window)}
+    assert stats["decode_low"] == {"i0": ratio("i0_decode_low"), "i1": ratio("i1_decode_low")}
+    assert stats["freeze"] == {"count": events("freeze"), "cycles": count("freeze")}
+    assert stats["flush"] == {"final_e3": events("flush_final_e3"), "lower_wb": events("flush_lower_wb")}
+    assert stats["lsu_occupancy"] == {"dc{}".format(i): ratio("dc{}_valid".format(i)) for i in range(1, 6)}
+    assert stats["bypass"] == veertrace.bypassStatistics(source, first, last)
+    assert "retired_mnemonics" not in stats
+    if len(window) > 100:
+        assert 0 < stats["freeze"]["count"] < stats["freeze"]["cycles"]
+        assert 0 < stats["ipc"]["i0"] < 1 and 0 < stats["lsu_occupancy"]["dc3"] < 1
+
+@pytest.mark.parametrize("first, last", WINDOWS[:3])
+def testBypassStatistics(source, rows, first, last):
+    counts = veertrace.bypassStatistics(source, first, last)
+    first, last = _window(source, first, last)
+    assert list(counts) == list(veertrace.BYPASS_PATHS)
+    for name, text in veertrace.BYPASS_PATHS.items():
+        assert counts[name] == sum(_evaluate(text, rows[cycle]) for cycle in range(first, last + 1)), name
+    assert sum(1 for count in counts.values() if count) > len(counts) // 2
+
+def testRetiredMnemonics(source, rows, disassembly):
+    stats = veertrace.pipelineStatistics(source, disassembly, 40, 211)
+    mnemonics = {}
+    for cycle in range(40, 212):
+        for p in range(2):
+            if _evaluate(veertrace.PIPELINE_CONDITIONS["i{}_retired".format(p)], rows[cycle]):
+                mnemonic = disassembly.getMnemonic(rows[cycle]["i{}_pc_e5".format(p)] << 1)
+                mnemonics[mnemonic] = mnemonics.get(mnemonic, 0) + 1
+    assert stats["retired_mnemonics"] == mnemonics
+    assert "invalid" in mnemonics and "addi" in mnemonics
+    # most retired first
+    assert list(stats["retired_mnemonics"].values()) == sorted(mnemonics.values(), reverse=True)
+
+def _runStatistics(dump, *options):
+    script = os.path.join(os.path.dirname(veertrace.__file__), "veerstats.py")
+    return subprocess.run([sys.executable, script, dump, "-d", PROGRAM, "--first", "29", "--last", "150"] + list(options),
+                          check=True, capture_output=True, text=True).stdout
+
+def testStatisticsScriptJSON(dump, source, disassembly, tmp_path):
+    expected = [dict(dump=dump, **veertrace.pipelineStatistics(source, disassembly, 29, 150))]
+    assert json.loads(_runStatistics(dump)) == expected
+    _runStatistics(dump, "-o", str(tmp_path / "stats.json"))
+    with open(tmp_path / "stats.json") as fd:
+        assert json.load(fd) == expected
+
+def testStatisticsScriptCSV(dump, source, disassembly, tmp_path):
+    _runStatistics(dump, "-o", str(tmp_path / "stats.csv"))
+    with open(tmp_path / "stats.csv", newline="") as fd:
+        rows = list(csv.DictReader(fd))
+    assert len(rows) == 1
+    expected = veerstats._flatten(dict(dump=dump, **veertrace.pipelineStatistics(source, disassembly, 29, 150)))
+    assert list(rows[0]) == list(expected)
+    assert rows[0]["dump"] == dump
+    for column, value in expected.items():
+        if column != "dump":
+            assert float(rows[0][column]) == value, column
+    bypass = veertrace.bypassStatistics(source, 29, 150)
+    assert {name: int(rows[0]["bypass." + name]) for name in bypass} == bypass
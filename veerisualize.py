@@ -1,9 +1,8 @@
 #!/bin/python3
 
-from vcdvcd import VCDVCD
 from pyqtgraph import ArrowItem, CurveArrow
 from PyQt5 import QtWidgets, QtCore
-from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtCore import Qt, QRect, QTimer, QAbstractListModel, QEvent, pyqtSignal
 from PyQt5.QtWidgets import (
     QWidget, 
     QApplication, 
@@ -22,25 +21,52 @@ from PyQt5.QtWidgets import (
     QGraphicsRectItem, 
     QGraphicsSimpleTextItem,
     QGraphicsLineItem,
-    QGraphicsItemGroup
+    QGraphicsItemGroup,
+    QSpinBox,
+    QComboBox,
+    QLineEdit,
+    QCheckBox,
+    QListView
 )
 from PyQt5.QtGui import QKeySequence, QBrush, QPen, QColor
 from functools import partial
+from collections import OrderedDict
+import numpy as np
+import argparse
+import threading
+import time
 import sys
 import os
 import re
+from veertrace import (
+    openWaveform,
+    DisassemblyHandler,
+    SignalCondition,
+    queryPC,
+    TraceDiff,
+    DIFF_ALIGNMENTS,
+    bypassStatistics,
+    EVENT_TYPES,
+    STAGE_CLASSES
+)
 
 # constants
-VEER_TOP        = "TOP.tb_top.rvtop.VeeR."
-VEER_DEC_DECODE = VEER_TOP + "dec.decode."
-VEER_DEC_IB     = VEER_TOP + "dec.instbuff."
-VEER_GPR        = VEER_TOP + "dec.arf.gpr_banks[0]."
-VEER_EXU        = VEER_TOP + "exu."
-VEER_TLU        = VEER_TOP + "dec.tlu."
-VEER_LSU_CTL    = VEER_TOP + "lsu.lsu_lsc_ctl."
+# signal groups read before the window opens, the others follow in the background
+VEERISUAL_FIRST_GROUPS = ("IB", "IFU", "GPR")
+# redraws per second while the slider is dragged
+VEERISUAL_SCRUB_FPS = 30
+# decoded frames kept, and cycles decoded ahead of the current one
+VEERISUAL_FRAME_CACHE_SIZE = 512
+VEERISUAL_PREFETCH_DEPTH   = 16
+# playback: default rate in cycles per second and the highest redraw rate
+VEERISUAL_PLAY_RATE = 20
+VEERISUAL_PLAY_FPS  = 60
 
 # ===[ GUI Class ]=========================================
 class VeeRisual(QMainWindow):
+    # a GPR of the register file was clicked, with its number
+    registerClicked = pyqtSignal(int)
+
     def __init__(self):
         super().__init__()
         self.width   = 120
@@ -64,6 +90,7 @@ class VeeRisual(QMainWindow):
         self._addIBArrows()
         self._hideAllArrows()
         self._positionObjects()
+        self.scene.installEventFilter(self)
 
     # define brushes etc.
     def _setupDrawing(self):
@@ -99,6 +126,10 @@ class VeeRisual(QMainWindow):
 
         self.pen_dotted_outline = QPen(Qt.black, 1, Qt.DotLine)
 
+        self.pen_difference = QPen(Qt.red, 4, Qt.SolidLine)
+
+        self.brush_loading = QBrush(QColor(210, 210, 210))
+
     # center object within its parents bounding rect
     def _centerObjectWithinParent(self, obj):
         x_offset = (obj.parentItem().boundingRect().width() - obj.boundingRect().width()) / 2
@@ -445,74 +476,220 @@ class VeeRisual(QMainWindow):
             group.addToGroup(arrow)
             self.I0_RS2_From_I1.append(group)
 
-    def _hideAllArrows(self):
-        # hide all arrows by default
-        self.I0_RS1_GPR.hide()
-        self.I0_RS2_GPR.hide()
-        self.I1_RS1_GPR.hide()
-        self.I1_RS2_GPR.hide()
-        self.I0_WB_GPR.hide()
-        self.I1_WB_GPR.hide()
+    # arrows that are only shown for some cycles
+    def _toggledArrows(self):
+        arrows = [self.I0_RS1_GPR, self.I0_RS2_GPR, self.I1_RS1_GPR, self.I1_RS2_GPR, self.I0_WB_GPR, self.I1_WB_GPR]
 
         for i in range(5):
-            self.I0_RS1_From_I0[i].hide() 
-            self.I0_RS2_From_I0[i].hide() 
-            self.I0_RS1_From_I1[i].hide()
-            self.I0_RS2_From_I1[i].hide()
-            self.I1_RS1_From_I0[i].hide() 
-            self.I1_RS2_From_I0[i].hide() 
-            self.I1_RS1_From_I1[i].hide()
-            self.I1_RS2_From_I1[i].hide()
+            arrows += [self.I0_RS1_From_I0[i], self.I0_RS2_From_I0[i], self.I0_RS1_From_I1[i], self.I0_RS2_From_I1[i],
+                       self.I1_RS1_From_I0[i], self.I1_RS2_From_I0[i], self.I1_RS1_From_I1[i], self.I1_RS2_From_I1[i]]
 
         for i in range(4):
-            self.ib_write_arrows_i0[i].hide()
-            self.ib_write_arrows_i1[i].hide()
+            arrows += [self.ib_write_arrows_i0[i], self.ib_write_arrows_i1[i]]
 
         # i0 WB -> E3, E4
-        self.I0_E3_RS1_From_i0_WB.hide()
-        self.I0_E3_RS2_From_i0_WB.hide()
-        self.I0_E4_RS1_From_i0_WB.hide()
-        self.I0_E4_RS2_From_i0_WB.hide()
-
-        self.I1_E3_RS1_From_i0_WB.hide()
-        self.I1_E3_RS2_From_i0_WB.hide()
-        self.I1_E4_RS1_From_i0_WB.hide()
-        self.I1_E4_RS2_From_i0_WB.hide()
+        arrows += [self.I0_E3_RS1_From_i0_WB, self.I0_E3_RS2_From_i0_WB, self.I0_E4_RS1_From_i0_WB, self.I0_E4_RS2_From_i0_WB,
+                   self.I1_E3_RS1_From_i0_WB, self.I1_E3_RS2_From_i0_WB, self.I1_E4_RS1_From_i0_WB, self.I1_E4_RS2_From_i0_WB]
 
         # i1 WB -> E3, E4
-        self.I1_E3_RS1_From_i1_WB.hide()
-        self.I1_E3_RS2_From_i1_WB.hide()
-        self.I1_E4_RS1_From_i1_WB.hide()
-        self.I1_E4_RS2_From_i1_WB.hide()
-        
-        self.I0_E3_RS1_From_i1_WB.hide()
-        self.I0_E3_RS2_From_i1_WB.hide()
-        self.I0_E4_RS1_From_i1_WB.hide()
-        self.I0_E4_RS2_From_i1_WB.hide()
+        arrows += [self.I1_E3_RS1_From_i1_WB, self.I1_E3_RS2_From_i1_WB, self.I1_E4_RS1_From_i1_WB, self.I1_E4_RS2_From_i1_WB,
+                   self.I0_E3_RS1_From_i1_WB, self.I0_E3_RS2_From_i1_WB, self.I0_E4_RS1_From_i1_WB, self.I0_E4_RS2_From_i1_WB]
 
         # E4 -> E4
-        self.I0_E4_RS1_From_i0_E4.hide()
-        self.I0_E4_RS2_From_i0_E4.hide()
-        self.I1_E4_RS1_From_i1_E4.hide()
-        self.I1_E4_RS2_From_i1_E4.hide()
-
-        self.I0_E4_RS1_From_i1_E4.hide()
-        self.I0_E4_RS2_From_i1_E4.hide()
-        self.I1_E4_RS1_From_i0_E4.hide()
-        self.I1_E4_RS2_From_i0_E4.hide()
-        
-        # LSU/MUL 
-        self.DC3_DC2_RS1.hide()
-        self.DC3_DC2_RS2.hide()
-        self.DC3_DC3.hide()
-        self.DC3_M2_RS1.hide()
-        self.DC3_M2_RS2.hide()
-        self.E2_DC3.hide()
-        for i in range(3):
-            self.E4_LSU_Bypass[i].hide()
+        arrows += [self.I0_E4_RS1_From_i0_E4, self.I0_E4_RS2_From_i0_E4, self.I1_E4_RS1_From_i1_E4, self.I1_E4_RS2_From_i1_E4,
+                   self.I0_E4_RS1_From_i1_E4, self.I0_E4_RS2_From_i1_E4, self.I1_E4_RS1_From_i0_E4, self.I1_E4_RS2_From_i0_E4]
+
+        # LSU/MUL
+        arrows += [self.DC3_DC2_RS1, self.DC3_DC2_RS2, self.DC3_DC3, self.DC3_M2_RS1, self.DC3_M2_RS2, self.E2_DC3]
+        arrows += self.E4_LSU_Bypass
 
-        self.Intra_Bypass_RS1.hide()
-        self.Intra_Bypass_RS2.hide()
+        arrows += [self.Intra_Bypass_RS1, self.Intra_Bypass_RS2]
+        return arrows
+
+    def _hideAllArrows(self):
+        # hide all arrows by default
+        for arrow in self._toggledArrows():
+            arrow.hide()
+
+        # last rendered input of every item, see _changed()
+        self._rendered = {}
+        self._toggled = self._toggledArrows() + [self.stall_i0, self.stall_i1, self.nonblock_load_commit]
+        # arrows kept visible by the bypass heatmap, and their own pens and brushes
+        self._heatmap = set()
+        self._heatmap_styles = {}
+        # outline of every item marked by setDifferences()
+        self._outlines = {}
+        # cover of every item of a signal group still loading, see _coverPending()
+        self._covers = {}
+
+    # True if value differs from the one key was last rendered with
+    def _changed(self, key, value):
+        if key in self._rendered and self._rendered[key] == value:
+            return False
+        self._rendered[key] = value
+        return True
+
+    # texts rendered from the disassembly are drawn again on the next update
+    def invalidateInstructionText(self):
+        for item in self.IB_PC_text + self.I0_info_text + self.I1_info_text + [self.roomdebug1, self.roomdebug2]:
+            self._rendered.pop(item, None)
+
+    # items collected by _updateView() are shown, all other toggled ones hidden
+    def _applyVisibility(self, shown):
+        for item in self._toggled:
+            visible = item in shown or item in self._heatmap
+            if self._changed(item, visible):
+                item.setVisible(visible)
+
+    # arrow group drawing each forwarding path of BYPASS_PATHS
+    def _bypassArrows(self):
+        arrows = {}
+        decode = {"i0_rs1": (self.I0_RS1_From_I0, self.I0_RS1_From_I1), "i0_rs2": (self.I0_RS2_From_I0, self.I0_RS2_From_I1),
+                  "i1_rs1": (self.I1_RS1_From_I0, self.I1_RS1_From_I1), "i1_rs2": (self.I1_RS2_From_I0, self.I1_RS2_From_I1)}
+        for name, sources in decode.items():
+            for p in range(2):
+                for i in range(5):
+                    arrows["{}_from_i{}_e{}".format(name, p, i+1)] = sources[p][i]
+
+        arrows.update({
+            "i0_e3_rs1_from_i0_wb" : self.I0_E3_RS1_From_i0_WB, "i0_e3_rs1_from_i1_wb" : self.I0_E3_RS1_From_i1_WB,
+            "i0_e3_rs2_from_i0_wb" : self.I0_E3_RS2_From_i0_WB, "i0_e3_rs2_from_i1_wb" : self.I0_E3_RS2_From_i1_WB,
+            "i1_e3_rs1_from_i0_wb" : self.I1_E3_RS1_From_i0_WB, "i1_e3_rs1_from_i1_wb" : self.I1_E3_RS1_From_i1_WB,
+            "i1_e3_rs2_from_i0_wb" : self.I1_E3_RS2_From_i0_WB, "i1_e3_rs2_from_i1_wb" : self.I1_E3_RS2_From_i1_WB,
+
+            "i0_e4_rs1_from_i0_wb" : self.I0_E4_RS1_From_i0_WB, "i0_e4_rs1_from_i1_wb" : self.I0_E4_RS1_From_i1_WB,
+            "i0_e4_rs1_from_i0_e4" : self.I0_E4_RS1_From_i0_E4, "i0_e4_rs1_from_i1_e4" : self.I0_E4_RS1_From_i1_E4,
+            "i0_e4_rs2_from_i0_wb" : self.I0_E4_RS2_From_i0_WB, "i0_e4_rs2_from_i1_wb" : self.I0_E4_RS2_From_i1_WB,
+            "i0_e4_rs2_from_i0_e4" : self.I0_E4_RS2_From_i0_E4, "i0_e4_rs2_from_i1_e4" : self.I0_E4_RS2_From_i1_E4,
+            "i1_e4_rs1_from_i0_wb" : self.I1_E4_RS1_From_i0_WB, "i1_e4_rs1_from_i1_wb" : self.I1_E4_RS1_From_i1_WB,
+            "i1_e4_rs1_from_i0_e4" : self.I1_E4_RS1_From_i0_E4, "i1_e4_rs1_from_i1_e4" : self.I1_E4_RS1_From_i1_E4,
+            "i1_e4_rs2_from_i0_wb" : self.I1_E4_RS2_From_i0_WB, "i1_e4_rs2_from_i1_wb" : self.I1_E4_RS2_From_i1_WB,
+            "i1_e4_rs2_from_i0_e4" : self.I1_E4_RS2_From_i0_E4, "i1_e4_rs2_from_i1_e4" : self.I1_E4_RS2_From_i1_E4,
+            "i1_e4_rs1_intra"      : self.Intra_Bypass_RS1,     "i1_e4_rs2_intra"      : self.Intra_Bypass_RS2,
+
+            "dc3_m2_rs1"  : self.DC3_M2_RS1,  "dc3_m2_rs2"  : self.DC3_M2_RS2,
+            "dc3_dc2_rs1" : self.DC3_DC2_RS1, "dc3_dc2_rs2" : self.DC3_DC2_RS2,
+            "dc3_dc3"     : self.DC3_DC3,     "e2_dc3"      : self.E2_DC3,
+            "e4_dc1"      : self.E4_LSU_Bypass[0], "e4_dc2" : self.E4_LSU_Bypass[1], "e4_dc3" : self.E4_LSU_Bypass[2],
+        })
+        return arrows
+
+    # shows every forwarding arrow colored (yellow to red) and widened by the cycles
+    # its path is used in, on a log scale from the least to the most used path.
+    # Unused paths are grey. None for counts goes back to the arrows of the current cycle
+    def setBypassHeatmap(self, counts, cycles=0):
+        arrows = self._bypassArrows()
+        if (counts is None):
+            for item, (pen, brush) in self._heatmap_styles.items():
+                item.setPen(pen)
+                if (brush is not None): item.setBrush(brush)
+            for group in arrows.values():
+                group.setToolTip("")
+            self._heatmap = set()
+            self._heatmap_styles = {}
+            return
+
+        used = np.log([count for count in counts.values() if count] or [1])
+        low, span = used.min(), max(used.max() - used.min(), 1e-9)
+        for name, group in arrows.items():
+            heat = (np.log(counts[name]) - low) / span if (counts[name]) else 0.0
+            color = QColor.fromHsvF((1 - heat) / 6, 1.0, 1.0) if (counts[name]) else QColor(Qt.lightGray)
+            for item in group.childItems():
+                if (item not in self._heatmap_styles):
+                    self._heatmap_styles[item] = (item.pen(), item.brush() if isinstance(item, ArrowItem) else None)
+                if (isinstance(item, ArrowItem)):
+                    item.setPen(QPen(color, 1, Qt.SolidLine))
+                    item.setBrush(QBrush(color))
+                else:
+                    item.setPen(QPen(color, 1 + 4 * heat, Qt.SolidLine))
+            group.setToolTip("{}: {} of {} cycles".format(name, counts[name], cycles))
+        self._heatmap = set(arrows.values())
+
+    # items showing each field of a TraceDiff
+    def _diffItems(self):
+        stages = [self.I0_stages, self.I1_stages]
+        items = {
+            "retired_pc"    : [self.I0_stages[4], self.I1_stages[4]],
+            "retired_count" : [self.I0_stages[4], self.I1_stages[4]],
+        }
+        for i in range(4):
+            items["ib{}".format(i)] = [self.IB_PC_box[i]]
+        for p in range(2):
+            for s in range(5):
+                items["e{}d.i{}valid".format(s+1, p)] = [stages[p][s]]
+            for r in range(1, 3):
+                items["i{}_rs{}bypass".format(p, r)] = [self.IB_PC_box[p]]
+                items["e2d.i{}rs{}bype2".format(p, r)] = [stages[p][1]]
+                items["e3d.i{}rs{}bype3".format(p, r)] = [stages[p][2]]
+        for i in range(1, 32):
+            items["x{}".format(i)] = [self.regs[i]]
+        return items
+
+    # items drawn from each signal group that is read in the background
+    def _groupItems(self):
+        stages = self.I0_stages + self.I1_stages + [self.i0_wb_buffer, self.i1_wb_buffer]
+        return {
+            "DECODE" : stages,
+            "EXU"    : stages,
+            "LSU"    : self.LSU_stages,
+            "MUL"    : self.MUL_stages,
+            "TLU"    : [self.CSRs["faultless"]],
+        }
+
+    # covers the items of the pending groups with "loading…" rather than showing
+    # their fields, which read as 0 until then
+    def _coverPending(self, pending):
+        items = self._groupItems()
+        covered = set(item for group in pending for item in items.get(group, []))
+        for item in covered:
+            if (item not in self._covers):
+                # in the scene above everything, the texts of a stage are not all its children
+                self._covers[item] = QGraphicsRectItem(item.sceneBoundingRect())
+                self._covers[item].setBrush(self.brush_loading)
+                self._covers[item].setZValue(10)
+                self.scene.addItem(self._covers[item])
+                text = QGraphicsSimpleTextItem("loading…", parent=self._covers[item])
+                rect = self._covers[item].rect()
+                text.setPos(rect.center().x() - text.boundingRect().width() / 2, rect.center().y() - text.boundingRect().height() / 2)
+        for item, cover in self._covers.items():
+            if self._changed(cover, item in covered):
+                cover.setVisible(item in covered)
+
+    # outlines the items of the fields two runs differ in, none for an empty list
+    def setDifferences(self, fields):
+        items = self._diffItems()
+        marked = set(item for field in fields for item in items.get(field, []))
+        for item in marked:
+            if (item not in self._outlines):
+                self._outlines[item] = QGraphicsRectItem(item.rect(), parent=item)
+                self._outlines[item].setPen(self.pen_difference)
+        for item, outline in self._outlines.items():
+            if self._changed(outline, item in marked):
+                outline.setVisible(item in marked)
+
+    # clicks on x1..x31 are reported by registerClicked
+    def eventFilter(self, obj, event):
+        if (obj is self.scene and event.type() == QEvent.GraphicsSceneMousePress and event.button() == Qt.LeftButton):
+            for i in range(1, 32):
+                if (self.regs[i].sceneBoundingRect().contains(event.scenePos())):
+                    self.registerClicked.emit(i)
+                    return True
+        return super().eventFilter(obj, event)
+
+    # puts the scene of another view (the second run of a diff) next to this one,
+    # with buttons stepping through the cycles the runs start to differ in
+    def addSideView(self, view):
+        self.scenelayout.insertWidget(1, view.graphicsview, 1)
+
+        layout = QHBoxLayout()
+        self.prevdiffbtn = QPushButton('<< difference')
+        layout.addWidget(self.prevdiffbtn)
+        self.nextdiffbtn = QPushButton('difference >>')
+        layout.addWidget(self.nextdiffbtn)
+        self.difflabel = QLabel("")
+        layout.addWidget(self.difflabel, 1)
+        self.generalLayout.addLayout(layout)
+        self.setGeometry(200, 200, 2400, 800)
 
     def _addSpecialForwardingArrows(self):
         width   = self.width
@@ -1197,108 +1374,60 @@ class VeeRisual(QMainWindow):
         self.exe_bounding_rect.setPos(4*(width + spacing), 0) 
         self.regfile.setPos(4*(width+spacing), 350)
 
-    def _getStageClassText(self, values, stage, pipe):
-        text = "Other"
-        valid_name = stage + "d." + pipe + "valid"
-
-        alu_name   = "{}_{}c.alu".format(pipe, stage)
-        load_name  = "{}_{}c.load".format(pipe, stage) 
-        mul_name   = "{}_{}c.mul".format(pipe, stage)
-        sec_name   = "{}_{}c.sec".format(pipe, stage)
-        if (int(values[valid_name])):
-            if int(values[alu_name]) or int(values[sec_name]):
-                if (stage == "e5"):
-                    if int(values[alu_name]):
-                        text = "ALU" 
-                    else:
-                        text = "SEC"
-                elif int(values["{}_{}_beq".format(pipe, stage)]):
-                    text = "BEQ"
-                elif int(values["{}_{}_bge".format(pipe, stage)]):
-                    text = "BGE"
-                elif int(values["{}_{}_blt".format(pipe, stage)]):
-                    text = "BLT"
-                elif int(values["{}_{}_bne".format(pipe, stage)]):
-                    text = "BNE"
-                elif int(values["{}_{}_jal".format(pipe, stage)]):
-                    text = "JAL"
-                else:
-                    if int(values[alu_name]):
-                        text = "ALU" 
-                    else:
-                        text = "SEC"
-            elif int(values[load_name]):
-                text = "LOAD"
-            elif int(values[mul_name]):
-                text = "MUL"
-        return text
-
-    def _toggleArrowVisibilityI0_RS1(self, val):
+    def _toggleArrowVisibilityI0_RS1(self, val, shown):
         for i in range(10):
             if ((val >> (9-i)) & 1):
                 if (i % 2): 
-                    self.I0_RS1_From_I0[int(i/2)].show()
+                    shown.add(self.I0_RS1_From_I0[int(i/2)])
                 else:
-                    self.I0_RS1_From_I1[int(i/2)].show()
+                    shown.add(self.I0_RS1_From_I1[int(i/2)])
 
-    def _toggleArrowVisibilityI0_RS2(self, val):
+    def _toggleArrowVisibilityI0_RS2(self, val, shown):
         for i in range(10):
             if ((val >> (9-i)) & 1):
                 if (i % 2): 
-                    self.I0_RS2_From_I0[int(i/2)].show()
+                    shown.add(self.I0_RS2_From_I0[int(i/2)])
                 else:
-                    self.I0_RS2_From_I1[int(i/2)].show()
+                    shown.add(self.I0_RS2_From_I1[int(i/2)])
 
-    def _toggleArrowVisibilityI1_RS1(self, val):
+    def _toggleArrowVisibilityI1_RS1(self, val, shown):
         for i in range(10):
             if ((val >> (9-i)) & 1):
                 if (i % 2): 
-                    self.I1_RS1_From_I0[int(i/2)].show()
+                    shown.add(self.I1_RS1_From_I0[int(i/2)])
                 else:
-                    self.I1_RS1_From_I1[int(i/2)].show()
+                    shown.add(self.I1_RS1_From_I1[int(i/2)])
 
-    def _toggleArrowVisibilityI1_RS2(self, val):
+    def _toggleArrowVisibilityI1_RS2(self, val, shown):
         for i in range(10):
             if ((val >> (9-i)) & 1):
                 if (i % 2): 
-                    self.I1_RS2_From_I0[int(i/2)].show()
+                    shown.add(self.I1_RS2_From_I0[int(i/2)])
                 else:
-                    self.I1_RS2_From_I1[int(i/2)].show()
-
-
-    def _colorRegs(self, values):
+                    shown.add(self.I1_RS2_From_I1[int(i/2)])
+
+
+    def _colorRegs(self, frame, shown):
+        brushes = [self.brush_neutral] * 32
+        # I0/I1 RS1/RS2 reads, later entries win like the writeback below
+        read_arrows = [[self.I0_RS1_GPR, self.I0_RS2_GPR], [self.I1_RS1_GPR, self.I1_RS2_GPR]]
+        read_brushes = [self.brush_gpr_rs1, self.brush_gpr_rs2]
+        for pipe in range(2):
+            for rs in range(2):
+                reg = frame.gpr_read[pipe][rs]
+                if (reg):
+                    brushes[reg] = read_brushes[rs]
+                    shown.add(read_arrows[pipe][rs])
+        # WB
+        if (frame.gpr_write[0]):
+            brushes[frame.gpr_write[0]] = self.brush_stage_valid
+            shown.add(self.I0_WB_GPR)
+        if (frame.gpr_write[1]):
+            brushes[frame.gpr_write[1]] = self.brush_stage_valid_i1
+            shown.add(self.I1_WB_GPR)
         for i in range(1,32):
-            self.regs[i].setBrush(self.brush_neutral) 
-            if (int(values["dec_i0_decode_d"])):
-                # I0 RS1
-                if not int(values["i0_rs1_bypass_en"]) and int(values["i0_rs1_en_d"]):
-                    if (int(values["i0_rs1"], 2) == i):
-                        self.regs[i].setBrush(self.brush_gpr_rs1)
-                        self.I0_RS1_GPR.show()
-                # I0 RS2
-                if not int(values["i0_rs2_bypass_en"]) and int(values["i0_rs2_en_d"]):
-                    if (int(values["i0_rs2"], 2) == i):
-                        self.regs[i].setBrush(self.brush_gpr_rs2)
-                        self.I0_RS2_GPR.show()
-            if (int(values["dec_i1_decode_d"])):
-                # I1 RS1
-                if not int(values["i1_rs1_bypass_en"]) and int(values["i1_rs1_en_d"]):
-                    if (int(values["i1_rs1"], 2) == i):
-                        self.regs[i].setBrush(self.brush_gpr_rs1)
-                        self.I1_RS1_GPR.show()
-                # I1 RS2
-                if not int(values["i1_rs2_bypass_en"]) and int(values["i1_rs2_en_d"]):
-                    if (int(values["i1_rs2"], 2) == i):
-                        self.regs[i].setBrush(self.brush_gpr_rs2)
-                        self.I1_RS2_GPR.show()
-            # WB
-            if int(values["x{}_en".format(i)]):
-                if (int(values["i0_wen_wb"]) and int(values["e5_i0_rd"], 2) == i):
-                    self.regs[i].setBrush(self.brush_stage_valid)
-                    self.I0_WB_GPR.show()
-                if (int(values["i1_wen_wb"]) and int(values["e5_i1_rd"], 2) == i):
-                    self.regs[i].setBrush(self.brush_stage_valid_i1)
-                    self.I1_WB_GPR.show()
+            if self._changed(self.regs[i], brushes[i]):
+                self.regs[i].setBrush(brushes[i])
 
     def _truncateInstructionText(self, text, max_len):
         if (len(text) > max_len):
@@ -1306,144 +1435,133 @@ class VeeRisual(QMainWindow):
         else:
             return text
 
-    # update all object colors, text etc.
-    def _updateView(self, values, instructions):
-        self._hideAllArrows()
+    # update all object colors, text etc. Only items whose inputs differ from the
+    # last rendered frame are touched, so unchanged parts of the scene are not repainted
+    def _updateView(self, frame, instructions):
+        shown = set()
+        self._coverPending(frame.pending)
 
-        self.roomdebug1.setText("IFU i0 PC: {:08X}".format(int(values["ifu_i0_pc"] + "0", 2)))
-        self.roomdebug2.setText("IFU i1 PC: {:08X}".format(int(values["ifu_i1_pc"] + "0", 2)))
+        # fetch PCs with the function they are in
+        if self._changed(self.roomdebug1, frame.ifu_pc[0]): self.roomdebug1.setText("IFU i0 PC: {:08X} {}".format(frame.ifu_pc[0], instructions.getSymbolText(frame.ifu_pc[0])))
+        if self._changed(self.roomdebug2, frame.ifu_pc[1]): self.roomdebug2.setText("IFU i1 PC: {:08X} {}".format(frame.ifu_pc[1], instructions.getSymbolText(frame.ifu_pc[1])))
 
         # paint valid instructions green and invalid ones red
         for i in range(4):
-            self.IB_valid_box[i].setBrush(self.brush_stage_valid) if ((int(values["ibval"], 2) >> i) & 1) else self.IB_valid_box[i].setBrush(self.brush_stage_invalid)
-            self.IB_copy_box[i].setBrush(self.brush_copy) if (int(values["ic{}".format(i)])) else self.IB_copy_box[i].setBrush(self.brush_neutral)
-            #print("{} {}".format(values["i0_wen_shifted"], values["i1_wen_shifted"]))
-            if ((int(values["i0_wen_shifted"], 2) >> i) & 1):       self.ib_write_arrows_i0[i].show()
-            if ((int(values["i1_wen_shifted"] + "0", 2) >> i) & 1): self.ib_write_arrows_i1[i].show()
-
-        self.i0_wb_buffer.setBrush(self.brush_stage_valid) if (int(values["i0_wb_buffer_val_q"])) else self.i0_wb_buffer.setBrush(self.brush_stage_invalid)
-        self.i0_wb_buffer.setPen(self.pen_line_rs1) if (int(values["i0_rs1_depend_i0_buf"]) or int(values["i1_rs1_depend_i0_buf"])) else self.i0_wb_buffer.setPen(QPen(Qt.black, 1))
-        self.i0_wb_buffer.setPen(self.pen_line_rs2) if (int(values["i0_rs2_depend_i0_buf"]) or int(values["i1_rs2_depend_i0_buf"])) else self.i0_wb_buffer.setPen(QPen(Qt.black, 1))
+            if self._changed(self.IB_valid_box[i], frame.ib_valid[i]):
+                self.IB_valid_box[i].setBrush(self.brush_stage_valid) if (frame.ib_valid[i]) else self.IB_valid_box[i].setBrush(self.brush_stage_invalid)
+            if self._changed(self.IB_copy_box[i], frame.ib_copy[i]):
+                self.IB_copy_box[i].setBrush(self.brush_copy) if (frame.ib_copy[i]) else self.IB_copy_box[i].setBrush(self.brush_neutral)
+            if (frame.ib_write[0][i]): shown.add(self.ib_write_arrows_i0[i])
+            if (frame.ib_write[1][i]): shown.add(self.ib_write_arrows_i1[i])
+
+        # write back buffers, outlined when a decoded instruction depends on them
+        for i, buf in enumerate([self.i0_wb_buffer, self.i1_wb_buffer]):
+            if self._changed((buf, "brush"), frame.wb_buffer_valid[i]):
+                buf.setBrush(self.brush_stage_valid) if (frame.wb_buffer_valid[i]) else buf.setBrush(self.brush_stage_invalid)
+            if self._changed((buf, "pen"), (frame.wb_buffer_rs1[i], frame.wb_buffer_rs2[i])):
+                buf.setPen(self.pen_line_rs1) if (frame.wb_buffer_rs1[i]) else buf.setPen(QPen(Qt.black, 1))
+                buf.setPen(self.pen_line_rs2) if (frame.wb_buffer_rs2[i]) else buf.setPen(QPen(Qt.black, 1))
 
         # valid stages are green, invalid stages are red
         for i in range(5):
-            self.I0_stages[i].setBrush(self.brush_stage_valid) if (int(values["e{}d.i0valid".format(i+1)])) else self.I0_stages[i].setBrush(self.brush_stage_invalid)
-            self.I1_stages[i].setBrush(self.brush_stage_valid_i1) if (int(values["e{}d.i1valid".format(i+1)])) else self.I1_stages[i].setBrush(self.brush_stage_invalid)
-            self.I0_copy[i].setBrush(self.brush_copy) if (int(values["i0_e{}_copy".format(i+1)]) and int(values["e{}d.i0valid".format(i+1)])) else self.I0_copy[i].setBrush(self.brush_neutral)
-            self.I1_copy[i].setBrush(self.brush_copy) if (int(values["i1_e{}_copy".format(i+1)]) and int(values["e{}d.i1valid".format(i+1)])) else self.I1_copy[i].setBrush(self.brush_neutral)
-            
-            self.LSU_stages[i].setBrush(self.brush_stage_valid) if (int(values["dc{}_valid".format(i+1)])) else self.LSU_stages[i].setBrush(self.brush_stage_invalid)
-        
-        self.i1_wb_buffer.setBrush(self.brush_stage_valid) if (int(values["i1_wb_buffer_val_q"])) else self.i1_wb_buffer.setBrush(self.brush_stage_invalid)
-        self.i1_wb_buffer.setPen(self.pen_line_rs1) if (int(values["i0_rs1_depend_i1_buf"]) or int(values["i1_rs1_depend_i1_buf"])) else self.i1_wb_buffer.setPen(QPen(Qt.black, 1))
-        self.i1_wb_buffer.setPen(self.pen_line_rs2) if (int(values["i0_rs2_depend_i1_buf"]) or int(values["i1_rs2_depend_i1_buf"])) else self.i1_wb_buffer.setPen(QPen(Qt.black, 1))
-
+            if self._changed(self.I0_stages[i], frame.stage_valid[0][i]):
+                self.I0_stages[i].setBrush(self.brush_stage_valid) if (frame.stage_valid[0][i]) else self.I0_stages[i].setBrush(self.brush_stage_invalid)
+            if self._changed(self.I1_stages[i], frame.stage_valid[1][i]):
+                self.I1_stages[i].setBrush(self.brush_stage_valid_i1) if (frame.stage_valid[1][i]) else self.I1_stages[i].setBrush(self.brush_stage_invalid)
+            if self._changed(self.I0_copy[i], frame.stage_copy[0][i]):
+                self.I0_copy[i].setBrush(self.brush_copy) if (frame.stage_copy[0][i]) else self.I0_copy[i].setBrush(self.brush_neutral)
+            if self._changed(self.I1_copy[i], frame.stage_copy[1][i]):
+                self.I1_copy[i].setBrush(self.brush_copy) if (frame.stage_copy[1][i]) else self.I1_copy[i].setBrush(self.brush_neutral)
+
+            if self._changed(self.LSU_stages[i], frame.lsu_valid[i]):
+                self.LSU_stages[i].setBrush(self.brush_stage_valid) if (frame.lsu_valid[i]) else self.LSU_stages[i].setBrush(self.brush_stage_invalid)
 
         for i in range(3):
-            self.MUL_stages[i].setBrush(self.brush_stage_valid) if (int(values["valid_e{}".format(i+1)])) else self.MUL_stages[i].setBrush(self.brush_stage_invalid)
+            if self._changed(self.MUL_stages[i], frame.mul_valid[i]):
+                self.MUL_stages[i].setBrush(self.brush_stage_valid) if (frame.mul_valid[i]) else self.MUL_stages[i].setBrush(self.brush_stage_invalid)
 
         # stalling lines
-        self.stall_i0.hide()
-        self.stall_i1.hide()
-        if (int(values["dec_i0_decode_d"]) == 0): self.stall_i0.show()
-        if (int(values["dec_i1_decode_d"]) == 0): self.stall_i1.show()
+        if (not frame.decode[0]): shown.add(self.stall_i0)
+        if (not frame.decode[1]): shown.add(self.stall_i1)
 
         # color E1-E3 in a light blue if they are frozen
-        if (int(values["flush_final_e3"])):
-            self.freezable_stages.setBrush(self.brush_flush)
-        elif (int(values["freeze"])):
-            self.freezable_stages.setBrush(self.brush_freeze)
-        else:
-            self.freezable_stages.setBrush(self.brush_neutral)
-
-        if (int(values["flush_lower_wb"])):
-            self.flushable_stages.setBrush(self.brush_flush)
-        else:
-            self.flushable_stages.setBrush(self.brush_neutral)
+        if self._changed(self.freezable_stages, (frame.flush_final_e3, frame.freeze)):
+            if (frame.flush_final_e3):
+                self.freezable_stages.setBrush(self.brush_flush)
+            elif (frame.freeze):
+                self.freezable_stages.setBrush(self.brush_freeze)
+            else:
+                self.freezable_stages.setBrush(self.brush_neutral)
+
+        if self._changed(self.flushable_stages, frame.flush_lower_wb):
+            if (frame.flush_lower_wb):
+                self.flushable_stages.setBrush(self.brush_flush)
+            else:
+                self.flushable_stages.setBrush(self.brush_neutral)
 
         # set instruction and PC in IB
-        self.IB_PC_text[0].setText("PC: "+ "{:08X}".format(int(values["dec_i0_pc_d"]+"0", 2)))
-        self.IB_PC_text[1].setText("PC: "+ "{:08X}".format(int(values["dec_i1_pc_d"]+"0", 2)))
-        self.IB_PC_text[2].setText("PC: "+ "{:08X}".format(int(values["pc2"][:-1]+"0", 2)))
-        self.IB_PC_text[3].setText("PC: "+ "{:08X}".format(int(values["pc3"][:-1]+"0", 2)))
-        
-        self.IB_instr_text[0].setText(self._truncateInstructionText(assembly._getInstruction("{:08x}".format(int(values["dec_i0_pc_d"]+"0", 2))), 25))
-        self.IB_instr_text[1].setText(self._truncateInstructionText(assembly._getInstruction("{:08x}".format(int(values["dec_i1_pc_d"]+"0", 2))), 25))
-        self.IB_instr_text[2].setText(self._truncateInstructionText(assembly._getInstruction("{:08x}".format(int(values["pc2"][:-1]+"0", 2))), 25))
-        self.IB_instr_text[3].setText(self._truncateInstructionText(assembly._getInstruction("{:08x}".format(int(values["pc3"][:-1]+"0", 2))), 25))
+        for i in range(4):
+            if self._changed(self.IB_PC_text[i], frame.ib_pc[i]):
+                self.IB_PC_text[i].setText("PC: {:08X}".format(frame.ib_pc[i]))
+                self.IB_instr_text[i].setText(self._truncateInstructionText(instructions._getInstruction(frame.ib_pc[i]), 25))
 
         # set class text of all stages
-
         for i in range(5):
-            self.I0_class_text[i].setText(self._getStageClassText(values, "e{}".format(i+1), "i0"))
-            self.I1_class_text[i].setText(self._getStageClassText(values, "e{}".format(i+1), "i1"))
-            self.I0_info_text[i].setText("Instr: {}\nPC: {:08X}\nRD: x{}".format(assembly._getInstruction("{:08x}".format(int(values["i0_pc_e{}".format(i+1)]+"0", 2))).split(' ')[0], int(values["i0_pc_e{}".format(i+1)]+"0", 2), int(values["e{}_i0_rd".format(i+1)], 2)))
-            self.I1_info_text[i].setText("Instr: {}\nPC: {:08X}\nRD: x{}".format(assembly._getInstruction("{:08x}".format(int(values["i1_pc_e{}".format(i+1)]+"0", 2))).split(' ')[0], int(values["i1_pc_e{}".format(i+1)]+"0", 2), int(values["e{}_i1_rd".format(i+1)], 2)))
+            if self._changed(self.I0_class_text[i], frame.stage_class[0][i]):
+                self.I0_class_text[i].setText(STAGE_CLASSES[frame.stage_class[0][i]])
+            if self._changed(self.I1_class_text[i], frame.stage_class[1][i]):
+                self.I1_class_text[i].setText(STAGE_CLASSES[frame.stage_class[1][i]])
+            if self._changed(self.I0_info_text[i], (frame.stage_pc[0][i], frame.stage_rd[0][i])):
+                self.I0_info_text[i].setText("Instr: {}\nPC: {:08X}\nRD: x{}".format(instructions.getMnemonic(frame.stage_pc[0][i]), frame.stage_pc[0][i], frame.stage_rd[0][i]))
+            if self._changed(self.I1_info_text[i], (frame.stage_pc[1][i], frame.stage_rd[1][i])):
+                self.I1_info_text[i].setText("Instr: {}\nPC: {:08X}\nRD: x{}".format(instructions.getMnemonic(frame.stage_pc[1][i]), frame.stage_pc[1][i], frame.stage_rd[1][i]))
 
-        self.nonblock_load_commit.hide()
-        if (int(values["nonblock_load_wen"])): self.nonblock_load_commit.show()
+        if (frame.nonblock_load_wen): shown.add(self.nonblock_load_commit)
 
-        self.CSRs["faultless"].setBrush(self.brush_copy) if (int(values["faultless"])) else self.CSRs["faultless"].setBrush(self.brush_neutral)
+        if self._changed(self.CSRs["faultless"], frame.faultless):
+            self.CSRs["faultless"].setBrush(self.brush_copy) if (frame.faultless) else self.CSRs["faultless"].setBrush(self.brush_neutral)
 
-        if (int(values["dec_i0_decode_d"])): self._toggleArrowVisibilityI0_RS1(int(values["i0_rs1bypass"], 2))
-        if (int(values["dec_i0_decode_d"])): self._toggleArrowVisibilityI0_RS2(int(values["i0_rs2bypass"], 2))
-        if (int(values["dec_i1_decode_d"])): self._toggleArrowVisibilityI1_RS1(int(values["i1_rs1bypass"], 2))
-        if (int(values["dec_i1_decode_d"])): self._toggleArrowVisibilityI1_RS2(int(values["i1_rs2bypass"], 2))
+        if (frame.decode[0]): self._toggleArrowVisibilityI0_RS1(frame.rs_bypass[0][0], shown)
+        if (frame.decode[0]): self._toggleArrowVisibilityI0_RS2(frame.rs_bypass[0][1], shown)
+        if (frame.decode[1]): self._toggleArrowVisibilityI1_RS1(frame.rs_bypass[1][0], shown)
+        if (frame.decode[1]): self._toggleArrowVisibilityI1_RS2(frame.rs_bypass[1][1], shown)
 
         # GPR values
         for i in range(1,32):
-            self.regs_text[i].setText("0x{:08X}".format(int(values["x{}".format(i)], 2)))
-
-        self._colorRegs(values)
-
-        if ((int(values["e2d.i0rs1bype2"], 2) >> 1) & 0x1): self.I0_E3_RS1_From_i1_WB.show()
-        if ((int(values["e2d.i0rs1bype2"], 2) >> 0) & 0x1): self.I0_E3_RS1_From_i0_WB.show()
-        
-        if ((int(values["e2d.i0rs2bype2"], 2) >> 1) & 0x1): self.I0_E3_RS2_From_i1_WB.show()
-        if ((int(values["e2d.i0rs2bype2"], 2) >> 0) & 0x1): self.I0_E3_RS2_From_i0_WB.show()
-        
-        if ((int(values["e2d.i1rs1bype2"], 2) >> 1) & 0x1): self.I1_E3_RS1_From_i1_WB.show()
-        if ((int(values["e2d.i1rs1bype2"], 2) >> 0) & 0x1): self.I1_E3_RS1_From_i0_WB.show()
-        
-        if ((int(values["e2d.i1rs2bype2"], 2) >> 1) & 0x1): self.I1_E3_RS2_From_i1_WB.show()
-        if ((int(values["e2d.i1rs2bype2"], 2) >> 0) & 0x1): self.I1_E3_RS2_From_i0_WB.show()
-        
-        if ((int(values["e3d.i0rs1bype3"], 2) >> 3) & 0x1): self.I0_E4_RS1_From_i1_E4.show()
-        if ((int(values["e3d.i0rs1bype3"], 2) >> 2) & 0x1): self.I0_E4_RS1_From_i0_E4.show()
-        if ((int(values["e3d.i0rs1bype3"], 2) >> 1) & 0x1): self.I0_E4_RS1_From_i1_WB.show()
-        if ((int(values["e3d.i0rs1bype3"], 2) >> 0) & 0x1): self.I0_E4_RS1_From_i0_WB.show()
-        
-        if ((int(values["e3d.i0rs2bype3"], 2) >> 3) & 0x1): self.I0_E4_RS2_From_i1_E4.show()
-        if ((int(values["e3d.i0rs2bype3"], 2) >> 2) & 0x1): self.I0_E4_RS2_From_i0_E4.show()
-        if ((int(values["e3d.i0rs2bype3"], 2) >> 1) & 0x1): self.I0_E4_RS2_From_i1_WB.show()
-        if ((int(values["e3d.i0rs2bype3"], 2) >> 0) & 0x1): self.I0_E4_RS2_From_i0_WB.show()
-        
-        if ((int(values["e3d.i1rs1bype3"], 2) >> 6) & 0x1 & int(values["e3d.i1valid"])): self.Intra_Bypass_RS1.show()
-        if ((int(values["e3d.i1rs1bype3"], 2) >> 5) & 0x1 & int(values["e3d.i1valid"])): self.Intra_Bypass_RS1.show()
-        if ((int(values["e3d.i1rs1bype3"], 2) >> 4) & 0x1 & int(values["e3d.i1valid"])): self.Intra_Bypass_RS1.show()
-        if ((int(values["e3d.i1rs1bype3"], 2) >> 3) & 0x1 & int(values["e3d.i1valid"])): self.I1_E4_RS1_From_i1_E4.show()
-        if ((int(values["e3d.i1rs1bype3"], 2) >> 2) & 0x1 & int(values["e3d.i1valid"])): self.I1_E4_RS1_From_i0_E4.show()
-        if ((int(values["e3d.i1rs1bype3"], 2) >> 1) & 0x1 & int(values["e3d.i1valid"])): self.I1_E4_RS1_From_i1_WB.show()
-        if ((int(values["e3d.i1rs1bype3"], 2) >> 0) & 0x1 & int(values["e3d.i1valid"])): self.I1_E4_RS1_From_i0_WB.show()
-        
-        if ((int(values["e3d.i1rs2bype3"], 2) >> 6) & 0x1 & int(values["e3d.i1valid"])): self.Intra_Bypass_RS2.show()
-        if ((int(values["e3d.i1rs2bype3"], 2) >> 5) & 0x1 & int(values["e3d.i1valid"])): self.Intra_Bypass_RS2.show()
-        if ((int(values["e3d.i1rs2bype3"], 2) >> 4) & 0x1 & int(values["e3d.i1valid"])): self.Intra_Bypass_RS2.show()
-        if ((int(values["e3d.i1rs2bype3"], 2) >> 3) & 0x1 & int(values["e3d.i1valid"])): self.I1_E4_RS2_From_i1_E4.show()
-        if ((int(values["e3d.i1rs2bype3"], 2) >> 2) & 0x1 & int(values["e3d.i1valid"])): self.I1_E4_RS2_From_i0_E4.show()
-        if ((int(values["e3d.i1rs2bype3"], 2) >> 1) & 0x1 & int(values["e3d.i1valid"])): self.I1_E4_RS2_From_i1_WB.show()
-        if ((int(values["e3d.i1rs2bype3"], 2) >> 0) & 0x1 & int(values["e3d.i1valid"])): self.I1_E4_RS2_From_i0_WB.show()
+            if self._changed(self.regs_text[i], frame.gpr[i]):
+                self.regs_text[i].setText("0x{:08X}".format(frame.gpr[i]))
+
+        self._colorRegs(frame, shown)
+
+        # E2 bypass: bit 1 from i1 WB, bit 0 from i0 WB
+        e3_from_wb = [[[self.I0_E3_RS1_From_i0_WB, self.I0_E3_RS1_From_i1_WB], [self.I0_E3_RS2_From_i0_WB, self.I0_E3_RS2_From_i1_WB]],
+                      [[self.I1_E3_RS1_From_i0_WB, self.I1_E3_RS1_From_i1_WB], [self.I1_E3_RS2_From_i0_WB, self.I1_E3_RS2_From_i1_WB]]]
+        for pipe in range(2):
+            for rs in range(2):
+                for bit in range(2):
+                    if ((frame.bype2[pipe][rs] >> bit) & 0x1): shown.add(e3_from_wb[pipe][rs][bit])
+
+        # E3 bypass: bits 0-3 from i0 WB, i1 WB, i0 E4, i1 E4, bits 4-6 (i1 only) intra bypass
+        e4_from = [[[self.I0_E4_RS1_From_i0_WB, self.I0_E4_RS1_From_i1_WB, self.I0_E4_RS1_From_i0_E4, self.I0_E4_RS1_From_i1_E4],
+                    [self.I0_E4_RS2_From_i0_WB, self.I0_E4_RS2_From_i1_WB, self.I0_E4_RS2_From_i0_E4, self.I0_E4_RS2_From_i1_E4]],
+                   [[self.I1_E4_RS1_From_i0_WB, self.I1_E4_RS1_From_i1_WB, self.I1_E4_RS1_From_i0_E4, self.I1_E4_RS1_From_i1_E4] + [self.Intra_Bypass_RS1]*3,
+                    [self.I1_E4_RS2_From_i0_WB, self.I1_E4_RS2_From_i1_WB, self.I1_E4_RS2_From_i0_E4, self.I1_E4_RS2_From_i1_E4] + [self.Intra_Bypass_RS2]*3]]
+        for pipe in range(2):
+            for rs in range(2):
+                for bit in range(len(e4_from[pipe][rs])):
+                    if ((frame.bype3[pipe][rs] >> bit) & 0x1): shown.add(e4_from[pipe][rs][bit])
             
-        if (int(values["load_mul_rs1_bypass_e1"])): self.DC3_M2_RS1.show()
-        if (int(values["load_mul_rs2_bypass_e1"])): self.DC3_M2_RS2.show()
+        if (frame.load_mul_bypass[0]): shown.add(self.DC3_M2_RS1)
+        if (frame.load_mul_bypass[1]): shown.add(self.DC3_M2_RS2)
 
-        if (int(values["dc1_ldst_bypass"])                and int(values["dc1_valid"])): self.DC3_DC2_RS1.show()
-        if (int(values["dc1_store_data_bypass_c1"])       and int(values["dc1_valid"])): self.DC3_DC2_RS2.show()
-        if (int(values["dc2_store_data_bypass_c2"])       and int(values["dc2_valid"])): self.DC3_DC3.show()
-        if (int(values["dc2_store_data_bypass_i0_e2_c2"]) and int(values["dc2_valid"])): self.E2_DC3.show()
-        if (int(values["dc1_store_data_bypass_e4_c1"])    and int(values["dc1_valid"])): self.E4_LSU_Bypass[0].show()
-        if (int(values["dc2_store_data_bypass_e4_c2"])    and int(values["dc2_valid"])): self.E4_LSU_Bypass[1].show()
-        if (int(values["dc3_store_data_bypass_e4_c3"])    and int(values["dc3_valid"])): self.E4_LSU_Bypass[2].show()
+        if (frame.dc3_dc2_rs1): shown.add(self.DC3_DC2_RS1)
+        if (frame.dc3_dc2_rs2): shown.add(self.DC3_DC2_RS2)
+        if (frame.dc3_dc3):     shown.add(self.DC3_DC3)
+        if (frame.e2_dc3):      shown.add(self.E2_DC3)
+        for i in range(3):
+            if (frame.e4_dc[i]): shown.add(self.E4_LSU_Bypass[i])
+
+        self._applyVisibility(shown)
 
     def _createCycleLabel(self):
         layout = QHBoxLayout()
@@ -1464,481 +1582,530 @@ class VeeRisual(QMainWindow):
         self.rightbtn = QPushButton('>')
         layout.addWidget(self.rightbtn, 0, 1)
 
+        # playback
+        self.playbtn = QPushButton('Play')
+        layout.addWidget(self.playbtn, 0, 2)
+        self.ratebox = QSpinBox()
+        self.ratebox.setRange(1, 1000000)
+        self.ratebox.setValue(VEERISUAL_PLAY_RATE)
+        self.ratebox.setSuffix(" cycles/s")
+        layout.addWidget(self.ratebox, 0, 3)
+        self.fpslabel = QLabel("")
+        layout.addWidget(self.fpslabel, 0, 4)
+
+        # event navigation
+        self.prevevtbtn = QPushButton('<< previous')
+        layout.addWidget(self.prevevtbtn, 1, 0)
+        self.nextevtbtn = QPushButton('next >>')
+        layout.addWidget(self.nextevtbtn, 1, 1)
+        self.eventbox = QComboBox()
+        self.eventbox.addItems(list(EVENT_TYPES))
+        layout.addWidget(self.eventbox, 1, 2)
+        self.heatmapbox = QCheckBox("Bypass heatmap")
+        layout.addWidget(self.heatmapbox, 1, 3)
+
+        # search by PC, symbol or signal expression
+        self.prevsearchbtn = QPushButton('<< find')
+        layout.addWidget(self.prevsearchbtn, 2, 0)
+        self.nextsearchbtn = QPushButton('find >>')
+        layout.addWidget(self.nextsearchbtn, 2, 1)
+        self.searchbox = QLineEdit()
+        self.searchbox.setPlaceholderText("PC, symbol or expression, e.g. e4d.i0valid and i0_e4_beq")
+        layout.addWidget(self.searchbox, 2, 2, 1, 3)
+
         self.generalLayout.addLayout(layout)
 
     def _createGraphicsView(self):
         self.scene = QGraphicsScene()
         self.graphicsview = QGraphicsView(self.scene)
         self.graphicsview.setStyleSheet("background-color: white;")
-        self.generalLayout.addWidget(self.graphicsview)
+        self.scenelayout = QHBoxLayout()
+        self.scenelayout.addWidget(self.graphicsview, 1)
+        self.generalLayout.addLayout(self.scenelayout)
+        self._createRetireList()
+
+    # retired instructions next to the scene, see RetireListModel
+    def _createRetireList(self):
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("Retired instructions"))
+        self.retirelist = QListView()
+        # rows of one height let the view only lay out the visible ones
+        self.retirelist.setUniformItemSizes(True)
+        self.retirelist.setFixedWidth(400)
+        layout.addWidget(self.retirelist)
+        self.retirebox = QLineEdit()
+        self.retirebox.setPlaceholderText("#N, or PC or symbol retiring next")
+        self.retirebox.setFixedWidth(400)
+        layout.addWidget(self.retirebox)
+        self.scenelayout.addLayout(layout)
+
+    # the retired instruction at position in the list, if it has one
+    def showRetired(self, position):
+        model = self.retirelist.model()
+        if (model is None or not model.rowCount()):
+            return
+        index = model.index(min(position, model.rowCount() - 1))
+        self.retirelist.setCurrentIndex(index)
+        self.retirelist.scrollTo(index, QListView.PositionAtCenter)
     
     def setCycleLabel(self, cycle):
         self.cyclelabel.setText("Current cycle: {:5d}".format(cycle))
 
+    def setPlaying(self, playing):
+        self.playbtn.setText('Pause') if (playing) else self.playbtn.setText('Play')
+        if (not playing): self.fpslabel.setText("")
+
+    def setFPS(self, fps, hit_rate=None):
+        cached = ", {:.0%} cached".format(hit_rate) if (hit_rate is not None) else ""
+        self.fpslabel.setText("{:.1f} fps{}".format(fps, cached))
+
+    def setDiffLabel(self, cycle, fields):
+        differing = ", ".join(fields[:8]) + (", ..." if len(fields) > 8 else "") if fields else "none"
+        self.difflabel.setText("Second run cycle: {:5d}   differing: {}".format(cycle, differing))
+
 # ===[ Controller Class ]==================================
 class VeeRisualCtrl():
-    def __init__(self, view, vcdhandler, disas_handler):
+    def __init__(self, view, vcdhandler, disas_handler, cache_size=VEERISUAL_FRAME_CACHE_SIZE, prefetch_depth=VEERISUAL_PREFETCH_DEPTH):
         self._view = view
         self._vcdhandler = vcdhandler
         self._disas_handler = disas_handler
+        self._frames = FramePrefetcher(vcdhandler, cache_size, prefetch_depth)
         self._view.setCycleLabel(0)
         self._view.progressbar.setMinimum(0)
-        self._view.progressbar.setMaximum(self._vcdhandler.final_time)
+        self._view.progressbar.setMaximum(self._vcdhandler.final_cycle)
+        self._shown_cycle = None
+        self._scrub_timer = QTimer(self._view)
+        self._scrub_timer.setSingleShot(True)
+        self._scrub_timer.setInterval(1000 // VEERISUAL_SCRUB_FPS)
+        self._scrub_timer.timeout.connect(self._scrubTimeout)
+        self._play_timer = QTimer(self._view)
+        self._play_timer.timeout.connect(self._playTick)
         self.connectSignals()
         
         # arrow key controls
         QShortcut(QKeySequence(Qt.Key_Left),  self._view, activated=self.leftbtn_click)
         QShortcut(QKeySequence(Qt.Key_Right), self._view, activated=self.rightbtn_click)
+        QShortcut(QKeySequence(Qt.Key_Space), self._view, activated=self.playbtn_click)
+        QShortcut(QKeySequence(Qt.CTRL + Qt.Key_Left),  self._view, activated=self.prevevtbtn_click)
+        QShortcut(QKeySequence(Qt.CTRL + Qt.Key_Right), self._view, activated=self.nextevtbtn_click)
+
+        # redraw once the signals and the disassembly loaded in the background are in
+        self._loading = {"signals": self._vcdhandler.isLoading(), "disassembly": self._disas_handler.isLoading()}
+        self._retire_model = None
+        if (not self._loading["signals"]):
+            self._setRetireModel()
+        if any(self._loading.values()):
+            self._showLoading()
+            self._load_timer = QTimer(self._view)
+            self._load_timer.timeout.connect(self._checkLoading)
+            self._load_timer.start(200)
+
+    def _showLoading(self):
+        loading = []
+        if self._loading["signals"]:
+            loading.append("signals " + ", ".join(self._vcdhandler.pending_groups))
+        if self._loading["disassembly"]:
+            loading.append("disassembly")
+        self._view.statusBar().showMessage("Loading " + "; ".join(loading))
+
+    def _checkLoading(self):
+        loading = {"signals": self._vcdhandler.isLoading(), "disassembly": self._disas_handler.isLoading()}
+        if loading == self._loading:
+            return
+        if self._loading["disassembly"] and not loading["disassembly"]:
+            self._view.invalidateInstructionText()
+            if (self._retire_model is not None):
+                self._retire_model.refresh()
+        if self._loading["signals"] and not loading["signals"]:
+            self._setRetireModel()
+        self._loading = loading
+        if any(loading.values()):
+            self._showLoading()
+        else:
+            self._load_timer.stop()
+            self._view.statusBar().clearMessage()
+        self.updateView()
     
     def leftbtn_click(self):
-        if (self._vcdhandler.cycle - self._vcdhandler.step_size < 5):
-            self._vcdhandler.cycle = 5
+        if (self._vcdhandler.cycle - 1 < 0):
+            self._vcdhandler.cycle = 0
         else:
-            self._vcdhandler.cycle = self._vcdhandler.cycle - self._vcdhandler.step_size
+            self._vcdhandler.cycle = self._vcdhandler.cycle - 1
         self._view.setCycleLabel(self._vcdhandler.cycle)
         self._view.progressbar.setValue(self._vcdhandler.cycle)
-        self.updateView()
+        if (self._vcdhandler.cycle != self._shown_cycle):
+            self.updateView()
 
     def rightbtn_click(self):
-        if (self._vcdhandler.cycle + self._vcdhandler.step_size > self._vcdhandler.final_time):
-            self._vcdhandler.cycle = self._vcdhandler.final_time
+        if (self._vcdhandler.cycle + 1 > self._vcdhandler.final_cycle):
+            self._vcdhandler.cycle = self._vcdhandler.final_cycle
         else:
-            self._vcdhandler.cycle = self._vcdhandler.cycle + self._vcdhandler.step_size
+            self._vcdhandler.cycle = self._vcdhandler.cycle + 1
         self._view.setCycleLabel(self._vcdhandler.cycle)
         self._view.progressbar.setValue(self._vcdhandler.cycle)
+        if (self._vcdhandler.cycle != self._shown_cycle):
+            self.updateView()
+
+    def prevevtbtn_click(self):
+        event = self._view.eventbox.currentText()
+        self._jumpTo(self._vcdhandler.previousEvent(event), "No earlier " + event)
+
+    def nextevtbtn_click(self):
+        event = self._view.eventbox.currentText()
+        self._jumpTo(self._vcdhandler.nextEvent(event), "No later " + event)
+
+    def prevsearchbtn_click(self):
+        condition = self._searchCondition()
+        if (condition is not None):
+            self._jumpTo(self._vcdhandler.previousMatch(condition), "No earlier match")
+
+    def nextsearchbtn_click(self):
+        condition = self._searchCondition()
+        if (condition is not None):
+            self._jumpTo(self._vcdhandler.nextMatch(condition), "No later match")
+
+    def heatmapbox_toggled(self, checked):
+        if (checked):
+            counts = bypassStatistics(self._vcdhandler)
+            cycles = self._vcdhandler.final_cycle + 1
+            self._view.setBypassHeatmap(counts, cycles)
+            self._view.statusBar().showMessage("Bypass heatmap over {} cycles, {} path uses".format(cycles, sum(counts.values())), 3000)
+        else:
+            self._view.setBypassHeatmap(None)
+        self.updateView()
+
+    # the retire index needs the pipeline signals, so the list is filled once they are in
+    def _setRetireModel(self):
+        self._retire_model = RetireListModel(self._vcdhandler.getRetireIndex(), self._disas_handler)
+        self._view.retirelist.setModel(self._retire_model)
+
+    # jumps to the cycle the value shown for a GPR was written in, clicking again
+    # walks further back through its writes
+    def register_clicked(self, register):
+        if (self._vcdhandler.isLoading()):
+            self._view.statusBar().showMessage("Signals are still loading", 3000)
+            return
+        write = self._vcdhandler.getGPRWriteIndex().lastWrite(register, self._vcdhandler.cycle)
+        if (write is None):
+            self._view.statusBar().showMessage("x{} is not written before cycle {}".format(register, self._vcdhandler.cycle), 3000)
+            return
+        cycle, value, pc = write
+        self._jumpTo(cycle, "")
+        writer = "PC {:08X} {}".format(pc, self._disas_handler.getSymbolText(pc)) if pc >= 0 else "a non-blocking load (no writeback)"
+        self._view.statusBar().showMessage("x{} = 0x{:08X} written in cycle {} by {}".format(register, value, cycle, writer), 5000)
+
+    def retirelist_clicked(self, index):
+        self._jumpTo(self._retire_model.retired.nth(index.row()), "")
+
+    # "#N" jumps to the Nth retired instruction, a PC or symbol to the next cycle it retires in
+    def retirebox_entered(self):
+        if (self._retire_model is None):
+            self._view.statusBar().showMessage("Signals are still loading", 3000)
+            return
+        retired = self._retire_model.retired
+        query = self._view.retirebox.text().strip()
+        if (re.fullmatch(r"#\d+", query)):
+            n = int(query[1:])
+            self._jumpTo(retired.nth(n), "Only {} instructions retire".format(len(retired)))
+            return
+        # symbols are only known once the disassembly is parsed, waiting for it would block the window
+        try:
+            pc = queryPC(query, self._disas_handler)
+        except ValueError as e:
+            self._view.statusBar().showMessage(str(e), 3000)
+            return
+        if (pc is None):
+            self._view.statusBar().showMessage("Not a PC (0x...) or symbol: " + query, 3000)
+            return
+        position = retired.nextPC(pc, self._vcdhandler.cycle)
+        self._jumpTo(retired.nth(position) if position is not None else None, "No later retirement of " + query)
+
+    # a word that may be a symbol fails while the disassembly is loading rather
+    # than waiting for it on the GUI thread
+    def _searchCondition(self):
+        try:
+            return SignalCondition.fromQuery(self._view.searchbox.text(), self._vcdhandler.signals, self._disas_handler)
+        except ValueError as e:
+            self._view.statusBar().showMessage(str(e), 3000)
+            return None
+
+    def _jumpTo(self, cycle, missing):
+        if (cycle is None):
+            self._view.statusBar().showMessage(missing, 3000)
+            return
+        self._vcdhandler.cycle = cycle
+        self._view.setCycleLabel(cycle)
+        self._view.progressbar.blockSignals(True)
+        self._view.progressbar.setValue(cycle)
+        self._view.progressbar.blockSignals(False)
         self.updateView()
 
+    # while the slider is dragged, only the latest position is rendered, at most
+    # VEERISUAL_SCRUB_FPS times a second, the final one exactly on release
     def slider_valuechanged(self):
-        slider_val = self._view.progressbar.value()
-        #new_cycle = int((self._vcdhandler.final_time * slider_val) / 100)
-        new_cycle = slider_val
-        while ((new_cycle % 10) != 5):
-            new_cycle -= 1
-        #print(new_cycle)
-        self._vcdhandler.cycle = new_cycle
+        # the slider covers the cycles, one position each
+        self._vcdhandler.cycle = self._view.progressbar.value()
         self._view.setCycleLabel(self._vcdhandler.cycle)
-        self.updateView()
+        if (self._view.progressbar.isSliderDown()):
+            if (not self._scrub_timer.isActive()):
+                self._scrub_timer.start()
+        elif (self._vcdhandler.cycle != self._shown_cycle):
+            self.updateView()
+
+    def slider_released(self):
+        self._scrub_timer.stop()
+        if (self._vcdhandler.cycle != self._shown_cycle):
+            self.updateView()
+
+    def _scrubTimeout(self):
+        if (self._vcdhandler.cycle != self._shown_cycle):
+            self.updateView()
 
     def connectSignals(self):
         self._view.leftbtn.clicked.connect(self.leftbtn_click)
         self._view.rightbtn.clicked.connect(self.rightbtn_click)
         self._view.progressbar.valueChanged.connect(self.slider_valuechanged)
-
-    # get correct data from VCD file
+        self._view.progressbar.sliderReleased.connect(self.slider_released)
+        self._view.playbtn.clicked.connect(self.playbtn_click)
+        self._view.prevevtbtn.clicked.connect(self.prevevtbtn_click)
+        self._view.nextevtbtn.clicked.connect(self.nextevtbtn_click)
+        self._view.prevsearchbtn.clicked.connect(self.prevsearchbtn_click)
+        self._view.nextsearchbtn.clicked.connect(self.nextsearchbtn_click)
+        self._view.searchbox.returnPressed.connect(self.nextsearchbtn_click)
+        self._view.heatmapbox.toggled.connect(self.heatmapbox_toggled)
+        self._view.ratebox.valueChanged.connect(self._restartPlayClock)
+        self._view.retirelist.clicked.connect(self.retirelist_clicked)
+        self._view.retirebox.returnPressed.connect(self.retirebox_entered)
+        self._view.registerClicked.connect(self.register_clicked)
+
+    # Playback advances by wall clock time: every tick renders the cycle that is due
+    # at the chosen rate, so cycles in between are skipped when rendering is slower.
+    # The tick interval follows the measured render time, so ticks never pile up
+    def playbtn_click(self):
+        if (self._play_timer.isActive()):
+            self._play_timer.stop()
+            self._view.setPlaying(False)
+            return
+        if (self._vcdhandler.cycle >= self._vcdhandler.final_cycle):
+            self._vcdhandler.cycle = 0
+        self._render_time = 0.0
+        self._frame_times = []
+        self._restartPlayClock()
+        self._play_timer.start(1000 // VEERISUAL_PLAY_FPS)
+        self._view.setPlaying(True)
+
+    def _restartPlayClock(self):
+        self._play_start = (time.monotonic(), self._vcdhandler.cycle)
+        self._play_cycle = self._vcdhandler.cycle
+
+    def _playTick(self):
+        # continue from where the user stepped or scrubbed to
+        if (self._vcdhandler.cycle != self._play_cycle):
+            self._restartPlayClock()
+        start_time, start_cycle = self._play_start
+        now = time.monotonic()
+        due = int((now - start_time) * self._view.ratebox.value())
+        cycle = min(start_cycle + due, self._vcdhandler.final_cycle)
+        if (cycle != self._vcdhandler.cycle):
+            self._vcdhandler.cycle = cycle
+            self._play_cycle = cycle
+            self._view.setCycleLabel(cycle)
+            self._view.progressbar.blockSignals(True)
+            self._view.progressbar.setValue(cycle)
+            self._view.progressbar.blockSignals(False)
+            self.updateView()
+            # moving average of the render time sets the next tick
+            self._render_time = 0.8 * self._render_time + 0.2 * (time.monotonic() - now)
+            self._play_timer.setInterval(max(1000 // VEERISUAL_PLAY_FPS, int(self._render_time * 1200)))
+
+            # achieved redraws over the last second
+            self._frame_times = [t for t in self._frame_times if now - t < 1.0] + [now]
+            if (len(self._frame_times) > 1):
+                self._view.setFPS((len(self._frame_times) - 1) / (now - self._frame_times[0]), self._frames.hitRate())
+        if (cycle >= self._vcdhandler.final_cycle):
+            self._play_timer.stop()
+            self._view.setPlaying(False)
+
+    # get correct data from VCD file, prefetching further in the stepping direction
     def updateView(self):
-        self._view._updateView(self._vcdhandler.getValueDict(), self._disas_handler)
-
-# ===[ VCD Handler Class ]=================================
-class VCDHandler():
-    def __init__(self, file):
-        self.step_size = 10
-        self.cycle = 5
-        self.signals = {
-            "clk"         : VEER_TOP + "clk",
-            #IB
-            "ib0"         : VEER_DEC_IB + "ib0[31:0]",
-            "ib1"         : VEER_DEC_IB + "ib1[31:0]",
-            "ib2"         : VEER_DEC_IB + "ib2[31:0]",
-            "ib3"         : VEER_DEC_IB + "ib3[31:0]",
-            "shift0"      : VEER_DEC_IB + "shift0",
-            "shift1"      : VEER_DEC_IB + "shift1",
-            "shift2"      : VEER_DEC_IB + "shift2",
-            "ibval"       : VEER_DEC_IB + "ibval[3:0]",
-            "dec_i0_pc_d" : VEER_DEC_IB + "dec_i0_pc_d[31:1]",
-            "dec_i1_pc_d" : VEER_DEC_IB + "dec_i1_pc_d[31:1]",
-            "pc2"         : VEER_DEC_IB + "pc2[36:0]",
-            "pc3"         : VEER_DEC_IB + "pc3[36:0]",
-            "ic0"         : VEER_DEC_IB + "ic0",
-            "ic1"         : VEER_DEC_IB + "ic1",
-            "ic2"         : VEER_DEC_IB + "ic2",
-            "ic3"         : VEER_DEC_IB + "ic3",
-            "i0_wen_shifted" : VEER_DEC_IB + "i0_wen_shifted[3:0]",
-            "i1_wen_shifted" : VEER_DEC_IB + "i1_wen_shifted[3:1]",
-
-            #IFU
-            "ifu_i0_pc" : VEER_TOP + "ifu.aln.ifu_i0_pc[31:1]",
-            "ifu_i1_pc" : VEER_TOP + "ifu.aln.ifu_i1_pc[31:1]",
-
-            # GPRs
-            "i0_rs1_en_d" : VEER_DEC_DECODE + "dec_i0_rs1_en_d", 
-            "i0_rs2_en_d" : VEER_DEC_DECODE + "dec_i0_rs2_en_d", 
-            "i1_rs1_en_d" : VEER_DEC_DECODE + "dec_i1_rs1_en_d", 
-            "i1_rs2_en_d" : VEER_DEC_DECODE + "dec_i1_rs2_en_d", 
-
-            "i0_rs1"      : VEER_DEC_DECODE + "i0r.rs1[4:0]",
-            "i0_rs2"      : VEER_DEC_DECODE + "i0r.rs2[4:0]",
-            "i1_rs1"      : VEER_DEC_DECODE + "i1r.rs1[4:0]",
-            "i1_rs2"      : VEER_DEC_DECODE + "i1r.rs2[4:0]",
-
-            "x1"          : VEER_GPR + "gpr[1].gprff.dout[31:0]",
-            "x2"          : VEER_GPR + "gpr[2].gprff.dout[31:0]",
-            "x3"          : VEER_GPR + "gpr[3].gprff.dout[31:0]",
-            "x4"          : VEER_GPR + "gpr[4].gprff.dout[31:0]",
-            "x5"          : VEER_GPR + "gpr[5].gprff.dout[31:0]",
-            "x6"          : VEER_GPR + "gpr[6].gprff.dout[31:0]",
-            "x7"          : VEER_GPR + "gpr[7].gprff.dout[31:0]",
-            "x8"          : VEER_GPR + "gpr[8].gprff.dout[31:0]",
-            "x9"          : VEER_GPR + "gpr[9].gprff.dout[31:0]",
-            "x10"         : VEER_GPR + "gpr[10].gprff.dout[31:0]",
-            "x11"         : VEER_GPR + "gpr[11].gprff.dout[31:0]",
-            "x12"         : VEER_GPR + "gpr[12].gprff.dout[31:0]",
-            "x13"         : VEER_GPR + "gpr[13].gprff.dout[31:0]",
-            "x14"         : VEER_GPR + "gpr[14].gprff.dout[31:0]",
-            "x15"         : VEER_GPR + "gpr[15].gprff.dout[31:0]",
-            "x16"         : VEER_GPR + "gpr[16].gprff.dout[31:0]",
-            "x17"         : VEER_GPR + "gpr[17].gprff.dout[31:0]",
-            "x18"         : VEER_GPR + "gpr[18].gprff.dout[31:0]",
-            "x19"         : VEER_GPR + "gpr[19].gprff.dout[31:0]",
-            "x20"         : VEER_GPR + "gpr[20].gprff.dout[31:0]",
-            "x21"         : VEER_GPR + "gpr[21].gprff.dout[31:0]",
-            "x22"         : VEER_GPR + "gpr[22].gprff.dout[31:0]",
-            "x23"         : VEER_GPR + "gpr[23].gprff.dout[31:0]",
-            "x24"         : VEER_GPR + "gpr[24].gprff.dout[31:0]",
-            "x25"         : VEER_GPR + "gpr[25].gprff.dout[31:0]",
-            "x26"         : VEER_GPR + "gpr[26].gprff.dout[31:0]",
-            "x27"         : VEER_GPR + "gpr[27].gprff.dout[31:0]",
-            "x28"         : VEER_GPR + "gpr[28].gprff.dout[31:0]",
-            "x29"         : VEER_GPR + "gpr[29].gprff.dout[31:0]",
-            "x30"         : VEER_GPR + "gpr[30].gprff.dout[31:0]",
-            "x31"         : VEER_GPR + "gpr[31].gprff.dout[31:0]",
-
-            "x1_en"          : VEER_GPR + "gpr[1].gprff.en",
-            "x2_en"          : VEER_GPR + "gpr[2].gprff.en",
-            "x3_en"          : VEER_GPR + "gpr[3].gprff.en",
-            "x4_en"          : VEER_GPR + "gpr[4].gprff.en",
-            "x5_en"          : VEER_GPR + "gpr[5].gprff.en",
-            "x6_en"          : VEER_GPR + "gpr[6].gprff.en",
-            "x7_en"          : VEER_GPR + "gpr[7].gprff.en",
-            "x8_en"          : VEER_GPR + "gpr[8].gprff.en",
-            "x9_en"          : VEER_GPR + "gpr[9].gprff.en",
-            "x10_en"         : VEER_GPR + "gpr[10].gprff.en",
-            "x11_en"         : VEER_GPR + "gpr[11].gprff.en",
-            "x12_en"         : VEER_GPR + "gpr[12].gprff.en",
-            "x13_en"         : VEER_GPR + "gpr[13].gprff.en",
-            "x14_en"         : VEER_GPR + "gpr[14].gprff.en",
-            "x15_en"         : VEER_GPR + "gpr[15].gprff.en",
-            "x16_en"         : VEER_GPR + "gpr[16].gprff.en",
-            "x17_en"         : VEER_GPR + "gpr[17].gprff.en",
-            "x18_en"         : VEER_GPR + "gpr[18].gprff.en",
-            "x19_en"         : VEER_GPR + "gpr[19].gprff.en",
-            "x20_en"         : VEER_GPR + "gpr[20].gprff.en",
-            "x21_en"         : VEER_GPR + "gpr[21].gprff.en",
-            "x22_en"         : VEER_GPR + "gpr[22].gprff.en",
-            "x23_en"         : VEER_GPR + "gpr[23].gprff.en",
-            "x24_en"         : VEER_GPR + "gpr[24].gprff.en",
-            "x25_en"         : VEER_GPR + "gpr[25].gprff.en",
-            "x26_en"         : VEER_GPR + "gpr[26].gprff.en",
-            "x27_en"         : VEER_GPR + "gpr[27].gprff.en",
-            "x28_en"         : VEER_GPR + "gpr[28].gprff.en",
-            "x29_en"         : VEER_GPR + "gpr[29].gprff.en",
-            "x30_en"         : VEER_GPR + "gpr[30].gprff.en",
-            "x31_en"         : VEER_GPR + "gpr[31].gprff.en",
-
-            # Decode Ctrl
-            "dec_i0_decode_d" : VEER_DEC_DECODE + "dec_i0_decode_d",
-            "dec_i1_decode_d" : VEER_DEC_DECODE + "dec_i1_decode_d",
-            "freeze"          : VEER_DEC_DECODE + "freeze",
-            "flush_final_e3"  : VEER_DEC_DECODE + "flush_final_e3",
-            "flush_lower_wb"  : VEER_DEC_DECODE + "flush_lower_wb",
-            "nonblock_load_wen" : VEER_DEC_DECODE + "dec_nonblock_load_wen",
-            "i0_rs1_bypass_en"  : VEER_DEC_DECODE + "dec_i0_rs1_bypass_en_d",
-            "i0_rs2_bypass_en"  : VEER_DEC_DECODE + "dec_i0_rs2_bypass_en_d",
-            "i1_rs1_bypass_en"  : VEER_DEC_DECODE + "dec_i1_rs1_bypass_en_d",
-            "i1_rs2_bypass_en"  : VEER_DEC_DECODE + "dec_i1_rs2_bypass_en_d",
-            "i0_dp.imm20"       : VEER_DEC_DECODE + "i0_dp.imm20",
-            "i0_dp.imm12"       : VEER_DEC_DECODE + "i0_dp.imm12",
-            "i1_dp.imm20"       : VEER_DEC_DECODE + "i1_dp.imm20",
-            "i1_dp.imm12"       : VEER_DEC_DECODE + "i1_dp.imm12",
-            "i0_select_pc_d" : VEER_DEC_DECODE + "dec_i0_select_pc_d",
-            "i1_select_pc_d" : VEER_DEC_DECODE + "dec_i1_select_pc_d",
-            "i0_alu_decode_d" : VEER_DEC_DECODE + "dec_i0_alu_decode_d",
-            "i1_alu_decode_d" : VEER_DEC_DECODE + "dec_i1_alu_decode_d",
-            "i0_mul_d"    : VEER_DEC_DECODE + "dec_i0_mul_d",
-            "i1_mul_d"    : VEER_DEC_DECODE + "dec_i1_mul_d",
-            "i0_lsu_d"    : VEER_DEC_DECODE + "dec_i0_mul_d",
-            "i1_lsu_d"    : VEER_DEC_DECODE + "dec_i1_mul_d",
-            "i0_div_d"    : VEER_DEC_DECODE + "dec_i0_div_d",
-            "i1_div_d"    : VEER_DEC_DECODE + "dec_i1_div_d",
-            "load_mul_rs1_bypass_e1" : VEER_DEC_DECODE + "load_mul_rs1_bypass_e1",
-            "load_mul_rs2_bypass_e1" : VEER_DEC_DECODE + "load_mul_rs2_bypass_e1",
-            "i0_wen_wb" : VEER_DEC_DECODE + "i0_wen_wb",
-            "i1_wen_wb" : VEER_DEC_DECODE + "i1_wen_wb",
-
-            "e2d.i0rs1bype2" : VEER_DEC_DECODE + "e2d.i0rs1bype2[1:0]", 
-            "e2d.i0rs2bype2" : VEER_DEC_DECODE + "e2d.i0rs2bype2[1:0]", 
-            "e2d.i1rs1bype2" : VEER_DEC_DECODE + "e2d.i1rs1bype2[1:0]", 
-            "e2d.i1rs2bype2" : VEER_DEC_DECODE + "e2d.i1rs2bype2[1:0]", 
-            
-            "e3d.i0rs1bype3" : VEER_DEC_DECODE + "e3d.i0rs1bype3[3:0]", 
-            "e3d.i0rs2bype3" : VEER_DEC_DECODE + "e3d.i0rs2bype3[3:0]", 
-            "e3d.i1rs1bype3" : VEER_DEC_DECODE + "e3d.i1rs1bype3[6:0]", 
-            "e3d.i1rs2bype3" : VEER_DEC_DECODE + "e3d.i1rs2bype3[6:0]", 
-
-            "i0_inst_e1" : VEER_DEC_DECODE + "i0_inst_e1[31:0]",
-            "i0_inst_e2" : VEER_DEC_DECODE + "i0_inst_e2[31:0]",
-            "i0_inst_e3" : VEER_DEC_DECODE + "i0_inst_e3[31:0]",
-            "i0_inst_e4" : VEER_DEC_DECODE + "i0_inst_e4[31:0]",
-            "i0_inst_e5" : VEER_DEC_DECODE + "i0_inst_wb[31:0]",
-            "i0_inst_wb1" : VEER_DEC_DECODE + "i0_inst_wb1[31:0]",
-            
-            "i1_inst_e1" : VEER_DEC_DECODE + "i1_inst_e1[31:0]",
-            "i1_inst_e2" : VEER_DEC_DECODE + "i1_inst_e2[31:0]",
-            "i1_inst_e3" : VEER_DEC_DECODE + "i1_inst_e3[31:0]",
-            "i1_inst_e4" : VEER_DEC_DECODE + "i1_inst_e4[31:0]",
-            "i1_inst_e5" : VEER_DEC_DECODE + "i1_inst_wb[31:0]",
-            "i1_inst_wb1" : VEER_DEC_DECODE + "i1_inst_wb1[31:0]",
-            
-            "i0_pc_e1" : VEER_DEC_DECODE + "i0_pc_e1[31:1]",
-            "i0_pc_e2" : VEER_DEC_DECODE + "i0_pc_e2[31:1]",
-            "i0_pc_e3" : VEER_DEC_DECODE + "i0_pc_e3[31:1]",
-            "i0_pc_e4" : VEER_DEC_DECODE + "i0_pc_e4[31:1]",
-            "i0_pc_e5" : VEER_DEC_DECODE + "i0_pc_wb[31:1]",
-
-            "i1_pc_e1" : VEER_DEC_DECODE + "i1_pc_e1[31:1]",
-            "i1_pc_e2" : VEER_DEC_DECODE + "i1_pc_e2[31:1]",
-            "i1_pc_e3" : VEER_DEC_DECODE + "i1_pc_e3[31:1]",
-            "i1_pc_e4" : VEER_DEC_DECODE + "i1_pc_e4[31:1]",
-            "i1_pc_e5" : VEER_DEC_DECODE + "i1_pc_wb[31:1]",
-
-            "i0_e1_copy" : VEER_DEC_DECODE + "i0_e1_copy",
-            "i0_e2_copy" : VEER_DEC_DECODE + "i0_e2_copy",
-            "i0_e3_copy" : VEER_DEC_DECODE + "i0_e3_copy",
-            "i0_e4_copy" : VEER_DEC_DECODE + "i0_e4_copy",
-            "i0_e5_copy" : VEER_DEC_DECODE + "i0_wb_copy",
-            
-            "i1_e1_copy" : VEER_DEC_DECODE + "i1_e1_copy",
-            "i1_e2_copy" : VEER_DEC_DECODE + "i1_e2_copy",
-            "i1_e3_copy" : VEER_DEC_DECODE + "i1_e3_copy",
-            "i1_e4_copy" : VEER_DEC_DECODE + "i1_e4_copy",
-            "i1_e5_copy" : VEER_DEC_DECODE + "i1_wb_copy",
-
-            "i0_dc.alu" : VEER_DEC_DECODE + "i0_dc.alu",
-            "i0_dc.load" : VEER_DEC_DECODE + "i0_dc.load",
-            "i0_dc.mul" : VEER_DEC_DECODE + "i0_dc.mul",
-            "i0_dc.sec" : VEER_DEC_DECODE + "i0_dc.sec",
-
-            "i0_e1c.alu" : VEER_DEC_DECODE + "i0_e1c.alu",
-            "i0_e1c.load" : VEER_DEC_DECODE + "i0_e1c.load",
-            "i0_e1c.mul" : VEER_DEC_DECODE + "i0_e1c.mul",
-            "i0_e1c.sec" : VEER_DEC_DECODE + "i0_e1c.sec",
-            
-            "i0_e2c.alu" : VEER_DEC_DECODE + "i0_e2c.alu",
-            "i0_e2c.load" : VEER_DEC_DECODE + "i0_e2c.load",
-            "i0_e2c.mul" : VEER_DEC_DECODE + "i0_e2c.mul",
-            "i0_e2c.sec" : VEER_DEC_DECODE + "i0_e2c.sec",
-            
-            "i0_e3c.alu" : VEER_DEC_DECODE + "i0_e3c.alu",
-            "i0_e3c.load" : VEER_DEC_DECODE + "i0_e3c.load",
-            "i0_e3c.mul" : VEER_DEC_DECODE + "i0_e3c.mul",
-            "i0_e3c.sec" : VEER_DEC_DECODE + "i0_e3c.sec",
-            
-            "i0_e4c.alu" : VEER_DEC_DECODE + "i0_e4c.alu",
-            "i0_e4c.load" : VEER_DEC_DECODE + "i0_e4c.load",
-            "i0_e4c.mul" : VEER_DEC_DECODE + "i0_e4c.mul",
-            "i0_e4c.sec" : VEER_DEC_DECODE + "i0_e4c.sec",
-            
-            "i0_e5c.alu" : VEER_DEC_DECODE + "i0_wbc.alu",
-            "i0_e5c.load" : VEER_DEC_DECODE + "i0_wbc.load",
-            "i0_e5c.mul" : VEER_DEC_DECODE + "i0_wbc.mul",
-            "i0_e5c.sec" : VEER_DEC_DECODE + "i0_wbc.sec",
-
-            "i1_dc.alu" : VEER_DEC_DECODE + "i1_dc.alu",
-            "i1_dc.load" : VEER_DEC_DECODE + "i1_dc.load",
-            "i1_dc.mul" : VEER_DEC_DECODE + "i1_dc.mul",
-            "i1_dc.sec" : VEER_DEC_DECODE + "i1_dc.sec",
-
-            "i1_e1c.alu" : VEER_DEC_DECODE + "i1_e1c.alu",
-            "i1_e1c.load" : VEER_DEC_DECODE + "i1_e1c.load",
-            "i1_e1c.mul" : VEER_DEC_DECODE + "i1_e1c.mul",
-            "i1_e1c.sec" : VEER_DEC_DECODE + "i1_e1c.sec",
-            
-            "i1_e2c.alu" : VEER_DEC_DECODE + "i1_e2c.alu",
-            "i1_e2c.load" : VEER_DEC_DECODE + "i1_e2c.load",
-            "i1_e2c.mul" : VEER_DEC_DECODE + "i1_e2c.mul",
-            "i1_e2c.sec" : VEER_DEC_DECODE + "i1_e2c.sec",
-            
-            "i1_e3c.alu" : VEER_DEC_DECODE + "i1_e3c.alu",
-            "i1_e3c.load" : VEER_DEC_DECODE + "i1_e3c.load",
-            "i1_e3c.mul" : VEER_DEC_DECODE + "i1_e3c.mul",
-            "i1_e3c.sec" : VEER_DEC_DECODE + "i1_e3c.sec",
-            
-            "i1_e4c.alu" : VEER_DEC_DECODE + "i1_e4c.alu",
-            "i1_e4c.load" : VEER_DEC_DECODE + "i1_e4c.load",
-            "i1_e4c.mul" : VEER_DEC_DECODE + "i1_e4c.mul",
-            "i1_e4c.sec" : VEER_DEC_DECODE + "i1_e4c.sec",
-            
-            "i1_e5c.alu" : VEER_DEC_DECODE + "i1_wbc.alu",
-            "i1_e5c.load" : VEER_DEC_DECODE + "i1_wbc.load",
-            "i1_e5c.mul" : VEER_DEC_DECODE + "i1_wbc.mul",
-            "i1_e5c.sec" : VEER_DEC_DECODE + "i1_wbc.sec",
-
-            "e1d.i0valid" : VEER_DEC_DECODE + "e1d.i0valid",
-            "e2d.i0valid" : VEER_DEC_DECODE + "e2d.i0valid",
-            "e3d.i0valid" : VEER_DEC_DECODE + "e3d.i0valid",
-            "e4d.i0valid" : VEER_DEC_DECODE + "e4d.i0valid",
-            "e5d.i0valid" : VEER_DEC_DECODE + "wbd.i0valid",
-            
-            "e1d.i1valid" : VEER_DEC_DECODE + "e1d.i1valid",
-            "e2d.i1valid" : VEER_DEC_DECODE + "e2d.i1valid",
-            "e3d.i1valid" : VEER_DEC_DECODE + "e3d.i1valid",
-            "e4d.i1valid" : VEER_DEC_DECODE + "e4d.i1valid",
-            "e5d.i1valid" : VEER_DEC_DECODE + "wbd.i1valid",
-
-            "i0_rs1bypass" : VEER_DEC_DECODE + "i0_rs1bypass[9:0]",
-            "i0_rs2bypass" : VEER_DEC_DECODE + "i0_rs2bypass[9:0]",
-            "i1_rs1bypass" : VEER_DEC_DECODE + "i1_rs1bypass[9:0]",
-            "i1_rs2bypass" : VEER_DEC_DECODE + "i1_rs2bypass[9:0]",
-
-            "e1_i0_rd"     : VEER_DEC_DECODE + "e1d.i0rd[4:0]",
-            "e2_i0_rd"     : VEER_DEC_DECODE + "e2d.i0rd[4:0]",
-            "e3_i0_rd"     : VEER_DEC_DECODE + "e3d.i0rd[4:0]",
-            "e4_i0_rd"     : VEER_DEC_DECODE + "e4d.i0rd[4:0]",
-            "e5_i0_rd"     : VEER_DEC_DECODE + "wbd.i0rd[4:0]",
-        
-            "e1_i1_rd"     : VEER_DEC_DECODE + "e1d.i1rd[4:0]",
-            "e2_i1_rd"     : VEER_DEC_DECODE + "e2d.i1rd[4:0]",
-            "e3_i1_rd"     : VEER_DEC_DECODE + "e3d.i1rd[4:0]",
-            "e4_i1_rd"     : VEER_DEC_DECODE + "e4d.i1rd[4:0]",
-            "e5_i1_rd"     : VEER_DEC_DECODE + "wbd.i1rd[4:0]",
-
-            "i0_wb_buffer_val_q"   : VEER_DEC_DECODE + "i0_wb_buffer_val_q",
-            "i1_wb_buffer_val_q"   : VEER_DEC_DECODE + "i1_wb_buffer_val_q",
-
-            "i0_rs1_depend_i0_buf" : VEER_DEC_DECODE + "i0_rs1_depend_i0_buf",
-            "i0_rs1_depend_i1_buf" : VEER_DEC_DECODE + "i0_rs1_depend_i1_buf",
-            "i0_rs2_depend_i0_buf" : VEER_DEC_DECODE + "i0_rs2_depend_i0_buf",
-            "i0_rs2_depend_i1_buf" : VEER_DEC_DECODE + "i0_rs2_depend_i1_buf",
-            
-            "i1_rs1_depend_i0_buf" : VEER_DEC_DECODE + "i1_rs1_depend_i0_buf",
-            "i1_rs1_depend_i1_buf" : VEER_DEC_DECODE + "i1_rs1_depend_i1_buf",
-            "i1_rs2_depend_i0_buf" : VEER_DEC_DECODE + "i1_rs2_depend_i0_buf",
-            "i1_rs2_depend_i1_buf" : VEER_DEC_DECODE + "i1_rs2_depend_i1_buf",
-            
-            # EXU
-
-            # alu types
-            "i0_e1_beq"     : VEER_EXU + "i0_ap_e1.beq",
-            "i0_e1_bge"     : VEER_EXU + "i0_ap_e1.bge",
-            "i0_e1_blt"     : VEER_EXU + "i0_ap_e1.blt",
-            "i0_e1_bne"     : VEER_EXU + "i0_ap_e1.bne",
-            "i0_e1_jal"     : VEER_EXU + "i0_ap_e1.jal",
-
-            "i0_e2_beq"     : VEER_EXU + "i0_ap_e2.beq",
-            "i0_e2_bge"     : VEER_EXU + "i0_ap_e2.bge",
-            "i0_e2_blt"     : VEER_EXU + "i0_ap_e2.blt",
-            "i0_e2_bne"     : VEER_EXU + "i0_ap_e2.bne",
-            "i0_e2_jal"     : VEER_EXU + "i0_ap_e2.jal",
-
-            "i0_e3_beq"     : VEER_EXU + "i0_ap_e3.beq",
-            "i0_e3_bge"     : VEER_EXU + "i0_ap_e3.bge",
-            "i0_e3_blt"     : VEER_EXU + "i0_ap_e3.blt",
-            "i0_e3_bne"     : VEER_EXU + "i0_ap_e3.bne",
-            "i0_e3_jal"     : VEER_EXU + "i0_ap_e3.jal",
-
-            "i0_e4_beq"     : VEER_EXU + "i0_ap_e4.beq",
-            "i0_e4_bge"     : VEER_EXU + "i0_ap_e4.bge",
-            "i0_e4_blt"     : VEER_EXU + "i0_ap_e4.blt",
-            "i0_e4_bne"     : VEER_EXU + "i0_ap_e4.bne",
-            "i0_e4_jal"     : VEER_EXU + "i0_ap_e4.jal",
-
-            "i1_e1_beq"     : VEER_EXU + "i1_ap_e1.beq",
-            "i1_e1_bge"     : VEER_EXU + "i1_ap_e1.bge",
-            "i1_e1_blt"     : VEER_EXU + "i1_ap_e1.blt",
-            "i1_e1_bne"     : VEER_EXU + "i1_ap_e1.bne",
-            "i1_e1_jal"     : VEER_EXU + "i1_ap_e1.jal",
-
-            "i1_e2_beq"     : VEER_EXU + "i1_ap_e2.beq",
-            "i1_e2_bge"     : VEER_EXU + "i1_ap_e2.bge",
-            "i1_e2_blt"     : VEER_EXU + "i1_ap_e2.blt",
-            "i1_e2_bne"     : VEER_EXU + "i1_ap_e2.bne",
-            "i1_e2_jal"     : VEER_EXU + "i1_ap_e2.jal",
-
-            "i1_e3_beq"     : VEER_EXU + "i1_ap_e3.beq",
-            "i1_e3_bge"     : VEER_EXU + "i1_ap_e3.bge",
-            "i1_e3_blt"     : VEER_EXU + "i1_ap_e3.blt",
-            "i1_e3_bne"     : VEER_EXU + "i1_ap_e3.bne",
-            "i1_e3_jal"     : VEER_EXU + "i1_ap_e3.jal",
-
-            "i1_e4_beq"     : VEER_EXU + "i1_ap_e4.beq",
-            "i1_e4_bge"     : VEER_EXU + "i1_ap_e4.bge",
-            "i1_e4_blt"     : VEER_EXU + "i1_ap_e4.blt",
-            "i1_e4_bne"     : VEER_EXU + "i1_ap_e4.bne",
-            "i1_e4_jal"     : VEER_EXU + "i1_ap_e4.jal",
-
-            # LSU
-            "dc1_valid"     : VEER_LSU_CTL + "lsu_pkt_dc1.valid",
-            "dc2_valid"     : VEER_LSU_CTL + "lsu_pkt_dc2.valid",
-            "dc3_valid"     : VEER_LSU_CTL + "lsu_pkt_dc3.valid",
-            "dc4_valid"     : VEER_LSU_CTL + "lsu_pkt_dc4.valid",
-            "dc5_valid"     : VEER_LSU_CTL + "lsu_pkt_dc5.valid",
-
-            "dc1_ldst_bypass"                 : VEER_LSU_CTL + "lsu_pkt_dc1.load_ldst_bypass_c1",
-            "dc1_store_data_bypass_c1"        : VEER_LSU_CTL + "lsu_pkt_dc1.store_data_bypass_c1",
-            "dc2_store_data_bypass_c2"        : VEER_LSU_CTL + "lsu_pkt_dc2.store_data_bypass_c2",
-            "dc2_store_data_bypass_i0_e2_c2"  : VEER_LSU_CTL + "lsu_pkt_dc2.store_data_bypass_i0_e2_c2",
-            "dc1_store_data_bypass_e4_c1"     : VEER_LSU_CTL + "lsu_pkt_dc1.store_data_bypass_e4_c1[1:0]",
-            "dc2_store_data_bypass_e4_c2"     : VEER_LSU_CTL + "lsu_pkt_dc2.store_data_bypass_e4_c2[1:0]",
-            "dc3_store_data_bypass_e4_c3"     : VEER_LSU_CTL + "lsu_pkt_dc3.store_data_bypass_e4_c3[1:0]",
-
-            # MUL
-            "valid_e1"               : VEER_EXU + "mul_e1.valid_e1",
-            "valid_e2"               : VEER_EXU + "mul_e1.valid_e2",
-            "valid_e3"               : VEER_EXU + "mul_e1.valid_e3",
-
-            # TLU
-            "faultless"     : VEER_TLU + "faultless[1:0]",
-        }
-        self.vcd_file = VCDVCD(file, signals=list(self.signals.values()))
-        self.clk_signal = self.vcd_file[VEER_TOP + "clk"]
-        self.final_time = self.clk_signal.tv[-1][0]
-
-    def getSignalValue(self, signal_name, time):
-        return self.vcd_file[signal_name][time]
-
-    def getSignals(self):
-        return self.signals
-
-    def getValueDict(self):
-        values = {}
-        for key in self.signals:
-            values[key] = self.getSignalValue(self.signals[key], self.cycle)
-        return values
-
-# ===[ Disassembly parser ]================================
-class DisassemblyHandler():
-    def __init__(self, file):
-        self.instructions = self._parseFile(file)
-
-    def _parseFile(self, file):
-        fd = open(file, "r")
-        instructions = {}
-        for line in fd:
-            if re.match("\s*[0-9a-fA-F]+:\s+[0-9a-fA-f]+\s+\w+", line):
-                pc = re.sub("\s|:", "", re.match("\s*[0-9a-fA-F]+:", line).group())
-                pc = (8-len(pc))*'0' + pc #padding
-                #insn = re.sub("\s", "", re.search("\s*[0-9a-fA-F]{8}\s+", line).group())
-                #print(line)
-                text = re.sub("\s+", " ", re.sub("^\s+", "", re.search("\s+[a-zA-Z.]+\s+.*", line).group()))
-                instructions[pc] = text
-        fd.close()
-        return instructions
-        
-    def _getInstruction(self, pc):
-        if pc in self.instructions:
-            return self.instructions[pc]
+        cycle = self._vcdhandler.cycle
+        direction = -1 if (self._shown_cycle is not None and cycle < self._shown_cycle) else 1
+        self._view._updateView(self._frames.getFrame(cycle, direction), self._disas_handler)
+        # keeps a clicked row among several retiring in the cycle
+        if (self._retire_model is not None and self._retire_model.retired.nth(self._view.retirelist.currentIndex().row()) != cycle):
+            self._view.showRetired(self._retire_model.retired.position(cycle))
+        self._shown_cycle = cycle
+
+# ===[ Diff Controller ]===================================
+# Steps through the first run like VeeRisualCtrl and shows the second run next to
+# it, at the cycle TraceDiff aligns to the current one, with the parts the runs
+# differ in outlined on both
+class VeeRisualDiffCtrl(VeeRisualCtrl):
+    def __init__(self, view, vcdhandler, disas_handler, other_view, other_handler, align="cycle", cache_size=VEERISUAL_FRAME_CACHE_SIZE, prefetch_depth=VEERISUAL_PREFETCH_DEPTH):
+        self._other_view = other_view
+        self._other_handler = other_handler
+        self._other_frames = FramePrefetcher(other_handler, cache_size, prefetch_depth)
+        self._diff = TraceDiff(vcdhandler, other_handler, align)
+        view.addSideView(other_view)
+        super().__init__(view, vcdhandler, disas_handler, cache_size, prefetch_depth)
+
+        divergence = self._diff.nextDivergence()
+        if (divergence is None):
+            self._view.statusBar().showMessage("The runs do not differ ({} alignment)".format(align))
         else:
-            return "invalid"
+            self._view.statusBar().showMessage("The runs first differ at cycle {} ({} alignment)".format(divergence, align))
+
+    def connectSignals(self):
+        super().connectSignals()
+        self._view.prevdiffbtn.clicked.connect(self.prevdiffbtn_click)
+        self._view.nextdiffbtn.clicked.connect(self.nextdiffbtn_click)
+
+    def prevdiffbtn_click(self):
+        self._jumpTo(self._diff.previousDivergence(self._vcdhandler.cycle), "No earlier difference")
+
+    def nextdiffbtn_click(self):
+        self._jumpTo(self._diff.nextDivergence(self._vcdhandler.cycle), "No later difference")
+
+    def updateView(self):
+        super().updateView()
+        cycle = self._vcdhandler.cycle
+        other_cycle = self._diff.alignedCycle(cycle)
+        direction = -1 if (other_cycle < self._other_handler.cycle) else 1
+        self._other_handler.cycle = other_cycle
+        self._other_view._updateView(self._other_frames.getFrame(other_cycle, direction), self._disas_handler)
+        fields = self._diff.fieldsAt(cycle)
+        self._view.setDifferences(fields)
+        self._other_view.setDifferences(fields)
+        self._view.setDiffLabel(other_cycle, fields)
+
+# ===[ Retire List Model ]=================================
+# Rows of the retired instruction list, formatted from the RetireIndex only when
+# the list view asks for a visible row, so millions of them cost no widgets
+class RetireListModel(QAbstractListModel):
+    def __init__(self, retired, disassembly):
+        super().__init__()
+        self.retired = retired
+        self._disassembly = disassembly
+
+    def rowCount(self, parent=None):
+        return len(self.retired)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if (role != Qt.DisplayRole or not index.isValid()):
+            return None
+        cycle, pc, rd = self.retired.entry(index.row())
+        text = "#{} @{}  {:08X}  {}".format(index.row(), cycle, pc, self._disassembly.getMnemonic(pc))
+        return text + " -> x{}".format(rd) if rd else text
+
+    # rows show "loading…" until the disassembly is in
+    def refresh(self):
+        if (self.rowCount()):
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1))
+
+# ===[ Frame Prefetcher ]==================================
+# Decoded frames in an LRU cache, filled by a worker thread with the cycles
+# following (and a few preceding) the last requested one in stepping direction
+class FramePrefetcher():
+    def __init__(self, source, size=VEERISUAL_FRAME_CACHE_SIZE, depth=VEERISUAL_PREFETCH_DEPTH):
+        self.source = source
+        self.size = size
+        self.depth = depth
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._request = None
+        self._thread = threading.Thread(target=self._prefetch, daemon=True)
+        self._thread.start()
+
+    # frame of cycle, direction (+1/-1) being where the next requests are expected
+    def getFrame(self, cycle, direction=1):
+        key = (cycle, self.source.generation)
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is not None:
+                self._frames.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if frame is None:
+            frame = self.source.getFrame(cycle)
+            self._store(key, frame)
+        with self._wakeup:
+            self._request = (cycle, direction)
+            self._wakeup.notify()
+        return frame
+
+    # share of the frames asked for that were cached, None before the first
+    def hitRate(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return self.hits / requests if requests else None
+
+    def _store(self, key, frame):
+        with self._lock:
+            self._frames[key] = frame
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.size:
+                self._frames.popitem(last=False)
+
+    def _prefetch(self):
+        while True:
+            with self._wakeup:
+                while self._request is None:
+                    self._wakeup.wait()
+                cycle, direction = self._request
+                self._request = None
+            ahead = [cycle + i * direction for i in range(1, self.depth + 1)]
+            behind = [cycle - i * direction for i in range(1, self.depth // 4 + 1)]
+            if self.source.index is not None:
+                # the checkpoint index has a single replay cursor, used under the
+                # source lock the window waits on: a frame behind it rewinds to a
+                # checkpoint, so only frames later than the cursor are prefetched
+                ahead, behind = [cycle + i for i in range(1, self.depth + 1)], []
+            for c in ahead + behind:
+                # a newer request restarts from its cycle
+                if self._request is not None:
+                    break
+                if c < 0 or c > self.source.final_cycle:
+                    continue
+                key = (c, self.source.generation)
+                with self._lock:
+                    cached = key in self._frames
+                if not cached:
+                    self._store(key, self.source.getFrame(c))
 
 # ===[ Main Function ]=====================================
 if __name__ == '__main__':
-    if (len(sys.argv) <= 2 or os.path.exists(sys.argv[1]) != True or os.path.exists(sys.argv[2]) != True):
-        print("Usage: VEERisual.py <vcd file path> <disassembly file path>")
-        exit(-1)
-   
-    vcdhandler = VCDHandler(sys.argv[1])
-    assembly = DisassemblyHandler(sys.argv[2])
-    VeeRisual = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Pipeline view of VeeR waveform dumps")
+    parser.add_argument("dump", help="vcd/fst file path")
+    parser.add_argument("disassembly", help="disassembly file path")
+    parser.add_argument("second", nargs="?", help="vcd/fst file path of a second run, compared with the first")
+    parser.add_argument("align", nargs="?", choices=DIFF_ALIGNMENTS, default="cycle", help="how the runs are compared, cycle by default")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="processes parsing a VCD in parallel, 1 by default")
+    args = parser.parse_args()
+    for path in (args.dump, args.disassembly, args.second):
+        if path is not None and not os.path.exists(path):
+            parser.error("no such file: " + path)
+
+    assembly = DisassemblyHandler(args.disassembly, background=True)
+    app = QApplication(sys.argv[:1])
     view = VeeRisual()
-    view.show()
-    ctrl = VeeRisualCtrl(view=view, vcdhandler=vcdhandler, disas_handler=assembly)
-    sys.exit(VeeRisual.exec_())
+    if args.second:
+        # the diff needs every signal of both runs up front
+        vcdhandler = openWaveform(args.dump, workers=args.workers)
+        other_handler = openWaveform(args.second, workers=args.workers)
+        other_view = VeeRisual()
+        view.show()
+        ctrl = VeeRisualDiffCtrl(view=view, vcdhandler=vcdhandler, disas_handler=assembly, other_view=other_view,
+                                 other_handler=other_handler, align=args.align)
+    else:
+        vcdhandler = openWaveform(args.dump, workers=args.workers, groups=VEERISUAL_FIRST_GROUPS)
+        view.show()
+        ctrl = VeeRisualCtrl(view=view, vcdhandler=vcdhandler, disas_handler=assembly)
+    code = app.exec_()
+    vcdhandler.close()
+    if args.second:
+        other_handler.close()
+    sys.exit(code)
@@ -0,0 +1,27 @@
+#!/bin/python3
+
+# Exports the lifetime of every instruction of a VeeR dump as a Kanata log,
+# to be browsed in pipeline viewers such as Konata. The dump is streamed in one
+# pass, so memory does not grow with the length of the run
+import argparse
+import sys
+from veertrace import openWaveform, DisassemblyHandler, KanataExporter
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Kanata pipeline log of a VeeR waveform dump")
+    parser.add_argument("dump", help="vcd/fst file path")
+    parser.add_argument("-d", "--disassembly", help="disassembly file path, labels instructions with their text")
+    parser.add_argument("-o", "--output", help="output log file, stdout by default")
+    parser.add_argument("--first", type=int, help="first cycle exported, the start of the trace by default")
+    parser.add_argument("--last", type=int, help="last cycle exported, the end of the trace by default")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="processes parsing a VCD in parallel, 1 by default")
+    args = parser.parse_args()
+
+    assembly = DisassemblyHandler(args.disassembly) if args.disassembly else None
+    with openWaveform(args.dump, workers=args.workers) as source:
+        exporter = KanataExporter(source, assembly)
+        if args.output:
+            with open(args.output, "w") as fd:
+                exporter.export(fd, args.first, args.last)
+        else:
+            exporter.export(sys.stdout, args.first, args.last)
@@ -0,0 +1,57 @@
+#!/bin/python3
+
+# Pipeline and bypass path statistics of VeeR dumps without a display, one
+# row per dump, written as JSON or CSV (picked by the output file extension,
+# JSON on stdout by default). Only imports the Qt-free veertrace module
+import argparse
+import csv
+import json
+import sys
+from veertrace import openWaveform, DisassemblyHandler, pipelineStatistics
+
+# nested statistics as one flat dict, keys joined with "."
+def _flatten(stats, prefix=""):
+    flat = {}
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, prefix + key + "."))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+def writeStatistics(runs, fd, csv_format=False):
+    if not csv_format:
+        json.dump(runs, fd, indent=2)
+        fd.write("\n")
+        return
+    rows = [_flatten(run) for run in runs]
+    columns = []
+    for row in rows:
+        columns += [column for column in row if column not in columns]
+    writer = csv.DictWriter(fd, fieldnames=columns, restval=0)
+    writer.writeheader()
+    writer.writerows(rows)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pipeline statistics of VeeR waveform dumps")
+    parser.add_argument("dumps", nargs="+", help="vcd/fst file paths")
+    parser.add_argument("-d", "--disassembly", help="disassembly file path, adds retired instructions by mnemonic")
+    parser.add_argument("-o", "--output", help="output .json or .csv file, JSON on stdout by default")
+    parser.add_argument("--first", type=int, help="first cycle of the window counted, the start of the trace by default")
+    parser.add_argument("--last", type=int, help="last cycle of the window counted, the end of the trace by default")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="processes parsing a VCD in parallel, 1 by default")
+    args = parser.parse_args()
+
+    assembly = DisassemblyHandler(args.disassembly) if args.disassembly else None
+    runs = []
+    for dump in args.dumps:
+        run = {"dump": dump}
+        with openWaveform(dump, workers=args.workers) as source:
+            run.update(pipelineStatistics(source, assembly, args.first, args.last))
+        runs.append(run)
+
+    if args.output:
+        with open(args.output, "w", newline="") as fd:
+            writeStatistics(runs, fd, args.output.lower().endswith(".csv"))
+    else:
+        writeStatistics(runs, sys.stdout)
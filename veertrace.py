@@ -0,0 +1,2773 @@
+#!/bin/python3
+
+# Waveform side of VEERisualize: the dump readers, the signal store, the decoded
+# cycle frames and the indexes over them. Nothing here imports Qt, so batch
+# tools can use it on machines without a display
+from functools import partial, reduce
+from array import array
+import numpy as np
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+import hashlib
+import json
+import ast
+import mmap
+import gzip
+import zlib
+import struct
+import lzma
+import bz2
+import queue
+import threading
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+import os
+import re
+import bisect
+
+# constants
+VEER_TOP        = "TOP.tb_top.rvtop.VeeR."
+VEER_DEC_DECODE = VEER_TOP + "dec.decode."
+VEER_DEC_IB     = VEER_TOP + "dec.instbuff."
+VEER_GPR        = VEER_TOP + "dec.arf.gpr_banks[0]."
+VEER_EXU        = VEER_TOP + "exu."
+VEER_TLU        = VEER_TOP + "dec.tlu."
+VEER_LSU_CTL    = VEER_TOP + "lsu.lsu_lsc_ctl."
+
+# bytes read from the dump per chunk while streaming value changes
+VCD_CHUNK_SIZE  = 4 * 1024 * 1024
+VCD_XZ_TO_ZERO  = bytes.maketrans(b"xXzZ", b"0000")
+# dumps larger than this are served from a checkpoint index instead of being extracted
+VCD_INDEX_THRESHOLD = 4 * 1024 * 1024 * 1024
+VCD_INDEX_INTERVAL  = 2048
+# sampled cycles per block when the values of a whole run are streamed
+VCD_COLUMN_CHUNK = 65536
+
+# ===[ Compressed Dumps ]==================================
+# Compressed dumps are decompressed by a thread (or the zstd tool) a few chunks
+# ahead of the parser, so reading takes about as long as the slower of the two
+def _zstdOpen(file):
+    if zstandard is not None:
+        return zstandard.ZstdDecompressor().stream_reader(open(file, "rb"), closefd=True)
+    if shutil.which("zstd") is None:
+        raise ValueError("{}: zstd dumps need the zstandard module or the zstd tool".format(file))
+    return ZstdProcess(file)
+
+# output of the zstd tool, the process is reaped on close
+class ZstdProcess():
+    def __init__(self, file):
+        self.file = file
+        self._process = subprocess.Popen(["zstd", "-dcq", file], stdout=subprocess.PIPE)
+
+    def read(self, size=-1):
+        data = self._process.stdout.read(size)
+        if not data and self._process.wait():
+            raise ValueError("{}: zstd exited with {}".format(self.file, self._process.returncode))
+        return data
+
+    # a tool still writing exits on the closed pipe
+    def close(self):
+        self._process.stdout.close()
+        self._process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+VCD_DECOMPRESSORS = {
+    ".gz"  : gzip.open,
+    ".xz"  : lzma.open,
+    ".bz2" : bz2.open,
+    ".zst" : _zstdOpen,
+}
+VCD_DECOMPRESS_DEPTH = 4
+
+def isCompressed(file):
+    return os.path.splitext(file)[1].lower() in VCD_DECOMPRESSORS
+
+# binary file for reading the dump, decompressing it in the background if needed
+def openDump(file, chunk_size=VCD_CHUNK_SIZE):
+    decompress = VCD_DECOMPRESSORS.get(os.path.splitext(file)[1].lower())
+    if decompress is None:
+        return open(file, "rb")
+    return DecompressingReader(file, decompress, chunk_size)
+
+class DecompressingReader():
+    def __init__(self, file, decompress, chunk_size=VCD_CHUNK_SIZE, depth=VCD_DECOMPRESS_DEPTH):
+        self.file = file
+        self._chunks = queue.Queue(depth)
+        self._error = None
+        self._closed = False
+        self._eof = False
+        # decompressed bytes past the last read
+        self._rest = b""
+        self._thread = threading.Thread(target=self._decompress, args=(decompress, chunk_size), daemon=True)
+        self._thread.start()
+
+    def _decompress(self, decompress, chunk_size):
+        try:
+            with decompress(self.file) as stream:
+                while not self._closed:
+                    chunk = stream.read(chunk_size)
+                    self._chunks.put(chunk)
+                    if not chunk:
+                        return
+        except Exception as error:
+            self._error = error
+            self._chunks.put(b"")
+
+    # chunks usually come in the size they are read in and are passed on as they are
+    def read(self, size=-1):
+        data = self._rest
+        while (size < 0 or len(data) < size) and not self._eof:
+            chunk = self._chunks.get()
+            if self._error:
+                raise self._error
+            self._eof = not chunk
+            data += chunk
+        if size < 0 or len(data) <= size:
+            self._rest = b""
+            return data
+        self._rest = data[size:]
+        return data[:size]
+
+    def close(self):
+        self._closed = True
+        while self._thread.is_alive():
+            try:
+                self._chunks.get_nowait()
+            except queue.Empty:
+                self._thread.join(0.01)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ===[ VCD Stream Reader ]=================================
+# value history of a single signal, one entry per value change. Values are
+# integers (x/z read as 0), buses wider than 64 bit are packed into uint64 words
+class SignalTrack():
+    def __init__(self, size):
+        self.size   = size
+        self.words  = (size + 63) // 64
+        self.times  = array('q')
+        self.values = array('Q') if self.words == 1 else []
+        self.packed = None
+
+    def __len__(self):
+        return len(self.times)
+
+    # replace the append buffers by (views into) compact numpy arrays
+    def freeze(self, times, values, packed=None):
+        if self.words > 1 and packed is None:
+            packed = np.zeros((len(self.values), self.words), dtype=np.uint64)
+            for i, value in enumerate(self.values):
+                for w in range(self.words):
+                    packed[i, w] = (value >> (64*w)) & 0xFFFFFFFFFFFFFFFF
+        self.packed = packed
+        self.times  = times
+        self.values = values
+
+    def valueAtIndex(self, i):
+        if (i < 0):
+            return 0
+        if self.words > 1:
+            return sum(int(word) << (64*w) for w, word in enumerate(self.packed[i]))
+        return int(self.values[i])
+
+    def __getitem__(self, time):
+        return self.valueAtIndex(int(np.searchsorted(self.times, time, side="right")) - 1)
+
+# freezes freshly parsed tracks into numpy arrays of their own, for tracks kept
+# outside a SignalStore. Aliased references share a track, frozen once
+def _freezeTracks(tracks):
+    for track in {id(track): track for track in tracks}.values():
+        values = track.values if track.words == 1 else [value & 0xFFFFFFFFFFFFFFFF for value in track.values]
+        track.freeze(np.asarray(track.times, dtype=np.int64), np.asarray(values, dtype=np.uint64))
+
+# all tracks in one time and one value column (low 64 bit of each value), every
+# track being a slice of them. Keys combine track index and time so that one
+# searchsorted over the key column looks up all signals at once
+class SignalStore():
+    def __init__(self, tracks, offsets, times, values, keys=None, span=None):
+        self.tracks  = tracks
+        self.offsets = offsets
+        self.times   = times
+        self.values  = values
+        self.span    = span if span is not None else (int(times.max()) + 1 if len(times) else 1)
+        self.bases   = np.arange(len(tracks), dtype=np.int64) * self.span
+        self.keys    = keys if keys is not None else times + np.repeat(self.bases, np.diff(offsets))
+        self.index   = {id(track): i for i, track in enumerate(tracks)}
+
+    # concatenate the append buffers of freshly parsed tracks, or the columns of
+    # already frozen ones
+    @classmethod
+    def fromTracks(cls, tracks):
+        tracks = list({id(track): track for track in tracks}.values())
+        offsets = np.zeros(len(tracks) + 1, dtype=np.int64)
+        np.cumsum([len(track) for track in tracks], out=offsets[1:])
+        times  = np.empty(offsets[-1], dtype=np.int64)
+        values = np.empty(offsets[-1], dtype=np.uint64)
+        for i, track in enumerate(tracks):
+            lo, hi = offsets[i], offsets[i+1]
+            times[lo:hi] = np.asarray(track.times, dtype=np.int64)
+            if track.words == 1 or track.packed is not None:
+                values[lo:hi] = np.asarray(track.values, dtype=np.uint64)
+            else:
+                values[lo:hi] = [value & 0xFFFFFFFFFFFFFFFF for value in track.values]
+            track.freeze(times[lo:hi], values[lo:hi], track.packed)
+        return cls(tracks, offsets, times, values)
+
+    def trackIndex(self, track):
+        return self.index[id(track)]
+
+    # change index of every track at the given time, -1 before its first change
+    def indicesAt(self, time):
+        idx = np.searchsorted(self.keys, self.bases + time, side="right") - 1
+        return np.where(idx >= self.offsets[:-1], idx, -1)
+
+    # value of every track at the given time, 0 before its first change
+    def valuesAt(self, time):
+        idx = self.indicesAt(time)
+        return np.where(idx >= 0, self.values[idx], 0)
+
+# x/z bits read as 0, real values are truncated
+def _parseVectorValue(value):
+    try:
+        return int(value.translate(VCD_XZ_TO_ZERO), 2)
+    except ValueError:
+        try:
+            return int(float(value))
+        except ValueError:
+            return 0
+
+# reads a VCD in large chunks and only keeps changes of the requested signals
+class VCDStreamReader():
+    def __init__(self, file, references, chunk_size=VCD_CHUNK_SIZE):
+        self.file = file
+        self.references = set(references)
+        self.chunk_size = chunk_size
+        self.timescale = None
+        self.data_offset = 0
+        self.end_time = 0
+        self.tracks = {}
+        self._id_tracks = {}
+
+    # returns {reference: SignalTrack} for all requested signals found in the dump,
+    # with workers > 1 the value change section is parsed by a process pool
+    def read(self, workers=1):
+        with openDump(self.file, self.chunk_size) as fd:
+            rest = self._parseHeader(fd)
+            ranges = self._splitRanges(fd, workers) if workers > 1 and not isCompressed(self.file) else []
+            if len(ranges) > 1:
+                self._parseParallel(ranges, workers)
+            else:
+                self._parseChanges(fd, rest)
+        return self.tracks
+
+    # cuts the value change section into about `count` byte ranges, each one
+    # starting at a '#time' line outside of a $comment
+    def _splitRanges(self, fd, count):
+        size = os.fstat(fd.fileno()).st_size
+        if size <= self.data_offset:
+            return []
+        mm = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        bounds = [self.data_offset]
+        step = (size - self.data_offset) // count
+        for i in range(1, count):
+            pos = max(self.data_offset + i * step, bounds[-1])
+            while True:
+                pos = mm.find(b"\n#", pos)
+                if pos < 0:
+                    break
+                comment = mm.rfind(b"$comment", bounds[-1], pos)
+                end = mm.find(b"$end", comment, pos) if comment >= 0 else 0
+                if end >= 0:
+                    break
+                pos = mm.find(b"$end", pos)
+            if pos < 0:
+                break
+            if pos + 1 > bounds[-1]:
+                bounds.append(pos + 1)
+        mm.close()
+        bounds.append(size)
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    # the changes of each range are concatenated in file order, which gives the
+    # same tracks as the serial parse: a range starts at a timestamp and a track
+    # holds change events only, so nothing but the order has to carry over
+    def _parseParallel(self, ranges, workers):
+        sizes = {ident: track.size for ident, track in self._id_tracks.items()}
+        with ProcessPoolExecutor(workers) as pool:
+            jobs = [pool.submit(_parseRange, self.file, start, end, sizes, self.chunk_size) for start, end in ranges]
+            for job in jobs:
+                end_time, changes = job.result()
+                for ident, (times, values) in changes.items():
+                    track = self._id_tracks[ident]
+                    track.times.extend(times)
+                    track.values.extend(values)
+                self.end_time = end_time
+
+    def _untilEnd(self, tokens):
+        fields = []
+        for tok in tokens:
+            if tok == b"$end":
+                break
+            fields.append(tok)
+        return fields
+
+    # parse scopes and vars up to $enddefinitions, returns the bytes read past it
+    def _parseHeader(self, fd):
+        header = bytearray()
+        while True:
+            chunk = fd.read(self.chunk_size)
+            if not chunk:
+                raise ValueError("{}: missing $enddefinitions".format(self.file))
+            header += chunk
+            pos = header.find(b"$enddefinitions")
+            end = header.find(b"$end", pos + 15) if pos >= 0 else -1
+            if end >= 0:
+                break
+        self.data_offset = end + 4
+
+        hier = []
+        tokens = iter(header[:pos].split())
+        for tok in tokens:
+            if tok == b"$scope":
+                hier.append(self._untilEnd(tokens)[1].decode())
+            elif tok == b"$upscope":
+                self._untilEnd(tokens)
+                hier.pop()
+            elif tok == b"$var":
+                fields = self._untilEnd(tokens)
+                size, ident = int(fields[1]), bytes(fields[2])
+                reference = ".".join(hier + [b"".join(fields[3:]).decode()])
+                if reference not in self.references:
+                    continue
+                if ident not in self._id_tracks:
+                    self._id_tracks[ident] = SignalTrack(size)
+                self.tracks[reference] = self._id_tracks[ident]
+            elif tok == b"$timescale":
+                self.timescale = b"".join(self._untilEnd(tokens)).decode()
+            elif tok.startswith(b"$"):
+                self._untilEnd(tokens)
+        return bytes(header[self.data_offset:])
+
+    # yields (file offset, block) of complete lines from the value change section,
+    # reading at most `limit` bytes from fd
+    def _blocks(self, fd, data, limit=None):
+        offset = self.data_offset
+        while True:
+            size = self.chunk_size if limit is None else min(self.chunk_size, limit)
+            chunk = fd.read(size)
+            if limit is not None:
+                limit -= len(chunk)
+            data += chunk
+            # only split on complete lines, keep the rest for the next chunk
+            cut = data.rfind(b"\n") + 1 if chunk else len(data)
+            comment = data.rfind(b"$comment", 0, cut)
+            if comment >= 0 and data.find(b"$end", comment, cut) < 0:
+                cut = comment
+            block, data = data[:cut], data[cut:]
+            yield offset, block
+            offset += len(block)
+            if not chunk:
+                break
+
+    def _parseChanges(self, fd, data, limit=None):
+        id_tracks = self._id_tracks
+        time = 0
+        pending = None
+        for _, block in self._blocks(fd, data, limit):
+            for tok in _stripComments(block).split():
+                if pending is not None:
+                    track = id_tracks.get(tok)
+                    if track is not None:
+                        track.times.append(time)
+                        try:
+                            track.values.append(int(pending, 2))
+                        except ValueError:
+                            track.values.append(_parseVectorValue(pending))
+                    pending = None
+                    continue
+                c = tok[0]
+                if c == 35:                                 # '#': timestamp
+                    time = int(tok[1:])
+                elif c == 98 or c == 66 or c == 114 or c == 82:    # 'b', 'B', 'r', 'R': vector/real
+                    pending = tok[1:]
+                elif c != 36:                               # '$': $dumpvars, $end, ...
+                    track = id_tracks.get(tok[1:])
+                    if track is not None:
+                        track.times.append(time)
+                        track.values.append(1 if c == 49 else 0)
+        self.end_time = time
+
+# process pool worker: changes of the idents in sizes within [start, end) of file
+def _parseRange(file, start, end, sizes, chunk_size):
+    reader = VCDStreamReader(file, (), chunk_size)
+    reader.data_offset = start
+    reader._id_tracks = {ident: SignalTrack(size) for ident, size in sizes.items()}
+    with open(file, "rb") as fd:
+        fd.seek(start)
+        reader._parseChanges(fd, b"", end - start)
+    changes = {ident: (track.times, track.values) for ident, track in reader._id_tracks.items() if len(track)}
+    return reader.end_time, changes
+
+VCD_COMMENT = re.compile(rb"\$comment.*?\$end", re.S)
+
+def _stripComments(block):
+    if b"$comment" in block:
+        return VCD_COMMENT.sub(b"", block)
+    return block
+
+# applies the value changes in block to state[slot], returns the last timestamp seen.
+# The times edge_slot rises at are appended to edges
+def _applyChanges(block, id_slots, state, time, edge_slot=None, edges=None):
+    pending = None
+    for tok in _stripComments(block).split():
+        if pending is not None:
+            slot = id_slots.get(tok)
+            if slot is not None:
+                try:
+                    state[slot] = int(pending, 2)
+                except ValueError:
+                    state[slot] = _parseVectorValue(pending)
+            pending = None
+            continue
+        c = tok[0]
+        if c == 35:
+            time = int(tok[1:])
+        elif c == 98 or c == 66 or c == 114 or c == 82:
+            pending = tok[1:]
+        elif c != 36:
+            slot = id_slots.get(tok[1:])
+            if slot is not None:
+                if slot == edge_slot and c == 49 and not state[slot]:
+                    edges.append(time)
+                state[slot] = 1 if c == 49 else 0
+    return time
+
+# ===[ Checkpoint Index ]==================================
+# For dumps too large to extract, only a snapshot of all tracked values is kept
+# every `interval` clock cycles together with the byte offset of that timestamp.
+# A lookup replays the changes between the nearest checkpoint and the requested
+# time straight from the memory-mapped dump. The rising edges of the clock are
+# collected on the way.
+VCD_TIMESTAMP = re.compile(rb"^#(\d+)", re.M)
+
+# timestamp lines of a block of whole lines, skipping "#N" lines inside comments
+def _timestamps(block):
+    matches = VCD_TIMESTAMP.finditer(block)
+    if b"$comment" not in block:
+        return list(matches)
+    comments = [match.span() for match in VCD_COMMENT.finditer(block)]
+    starts = [start for start, _ in comments]
+    stamps = []
+    for match in matches:
+        i = bisect.bisect_right(starts, match.start()) - 1
+        if i < 0 or match.start() >= comments[i][1]:
+            stamps.append(match)
+    return stamps
+
+class CheckpointIndex():
+    def __init__(self, file, references, clock, interval, chunk_size=VCD_CHUNK_SIZE):
+        self.file = file
+        reader = VCDStreamReader(file, references, chunk_size)
+        with open(file, "rb") as fd:
+            self._scan(reader, fd, clock, interval)
+
+        self._fd = open(file, "rb")
+        self._mm = mmap.mmap(self._fd.fileno(), 0, access=mmap.ACCESS_READ)
+        # replay cursor of stateAt, in no segment yet
+        self._segment = -1
+        self._cursor_time = -1
+
+    # slots, clock edges and checkpoints from one pass over the dump
+    def _scan(self, reader, fd, clock, interval):
+        rest = reader._parseHeader(fd)
+        self.timescale = reader.timescale
+
+        # one state slot per VCD id code, shared by all its references
+        tracks = list({id(track): track for track in reader.tracks.values()}.values())
+        slot_of = {id(track): i for i, track in enumerate(tracks)}
+        self.sizes = [track.size for track in tracks]
+        self.slots = {reference: slot_of[id(track)] for reference, track in reader.tracks.items()}
+        self.id_slots = {ident: slot_of[id(track)] for ident, track in reader._id_tracks.items()}
+
+        state = [0] * len(tracks)
+        edges = []
+        clock_slot = self.slots.get(clock)
+        cp_times, cp_offsets, snapshots = [-1], [reader.data_offset], [list(state)]
+        # checkpoints are spaced by the first clock period, found by a dry run
+        # over the blocks until it has risen twice
+        self.interval = None
+        next_time = None
+        time = 0
+        for offset, block in reader._blocks(fd, rest):
+            start = 0
+            if self.interval is None:
+                probe = list(edges)
+                _applyChanges(block, self.id_slots, list(state), time, clock_slot, probe)
+                if len(probe) > 1:
+                    self.interval = interval * max(probe[1] - probe[0], 1)
+                    next_time = time - time % self.interval + self.interval
+            for match in _timestamps(block):
+                stamp = int(match.group(1))
+                if next_time is None or stamp < next_time:
+                    continue
+                time = _applyChanges(block[start:match.start()], self.id_slots, state, time, clock_slot, edges)
+                start = match.start()
+                cp_times.append(stamp)
+                cp_offsets.append(offset + start)
+                snapshots.append(list(state))
+                next_time = stamp - stamp % self.interval + self.interval
+            time = _applyChanges(block[start:], self.id_slots, state, time, clock_slot, edges)
+        self.end_time = time
+        self.edges = np.array(edges, dtype=np.int64)
+
+        self.cp_times   = np.array(cp_times, dtype=np.int64)
+        self.cp_offsets = np.array(cp_offsets + [os.path.getsize(self.file)], dtype=np.int64)
+        wide = any(size > 64 for size in self.sizes)
+        self.snapshots  = np.array(snapshots, dtype=object if wide else np.uint64)
+
+    # state of all slots at the given time, replaying forward from the last lookup when possible
+    def stateAt(self, time):
+        k = int(np.searchsorted(self.cp_times, time, side="right")) - 1
+        if k != self._segment or time < self._cursor_time:
+            if k != self._segment:
+                self._segment = k
+                self._data = self._mm[self.cp_offsets[k]:self.cp_offsets[k+1]]
+                matches = _timestamps(self._data)
+                self._stamp_pos = [match.start() for match in matches]
+                self._stamp_times = np.array([int(match.group(1)) for match in matches], dtype=np.int64)
+            self._state = self.snapshots[k].tolist()
+            self._cursor = 0
+            self._cursor_time = -1
+        i = int(np.searchsorted(self._stamp_times, time, side="right"))
+        end = self._stamp_pos[i] if i < len(self._stamp_pos) else len(self._data)
+        if end > self._cursor:
+            _applyChanges(self._data[self._cursor:end], self.id_slots, self._state, 0)
+            self._cursor = end
+        self._cursor_time = time
+        return self._state
+
+    def valueAt(self, reference, time):
+        return self.stateAt(time)[self.slots[reference]]
+
+    def close(self):
+        self._mm.close()
+        self._fd.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ===[ FST Reader ]========================================
+# FST (GTKWave's fstapi) is a sequence of blocks: the header, value change
+# blocks and, written last, hierarchy and geometry. Each value change block has
+# a frame with the values at its start, a compressed change list per handle, the
+# chain table locating those lists and a time table the changes index into.
+FST_BL_HDR               = 0
+FST_BL_VCDATA            = 1
+FST_BL_GEOM              = 3
+FST_BL_HIER              = 4
+FST_BL_VCDATA_DYN_ALIAS  = 5
+FST_BL_HIER_LZ4          = 6
+FST_BL_HIER_LZ4DUO       = 7
+FST_BL_VCDATA_DYN_ALIAS2 = 8
+FST_BL_ZWRAPPER          = 254
+FST_VCDATA_BLOCKS        = (FST_BL_VCDATA, FST_BL_VCDATA_DYN_ALIAS, FST_BL_VCDATA_DYN_ALIAS2)
+FST_ST_GEN_ATTRBEGIN     = 252
+FST_ST_GEN_ATTREND       = 253
+FST_ST_VCD_SCOPE         = 254
+FST_ST_VCD_UPSCOPE       = 255
+FST_TIMESCALE_UNITS      = ("s", "ms", "us", "ns", "ps", "fs")
+
+def _fstVarint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            return value, pos
+
+def _fstSVarint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            if byte & 0x40:
+                value -= 1 << shift
+            return value, pos
+
+def _fstString(data, pos):
+    end = data.index(b"\0", pos)
+    return bytes(data[pos:end]).decode(), end + 1
+
+def _lz4Decompress(src, size):
+    dst = bytearray()
+    pos = 0
+    while pos < len(src):
+        token = src[pos]
+        pos += 1
+        length = token >> 4
+        if length == 15:
+            while True:
+                length += src[pos]
+                pos += 1
+                if src[pos - 1] != 255:
+                    break
+        dst += src[pos:pos + length]
+        pos += length
+        if pos >= len(src):
+            break
+        offset = src[pos] | (src[pos + 1] << 8)
+        pos += 2
+        length = token & 15
+        if length == 15:
+            while True:
+                length += src[pos]
+                pos += 1
+                if src[pos - 1] != 255:
+                    break
+        length += 4
+        start = len(dst) - offset
+        if offset >= length:
+            dst += dst[start:start + length]
+        else:
+            dst += (dst[start:] * (length // offset + 1))[:length]
+    return bytes(dst[:size])
+
+def _fastlzDecompress(src, size):
+    dst = bytearray()
+    level = (src[0] >> 5) + 1
+    ctrl = src[0] & 31
+    pos = 1
+    while True:
+        if ctrl >= 32:
+            length = (ctrl >> 5) - 1
+            offset = (ctrl & 31) << 8
+            if length == 6:
+                while True:
+                    code = src[pos]
+                    pos += 1
+                    length += code
+                    if level == 1 or code != 255:
+                        break
+            code = src[pos]
+            pos += 1
+            offset += code
+            if level == 2 and code == 255 and offset == (31 << 8) + 255:
+                offset = ((src[pos] << 8) | src[pos + 1]) + 8191
+                pos += 2
+            length += 3
+            start = len(dst) - offset - 1
+            if offset + 1 >= length:
+                dst += dst[start:start + length]
+            else:
+                dst += (dst[start:] * (length // (offset + 1) + 1))[:length]
+        else:
+            dst += src[pos:pos + ctrl + 1]
+            pos += ctrl + 1
+        if pos >= len(src):
+            break
+        ctrl = src[pos]
+        pos += 1
+    return bytes(dst[:size])
+
+# reads an FST and only keeps changes of the requested signals
+class FSTReader():
+    def __init__(self, file, references):
+        self.file = file
+        self.references = set(references)
+        self.timescale = None
+        self.end_time = 0
+        self.tracks = {}
+        self._handle_tracks = {}
+
+    # returns {reference: SignalTrack} for all requested signals found in the dump
+    def read(self):
+        with open(self.file, "rb") as fd:
+            data = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+            if data[0] == FST_BL_ZWRAPPER:
+                data = gzip.decompress(data[17:])
+            blocks = []
+            pos = 0
+            while pos + 9 <= len(data):
+                kind, length = struct.unpack_from(">BQ", data, pos)
+                blocks.append((kind, pos + 1))
+                pos += 1 + length
+
+            # hierarchy and geometry follow the value changes in the file
+            for kind, blk in blocks:
+                if kind == FST_BL_HDR:
+                    self._parseHeader(data, blk)
+                elif kind in (FST_BL_HIER, FST_BL_HIER_LZ4, FST_BL_HIER_LZ4DUO):
+                    self._parseHierarchy(self._hierarchy(data, kind, blk))
+                elif kind == FST_BL_GEOM:
+                    self._parseGeometry(data, blk)
+            for kind, blk in blocks:
+                if kind in FST_VCDATA_BLOCKS:
+                    self._parseChanges(data, kind, blk)
+        return self.tracks
+
+    def _parseHeader(self, data, blk):
+        self.end_time = struct.unpack_from(">Q", data, blk + 16)[0]
+        exponent = struct.unpack_from(">b", data, blk + 72)[0]
+        unit = (2 - exponent) // 3 * 3
+        self.timescale = "{}{}".format(10 ** (exponent + unit), FST_TIMESCALE_UNITS[unit // 3])
+
+    def _hierarchy(self, data, kind, blk):
+        length, size = struct.unpack_from(">QQ", data, blk)
+        if kind == FST_BL_HIER:
+            return gzip.decompress(data[blk + 16:blk + length])
+        if kind == FST_BL_HIER_LZ4:
+            return _lz4Decompress(data[blk + 16:blk + length], size)
+        packed, pos = _fstVarint(data, blk + 16)
+        return _lz4Decompress(_lz4Decompress(data[pos:blk + length], packed), size)
+
+    def _parseHierarchy(self, data):
+        scopes = []
+        handle = 0
+        pos = 0
+        while pos < len(data):
+            tag = data[pos]
+            pos += 1
+            if tag == FST_ST_VCD_SCOPE:
+                name, pos = _fstString(data, pos + 1)
+                _, pos = _fstString(data, pos)
+                scopes.append(name)
+            elif tag == FST_ST_VCD_UPSCOPE:
+                scopes.pop()
+            elif tag == FST_ST_GEN_ATTRBEGIN:
+                _, pos = _fstString(data, pos + 2)
+                _, pos = _fstVarint(data, pos)
+            elif tag != FST_ST_GEN_ATTREND:
+                # a var, tag being its type
+                name, pos = _fstString(data, pos + 1)
+                size, pos = _fstVarint(data, pos)
+                alias, pos = _fstVarint(data, pos)
+                if not alias:
+                    handle += 1
+                    alias = handle
+                reference = ".".join(scopes + ["".join(name.split())])
+                if reference not in self.references:
+                    continue
+                if alias not in self._handle_tracks:
+                    self._handle_tracks[alias] = SignalTrack(size)
+                self.tracks[reference] = self._handle_tracks[alias]
+
+    # frame width of every handle, reals being stored as 8 byte doubles
+    def _parseGeometry(self, data, blk):
+        length, size, count = struct.unpack_from(">QQQ", data, blk)
+        geometry = data[blk + 24:blk + length]
+        if len(geometry) != size:
+            geometry = zlib.decompress(geometry)
+        self._lens = []
+        self._reals = set()
+        pos = 0
+        for handle in range(1, count + 1):
+            width, pos = _fstVarint(geometry, pos)
+            if width == 0:
+                self._reals.add(handle)
+                width = 8
+            elif width == 0xFFFFFFFF:
+                width = 0
+            self._lens.append(width)
+
+    def _parseChanges(self, data, kind, blk):
+        length, begin = struct.unpack_from(">QQ", data, blk)
+        end = blk + length
+        time_size, time_packed, time_count = struct.unpack_from(">QQQ", data, end - 24)
+        time_pos = end - 24 - time_packed
+        raw = data[time_pos:end - 24]
+        if time_packed != time_size:
+            raw = zlib.decompress(raw)
+        times = []
+        time = pos = 0
+        for _ in range(time_count):
+            delta, pos = _fstVarint(raw, pos)
+            time += delta
+            times.append(time)
+
+        frame_size, pos = _fstVarint(data, blk + 32)
+        frame_packed, pos = _fstVarint(data, pos)
+        frame_count, pos = _fstVarint(data, pos)
+        frame = data[pos:pos + frame_packed]
+        if frame_packed != frame_size:
+            frame = zlib.decompress(frame)
+        _, vc_start = _fstVarint(data, pos + frame_packed)
+        packtype = data[vc_start]
+        chain_packed = struct.unpack_from(">Q", data, time_pos - 8)[0]
+        chain_pos = time_pos - 8 - chain_packed
+        offsets, lengths = self._chainTable(data[chain_pos:time_pos - 8], kind, chain_pos - vc_start)
+
+        frame_pos = 0
+        for handle in range(1, frame_count + 1):
+            width = self._lens[handle - 1]
+            track = self._handle_tracks.get(handle)
+            if track is not None:
+                value = self._value(frame[frame_pos:frame_pos + width], handle)
+                if not len(track) or track.values[-1] != value:
+                    track.times.append(begin)
+                    track.values.append(value)
+            frame_pos += width
+
+        for handle, track in self._handle_tracks.items():
+            if handle > len(offsets) or not offsets[handle - 1]:
+                continue
+            pos = vc_start + offsets[handle - 1]
+            size, start = _fstVarint(data, pos)
+            changes = data[start:pos + lengths[handle - 1]]
+            if size:
+                if packtype == ord("4"):
+                    changes = _lz4Decompress(changes, size)
+                elif packtype == ord("F"):
+                    changes = _fastlzDecompress(changes, size)
+                else:
+                    changes = zlib.decompress(changes)
+            self._decodeChanges(changes, handle, track, times)
+
+    # offset relative to vc_start and length of the change list of every handle
+    def _chainTable(self, chain, kind, end):
+        offsets, lengths = [], []
+        value = alias = 0
+        last = None
+        pos = 0
+        while pos < len(chain):
+            if kind == FST_BL_VCDATA_DYN_ALIAS2:
+                if chain[pos] & 1:
+                    shift, pos = _fstSVarint(chain, pos)
+                    shift >>= 1
+                    if shift > 0:
+                        value += shift
+                        if last is not None:
+                            lengths[last] = value - offsets[last]
+                        last = len(offsets)
+                        offsets.append(value)
+                        lengths.append(0)
+                    else:
+                        if shift < 0:
+                            alias = shift
+                        offsets.append(0)
+                        lengths.append(alias)
+                    continue
+                code, pos = _fstVarint(chain, pos)
+            else:
+                code, pos = _fstVarint(chain, pos)
+                if not code:
+                    code, pos = _fstVarint(chain, pos)
+                    offsets.append(0)
+                    lengths.append(-code)
+                    continue
+                if code & 1:
+                    value += code >> 1
+                    if last is not None:
+                        lengths[last] = value - offsets[last]
+                    last = len(offsets)
+                    offsets.append(value)
+                    lengths.append(0)
+                    continue
+            offsets += [0] * (code >> 1)
+            lengths += [0] * (code >> 1)
+        if last is not None:
+            lengths[last] = end - offsets[last]
+        # dynamic aliases share the change list of an earlier handle
+        for i, length in enumerate(lengths):
+            if length < 0 and not offsets[i] and -length - 1 < i:
+                offsets[i] = offsets[-length - 1]
+                lengths[i] = lengths[-length - 1]
+        return offsets, lengths
+
+    def _value(self, raw, handle):
+        if handle in self._reals:
+            return int(struct.unpack("<d", raw)[0])
+        return _parseVectorValue(bytes(raw))
+
+    def _decodeChanges(self, changes, handle, track, times):
+        width = self._lens[handle - 1]
+        index = pos = 0
+        while pos < len(changes):
+            code, pos = _fstVarint(changes, pos)
+            if width == 1:
+                if code & 1:
+                    index += code >> 4
+                    value = 0                   # x, z, h, u, w, l, -, ?
+                else:
+                    index += code >> 2
+                    value = (code >> 1) & 1
+            else:
+                index += code >> 1
+                if handle in self._reals:
+                    value = int(struct.unpack_from("<d", changes, pos)[0])
+                    pos += 8
+                elif code & 1:
+                    value = _parseVectorValue(bytes(changes[pos:pos + width]))
+                    pos += width
+                else:
+                    count = (width + 7) // 8
+                    value = int.from_bytes(changes[pos:pos + count], "big") >> (count * 8 - width)
+                    pos += count
+            track.times.append(times[index])
+            track.values.append(value)
+
+# ===[ Trace Cache ]=======================================
+# Extracted signal histories of a dump are saved as one binary file: a JSON
+# header followed by the raw store columns, which are memory-mapped on load.
+# The cache is only used if size, mtime, a content hash of the dump and the
+# list of tracked signals all match.
+TRACE_CACHE_MAGIC   = b"VEERCACHE1\n"
+TRACE_CACHE_SUFFIX  = ".veercache"
+TRACE_CACHE_DIR     = os.path.join(os.path.expanduser("~"), ".cache", "veerisualize")
+TRACE_CACHE_SAMPLE  = 1024 * 1024
+TRACE_CACHE_ALIGN   = 64
+
+class TraceCache():
+    def __init__(self, file, references, cache_dir=None):
+        self.file = file
+        self.references = sorted(set(references))
+        if cache_dir is None:
+            self.paths = [file + TRACE_CACHE_SUFFIX, self._pathIn(TRACE_CACHE_DIR)]
+        else:
+            self.paths = [self._pathIn(cache_dir)]
+        self.key = self._key()
+
+    def _pathIn(self, directory):
+        name = hashlib.sha1(os.path.abspath(self.file).encode()).hexdigest()
+        return os.path.join(directory, name + TRACE_CACHE_SUFFIX)
+
+    # size and mtime plus a hash over the start and end of the dump and the signal list,
+    # hashing all of a multi-GB dump would take longer than parsing it from the cache saves
+    def _key(self):
+        stat = os.stat(self.file)
+        digest = hashlib.sha1()
+        with open(self.file, "rb") as fd:
+            digest.update(fd.read(TRACE_CACHE_SAMPLE))
+            fd.seek(max(0, stat.st_size - TRACE_CACHE_SAMPLE))
+            digest.update(fd.read(TRACE_CACHE_SAMPLE))
+        digest.update("\n".join(self.references).encode())
+        return {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": digest.hexdigest()}
+
+    def _readHeader(self, fd):
+        if fd.read(len(TRACE_CACHE_MAGIC)) != TRACE_CACHE_MAGIC:
+            return None
+        length = int.from_bytes(fd.read(8), "little")
+        return json.loads(fd.read(length))
+
+    # returns (tracks, store, meta) from the first valid cache file, None if there is none
+    def load(self):
+        for path in self.paths:
+            try:
+                with open(path, "rb") as fd:
+                    header = self._readHeader(fd)
+            except (OSError, ValueError):
+                continue
+            if header is None or header["key"] != self.key:
+                continue
+            columns = {}
+            for name, (offset, dtype, shape) in header["columns"].items():
+                if shape[0]:
+                    columns[name] = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=tuple(shape))
+                else:
+                    columns[name] = np.zeros(shape, dtype=dtype)
+            offsets = np.asarray(header["offsets"], dtype=np.int64)
+            tracks = {}
+            store_tracks = []
+            for i, entry in enumerate(header["tracks"]):
+                track = SignalTrack(entry["size"])
+                lo, hi = offsets[i], offsets[i+1]
+                packed = None
+                if track.words > 1:
+                    start = entry["packed"]
+                    packed = columns["packed"][start:start + (hi-lo)*track.words].reshape(hi-lo, track.words)
+                track.freeze(columns["times"][lo:hi], columns["values"][lo:hi], packed)
+                for reference in entry["references"]:
+                    tracks[reference] = track
+                store_tracks.append(track)
+            store = SignalStore(store_tracks, offsets, columns["times"], columns["values"], columns["keys"], header["span"])
+            return tracks, store, header["meta"]
+        return None
+
+    def save(self, tracks, store, meta):
+        references = {}
+        for reference, track in tracks.items():
+            references.setdefault(id(track), []).append(reference)
+        packed = [track.packed.reshape(-1) for track in store.tracks if track.words > 1]
+        entries = []
+        packed_offset = 0
+        for track in store.tracks:
+            entry = {"size": track.size, "references": references.get(id(track), [])}
+            if track.words > 1:
+                entry["packed"] = packed_offset
+                packed_offset += track.packed.size
+            entries.append(entry)
+        columns = [("times", store.times), ("values", store.values), ("keys", store.keys),
+                   ("packed", np.concatenate(packed) if packed else np.zeros(0, dtype=np.uint64))]
+
+        header = {"key": self.key, "meta": meta, "span": store.span, "offsets": store.offsets.tolist(), "tracks": entries, "columns": {}}
+        # column offsets depend on the header length and the other way round: lay
+        # out again until the header holding the offsets has the length they assume
+        length = -1
+        encoded = json.dumps(header).encode()
+        while len(encoded) != length:
+            length = len(encoded)
+            offset = len(TRACE_CACHE_MAGIC) + 8 + length
+            for name, column in columns:
+                offset = (offset + TRACE_CACHE_ALIGN - 1) // TRACE_CACHE_ALIGN * TRACE_CACHE_ALIGN
+                header["columns"][name] = [offset, column.dtype.str, list(column.shape)]
+                offset += column.nbytes
+            encoded = json.dumps(header).encode()
+
+        for path in self.paths:
+            tmp = "{}.{}.tmp".format(path, os.getpid())
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                with open(tmp, "wb") as fd:
+                    fd.write(TRACE_CACHE_MAGIC)
+                    fd.write(len(encoded).to_bytes(8, "little"))
+                    fd.write(encoded)
+                    for name, column in columns:
+                        fd.write(b"\0" * (header["columns"][name][0] - fd.tell()))
+                        fd.write(np.ascontiguousarray(column).tobytes())
+                os.replace(tmp, path)
+                return path
+            except OSError:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        return None
+
+# ===[ Waveform Source ]===================================
+# What the controller needs from a waveform: the signals of the view, the current
+# cycle, the value of a signal at a time and the final cycle. Backends load their
+# tracks with _loadTracks() or override the lookups.
+# Cycles are numbered from 0 by the rising edges of the clock, edges[cycle] is the
+# time a cycle is sampled at
+class WaveformSource():
+    def __init__(self):
+        self.cycle = 0
+        # guards the tracks (and the index cursor) against the loader and prefetch threads
+        self._lock = threading.Lock()
+        # bumped whenever the loaded signals change, so cached frames can be told apart
+        self.generation = 0
+        self._events = {}
+        self._conditions = {}
+        self._retire = None
+        self._gpr_writes = None
+        # checkpoint index the values are replayed from, None while they are in memory
+        self.index = None
+        # background read of the pending signal groups, see _loadTracks
+        self.pending_groups = []
+        self._loader = None
+        self._load_error = None
+        # signals of the scene, grouped by the panel that needs them
+        self.signal_groups = {
+            "CLK" : {
+                "clk"         : VEER_TOP + "clk",
+            },
+            "IB" : {
+                "ib0"         : VEER_DEC_IB + "ib0[31:0]",
+                "ib1"         : VEER_DEC_IB + "ib1[31:0]",
+                "ib2"         : VEER_DEC_IB + "ib2[31:0]",
+                "ib3"         : VEER_DEC_IB + "ib3[31:0]",
+                "shift0"      : VEER_DEC_IB + "shift0",
+                "shift1"      : VEER_DEC_IB + "shift1",
+                "shift2"      : VEER_DEC_IB + "shift2",
+                "ibval"       : VEER_DEC_IB + "ibval[3:0]",
+                "dec_i0_pc_d" : VEER_DEC_IB + "dec_i0_pc_d[31:1]",
+                "dec_i1_pc_d" : VEER_DEC_IB + "dec_i1_pc_d[31:1]",
+                "pc2"         : VEER_DEC_IB + "pc2[36:0]",
+                "pc3"         : VEER_DEC_IB + "pc3[36:0]",
+                "ic0"         : VEER_DEC_IB + "ic0",
+                "ic1"         : VEER_DEC_IB + "ic1",
+                "ic2"         : VEER_DEC_IB + "ic2",
+                "ic3"         : VEER_DEC_IB + "ic3",
+                "i0_wen_shifted" : VEER_DEC_IB + "i0_wen_shifted[3:0]",
+                "i1_wen_shifted" : VEER_DEC_IB + "i1_wen_shifted[3:1]",
+            },
+            "IFU" : {
+                "ifu_i0_pc" : VEER_TOP + "ifu.aln.ifu_i0_pc[31:1]",
+                "ifu_i1_pc" : VEER_TOP + "ifu.aln.ifu_i1_pc[31:1]",
+            },
+            "GPR" : {
+                "i0_rs1_en_d" : VEER_DEC_DECODE + "dec_i0_rs1_en_d",
+                "i0_rs2_en_d" : VEER_DEC_DECODE + "dec_i0_rs2_en_d",
+                "i1_rs1_en_d" : VEER_DEC_DECODE + "dec_i1_rs1_en_d",
+                "i1_rs2_en_d" : VEER_DEC_DECODE + "dec_i1_rs2_en_d",
+
+                "i0_rs1"      : VEER_DEC_DECODE + "i0r.rs1[4:0]",
+                "i0_rs2"      : VEER_DEC_DECODE + "i0r.rs2[4:0]",
+                "i1_rs1"      : VEER_DEC_DECODE + "i1r.rs1[4:0]",
+                "i1_rs2"      : VEER_DEC_DECODE + "i1r.rs2[4:0]",
+
+                "x1"          : VEER_GPR + "gpr[1].gprff.dout[31:0]",
+                "x2"          : VEER_GPR + "gpr[2].gprff.dout[31:0]",
+                "x3"          : VEER_GPR + "gpr[3].gprff.dout[31:0]",
+                "x4"          : VEER_GPR + "gpr[4].gprff.dout[31:0]",
+                "x5"          : VEER_GPR + "gpr[5].gprff.dout[31:0]",
+                "x6"          : VEER_GPR + "gpr[6].gprff.dout[31:0]",
+                "x7"          : VEER_GPR + "gpr[7].gprff.dout[31:0]",
+                "x8"          : VEER_GPR + "gpr[8].gprff.dout[31:0]",
+                "x9"          : VEER_GPR + "gpr[9].gprff.dout[31:0]",
+                "x10"         : VEER_GPR + "gpr[10].gprff.dout[31:0]",
+                "x11"         : VEER_GPR + "gpr[11].gprff.dout[31:0]",
+                "x12"         : VEER_GPR + "gpr[12].gprff.dout[31:0]",
+                "x13"         : VEER_GPR + "gpr[13].gprff.dout[31:0]",
+                "x14"         : VEER_GPR + "gpr[14].gprff.dout[31:0]",
+                "x15"         : VEER_GPR + "gpr[15].gprff.dout[31:0]",
+                "x16"         : VEER_GPR + "gpr[16].gprff.dout[31:0]",
+                "x17"         : VEER_GPR + "gpr[17].gprff.dout[31:0]",
+                "x18"         : VEER_GPR + "gpr[18].gprff.dout[31:0]",
+                "x19"         : VEER_GPR + "gpr[19].gprff.dout[31:0]",
+                "x20"         : VEER_GPR + "gpr[20].gprff.dout[31:0]",
+                "x21"         : VEER_GPR + "gpr[21].gprff.dout[31:0]",
+                "x22"         : VEER_GPR + "gpr[22].gprff.dout[31:0]",
+                "x23"         : VEER_GPR + "gpr[23].gprff.dout[31:0]",
+                "x24"         : VEER_GPR + "gpr[24].gprff.dout[31:0]",
+                "x25"         : VEER_GPR + "gpr[25].gprff.dout[31:0]",
+                "x26"         : VEER_GPR + "gpr[26].gprff.dout[31:0]",
+                "x27"         : VEER_GPR + "gpr[27].gprff.dout[31:0]",
+                "x28"         : VEER_GPR + "gpr[28].gprff.dout[31:0]",
+                "x29"         : VEER_GPR + "gpr[29].gprff.dout[31:0]",
+                "x30"         : VEER_GPR + "gpr[30].gprff.dout[31:0]",
+                "x31"         : VEER_GPR + "gpr[31].gprff.dout[31:0]",
+
+                "x1_en"          : VEER_GPR + "gpr[1].gprff.en",
+                "x2_en"          : VEER_GPR + "gpr[2].gprff.en",
+                "x3_en"          : VEER_GPR + "gpr[3].gprff.en",
+                "x4_en"          : VEER_GPR + "gpr[4].gprff.en",
+                "x5_en"          : VEER_GPR + "gpr[5].gprff.en",
+                "x6_en"          : VEER_GPR + "gpr[6].gprff.en",
+                "x7_en"          : VEER_GPR + "gpr[7].gprff.en",
+                "x8_en"          : VEER_GPR + "gpr[8].gprff.en",
+                "x9_en"          : VEER_GPR + "gpr[9].gprff.en",
+                "x10_en"         : VEER_GPR + "gpr[10].gprff.en",
+                "x11_en"         : VEER_GPR + "gpr[11].gprff.en",
+                "x12_en"         : VEER_GPR + "gpr[12].gprff.en",
+                "x13_en"         : VEER_GPR + "gpr[13].gprff.en",
+                "x14_en"         : VEER_GPR + "gpr[14].gprff.en",
+                "x15_en"         : VEER_GPR + "gpr[15].gprff.en",
+                "x16_en"         : VEER_GPR + "gpr[16].gprff.en",
+                "x17_en"         : VEER_GPR + "gpr[17].gprff.en",
+                "x18_en"         : VEER_GPR + "gpr[18].gprff.en",
+                "x19_en"         : VEER_GPR + "gpr[19].gprff.en",
+                "x20_en"         : VEER_GPR + "gpr[20].gprff.en",
+                "x21_en"         : VEER_GPR + "gpr[21].gprff.en",
+                "x22_en"         : VEER_GPR + "gpr[22].gprff.en",
+                "x23_en"         : VEER_GPR + "gpr[23].gprff.en",
+                "x24_en"         : VEER_GPR + "gpr[24].gprff.en",
+                "x25_en"         : VEER_GPR + "gpr[25].gprff.en",
+                "x26_en"         : VEER_GPR + "gpr[26].gprff.en",
+                "x27_en"         : VEER_GPR + "gpr[27].gprff.en",
+                "x28_en"         : VEER_GPR + "gpr[28].gprff.en",
+                "x29_en"         : VEER_GPR + "gpr[29].gprff.en",
+                "x30_en"         : VEER_GPR + "gpr[30].gprff.en",
+                "x31_en"         : VEER_GPR + "gpr[31].gprff.en",
+            },
+            "DECODE" : {
+                "dec_i0_decode_d" : VEER_DEC_DECODE + "dec_i0_decode_d",
+                "dec_i1_decode_d" : VEER_DEC_DECODE + "dec_i1_decode_d",
+                "freeze"          : VEER_DEC_DECODE + "freeze",
+                "flush_final_e3"  : VEER_DEC_DECODE + "flush_final_e3",
+                "flush_lower_wb"  : VEER_DEC_DECODE + "flush_lower_wb",
+                "nonblock_load_wen" : VEER_DEC_DECODE + "dec_nonblock_load_wen",
+                "i0_rs1_bypass_en"  : VEER_DEC_DECODE + "dec_i0_rs1_bypass_en_d",
+                "i0_rs2_bypass_en"  : VEER_DEC_DECODE + "dec_i0_rs2_bypass_en_d",
+                "i1_rs1_bypass_en"  : VEER_DEC_DECODE + "dec_i1_rs1_bypass_en_d",
+                "i1_rs2_bypass_en"  : VEER_DEC_DECODE + "dec_i1_rs2_bypass_en_d",
+                "i0_dp.imm20"       : VEER_DEC_DECODE + "i0_dp.imm20",
+                "i0_dp.imm12"       : VEER_DEC_DECODE + "i0_dp.imm12",
+                "i1_dp.imm20"       : VEER_DEC_DECODE + "i1_dp.imm20",
+                "i1_dp.imm12"       : VEER_DEC_DECODE + "i1_dp.imm12",
+                "i0_select_pc_d" : VEER_DEC_DECODE + "dec_i0_select_pc_d",
+                "i1_select_pc_d" : VEER_DEC_DECODE + "dec_i1_select_pc_d",
+                "i0_alu_decode_d" : VEER_DEC_DECODE + "dec_i0_alu_decode_d",
+                "i1_alu_decode_d" : VEER_DEC_DECODE + "dec_i1_alu_decode_d",
+                "i0_mul_d"    : VEER_DEC_DECODE + "dec_i0_mul_d",
+                "i1_mul_d"    : VEER_DEC_DECODE + "dec_i1_mul_d",
+                "i0_lsu_d"    : VEER_DEC_DECODE + "dec_i0_mul_d",
+                "i1_lsu_d"    : VEER_DEC_DECODE + "dec_i1_mul_d",
+                "i0_div_d"    : VEER_DEC_DECODE + "dec_i0_div_d",
+                "i1_div_d"    : VEER_DEC_DECODE + "dec_i1_div_d",
+                "load_mul_rs1_bypass_e1" : VEER_DEC_DECODE + "load_mul_rs1_bypass_e1",
+                "load_mul_rs2_bypass_e1" : VEER_DEC_DECODE + "load_mul_rs2_bypass_e1",
+                "i0_wen_wb" : VEER_DEC_DECODE + "i0_wen_wb",
+                "i1_wen_wb" : VEER_DEC_DECODE + "i1_wen_wb",
+
+                "e2d.i0rs1bype2" : VEER_DEC_DECODE + "e2d.i0rs1bype2[1:0]",
+                "e2d.i0rs2bype2" : VEER_DEC_DECODE + "e2d.i0rs2bype2[1:0]",
+                "e2d.i1rs1bype2" : VEER_DEC_DECODE + "e2d.i1rs1bype2[1:0]",
+                "e2d.i1rs2bype2" : VEER_DEC_DECODE + "e2d.i1rs2bype2[1:0]",
+
+                "e3d.i0rs1bype3" : VEER_DEC_DECODE + "e3d.i0rs1bype3[3:0]",
+                "e3d.i0rs2bype3" : VEER_DEC_DECODE + "e3d.i0rs2bype3[3:0]",
+                "e3d.i1rs1bype3" : VEER_DEC_DECODE + "e3d.i1rs1bype3[6:0]",
+                "e3d.i1rs2bype3" : VEER_DEC_DECODE + "e3d.i1rs2bype3[6:0]",
+
+                "i0_inst_e1" : VEER_DEC_DECODE + "i0_inst_e1[31:0]",
+                "i0_inst_e2" : VEER_DEC_DECODE + "i0_inst_e2[31:0]",
+                "i0_inst_e3" : VEER_DEC_DECODE + "i0_inst_e3[31:0]",
+                "i0_inst_e4" : VEER_DEC_DECODE + "i0_inst_e4[31:0]",
+                "i0_inst_e5" : VEER_DEC_DECODE + "i0_inst_wb[31:0]",
+                "i0_inst_wb1" : VEER_DEC_DECODE + "i0_inst_wb1[31:0]",
+
+                "i1_inst_e1" : VEER_DEC_DECODE + "i1_inst_e1[31:0]",
+                "i1_inst_e2" : VEER_DEC_DECODE + "i1_inst_e2[31:0]",
+                "i1_inst_e3" : VEER_DEC_DECODE + "i1_inst_e3[31:0]",
+                "i1_inst_e4" : VEER_DEC_DECODE + "i1_inst_e4[31:0]",
+                "i1_inst_e5" : VEER_DEC_DECODE + "i1_inst_wb[31:0]",
+                "i1_inst_wb1" : VEER_DEC_DECODE + "i1_inst_wb1[31:0]",
+
+                "i0_pc_e1" : VEER_DEC_DECODE + "i0_pc_e1[31:1]",
+                "i0_pc_e2" : VEER_DEC_DECODE + "i0_pc_e2[31:1]",
+                "i0_pc_e3" : VEER_DEC_DECODE + "i0_pc_e3[31:1]",
+                "i0_pc_e4" : VEER_DEC_DECODE + "i0_pc_e4[31:1]",
+                "i0_pc_e5" : VEER_DEC_DECODE + "i0_pc_wb[31:1]",
+
+                "i1_pc_e1" : VEER_DEC_DECODE + "i1_pc_e1[31:1]",
+                "i1_pc_e2" : VEER_DEC_DECODE + "i1_pc_e2[31:1]",
+                "i1_pc_e3" : VEER_DEC_DECODE + "i1_pc_e3[31:1]",
+                "i1_pc_e4" : VEER_DEC_DECODE + "i1_pc_e4[31:1]",
+                "i1_pc_e5" : VEER_DEC_DECODE + "i1_pc_wb[31:1]",
+
+                "i0_e1_copy" : VEER_DEC_DECODE + "i0_e1_copy",
+                "i0_e2_copy" : VEER_DEC_DECODE + "i0_e2_copy",
+                "i0_e3_copy" : VEER_DEC_DECODE + "i0_e3_copy",
+                "i0_e4_copy" : VEER_DEC_DECODE + "i0_e4_copy",
+                "i0_e5_copy" : VEER_DEC_DECODE + "i0_wb_copy",
+
+                "i1_e1_copy" : VEER_DEC_DECODE + "i1_e1_copy",
+                "i1_e2_copy" : VEER_DEC_DECODE + "i1_e2_copy",
+                "i1_e3_copy" : VEER_DEC_DECODE + "i1_e3_copy",
+                "i1_e4_copy" : VEER_DEC_DECODE + "i1_e4_copy",
+                "i1_e5_copy" : VEER_DEC_DECODE + "i1_wb_copy",
+
+                "i0_dc.alu" : VEER_DEC_DECODE + "i0_dc.alu",
+                "i0_dc.load" : VEER_DEC_DECODE + "i0_dc.load",
+                "i0_dc.mul" : VEER_DEC_DECODE + "i0_dc.mul",
+                "i0_dc.sec" : VEER_DEC_DECODE + "i0_dc.sec",
+
+                "i0_e1c.alu" : VEER_DEC_DECODE + "i0_e1c.alu",
+                "i0_e1c.load" : VEER_DEC_DECODE + "i0_e1c.load",
+                "i0_e1c.mul" : VEER_DEC_DECODE + "i0_e1c.mul",
+                "i0_e1c.sec" : VEER_DEC_DECODE + "i0_e1c.sec",
+
+                "i0_e2c.alu" : VEER_DEC_DECODE + "i0_e2c.alu",
+                "i0_e2c.load" : VEER_DEC_DECODE + "i0_e2c.load",
+                "i0_e2c.mul" : VEER_DEC_DECODE + "i0_e2c.mul",
+                "i0_e2c.sec" : VEER_DEC_DECODE + "i0_e2c.sec",
+
+                "i0_e3c.alu" : VEER_DEC_DECODE + "i0_e3c.alu",
+                "i0_e3c.load" : VEER_DEC_DECODE + "i0_e3c.load",
+                "i0_e3c.mul" : VEER_DEC_DECODE + "i0_e3c.mul",
+                "i0_e3c.sec" : VEER_DEC_DECODE + "i0_e3c.sec",
+
+                "i0_e4c.alu" : VEER_DEC_DECODE + "i0_e4c.alu",
+                "i0_e4c.load" : VEER_DEC_DECODE + "i0_e4c.load",
+                "i0_e4c.mul" : VEER_DEC_DECODE + "i0_e4c.mul",
+                "i0_e4c.sec" : VEER_DEC_DECODE + "i0_e4c.sec",
+
+                "i0_e5c.alu" : VEER_DEC_DECODE + "i0_wbc.alu",
+                "i0_e5c.load" : VEER_DEC_DECODE + "i0_wbc.load",
+                "i0_e5c.mul" : VEER_DEC_DECODE + "i0_wbc.mul",
+                "i0_e5c.sec" : VEER_DEC_DECODE + "i0_wbc.sec",
+
+                "i1_dc.alu" : VEER_DEC_DECODE + "i1_dc.alu",
+                "i1_dc.load" : VEER_DEC_DECODE + "i1_dc.load",
+                "i1_dc.mul" : VEER_DEC_DECODE + "i1_dc.mul",
+                "i1_dc.sec" : VEER_DEC_DECODE + "i1_dc.sec",
+
+                "i1_e1c.alu" : VEER_DEC_DECODE + "i1_e1c.alu",
+                "i1_e1c.load" : VEER_DEC_DECODE + "i1_e1c.load",
+                "i1_e1c.mul" : VEER_DEC_DECODE + "i1_e1c.mul",
+                "i1_e1c.sec" : VEER_DEC_DECODE + "i1_e1c.sec",
+
+                "i1_e2c.alu" : VEER_DEC_DECODE + "i1_e2c.alu",
+                "i1_e2c.load" : VEER_DEC_DECODE + "i1_e2c.load",
+                "i1_e2c.mul" : VEER_DEC_DECODE + "i1_e2c.mul",
+                "i1_e2c.sec" : VEER_DEC_DECODE + "i1_e2c.sec",
+
+                "i1_e3c.alu" : VEER_DEC_DECODE + "i1_e3c.alu",
+                "i1_e3c.load" : VEER_DEC_DECODE + "i1_e3c.load",
+                "i1_e3c.mul" : VEER_DEC_DECODE + "i1_e3c.mul",
+                "i1_e3c.sec" : VEER_DEC_DECODE + "i1_e3c.sec",
+
+                "i1_e4c.alu" : VEER_DEC_DECODE + "i1_e4c.alu",
+                "i1_e4c.load" : VEER_DEC_DECODE + "i1_e4c.load",
+                "i1_e4c.mul" : VEER_DEC_DECODE + "i1_e4c.mul",
+                "i1_e4c.sec" : VEER_DEC_DECODE + "i1_e4c.sec",
+
+                "i1_e5c.alu" : VEER_DEC_DECODE + "i1_wbc.alu",
+                "i1_e5c.load" : VEER_DEC_DECODE + "i1_wbc.load",
+                "i1_e5c.mul" : VEER_DEC_DECODE + "i1_wbc.mul",
+                "i1_e5c.sec" : VEER_DEC_DECODE + "i1_wbc.sec",
+
+                "e1d.i0valid" : VEER_DEC_DECODE + "e1d.i0valid",
+                "e2d.i0valid" : VEER_DEC_DECODE + "e2d.i0valid",
+                "e3d.i0valid" : VEER_DEC_DECODE + "e3d.i0valid",
+                "e4d.i0valid" : VEER_DEC_DECODE + "e4d.i0valid",
+                "e5d.i0valid" : VEER_DEC_DECODE + "wbd.i0valid",
+
+                "e1d.i1valid" : VEER_DEC_DECODE + "e1d.i1valid",
+                "e2d.i1valid" : VEER_DEC_DECODE + "e2d.i1valid",
+                "e3d.i1valid" : VEER_DEC_DECODE + "e3d.i1valid",
+                "e4d.i1valid" : VEER_DEC_DECODE + "e4d.i1valid",
+                "e5d.i1valid" : VEER_DEC_DECODE + "wbd.i1valid",
+
+                "i0_rs1bypass" : VEER_DEC_DECODE + "i0_rs1bypass[9:0]",
+                "i0_rs2bypass" : VEER_DEC_DECODE + "i0_rs2bypass[9:0]",
+                "i1_rs1bypass" : VEER_DEC_DECODE + "i1_rs1bypass[9:0]",
+                "i1_rs2bypass" : VEER_DEC_DECODE + "i1_rs2bypass[9:0]",
+
+                "e1_i0_rd"     : VEER_DEC_DECODE + "e1d.i0rd[4:0]",
+                "e2_i0_rd"     : VEER_DEC_DECODE + "e2d.i0rd[4:0]",
+                "e3_i0_rd"     : VEER_DEC_DECODE + "e3d.i0rd[4:0]",
+                "e4_i0_rd"     : VEER_DEC_DECODE + "e4d.i0rd[4:0]",
+                "e5_i0_rd"     : VEER_DEC_DECODE + "wbd.i0rd[4:0]",
+
+                "e1_i1_rd"     : VEER_DEC_DECODE + "e1d.i1rd[4:0]",
+                "e2_i1_rd"     : VEER_DEC_DECODE + "e2d.i1rd[4:0]",
+                "e3_i1_rd"     : VEER_DEC_DECODE + "e3d.i1rd[4:0]",
+                "e4_i1_rd"     : VEER_DEC_DECODE + "e4d.i1rd[4:0]",
+                "e5_i1_rd"     : VEER_DEC_DECODE + "wbd.i1rd[4:0]",
+
+                "i0_wb_buffer_val_q"   : VEER_DEC_DECODE + "i0_wb_buffer_val_q",
+                "i1_wb_buffer_val_q"   : VEER_DEC_DECODE + "i1_wb_buffer_val_q",
+
+                "i0_rs1_depend_i0_buf" : VEER_DEC_DECODE + "i0_rs1_depend_i0_buf",
+                "i0_rs1_depend_i1_buf" : VEER_DEC_DECODE + "i0_rs1_depend_i1_buf",
+                "i0_rs2_depend_i0_buf" : VEER_DEC_DECODE + "i0_rs2_depend_i0_buf",
+                "i0_rs2_depend_i1_buf" : VEER_DEC_DECODE + "i0_rs2_depend_i1_buf",
+
+                "i1_rs1_depend_i0_buf" : VEER_DEC_DECODE + "i1_rs1_depend_i0_buf",
+                "i1_rs1_depend_i1_buf" : VEER_DEC_DECODE + "i1_rs1_depend_i1_buf",
+                "i1_rs2_depend_i0_buf" : VEER_DEC_DECODE + "i1_rs2_depend_i0_buf",
+                "i1_rs2_depend_i1_buf" : VEER_DEC_DECODE + "i1_rs2_depend_i1_buf",
+            },
+            "EXU" : {
+                # alu types
+                "i0_e1_beq"     : VEER_EXU + "i0_ap_e1.beq",
+                "i0_e1_bge"     : VEER_EXU + "i0_ap_e1.bge",
+                "i0_e1_blt"     : VEER_EXU + "i0_ap_e1.blt",
+                "i0_e1_bne"     : VEER_EXU + "i0_ap_e1.bne",
+                "i0_e1_jal"     : VEER_EXU + "i0_ap_e1.jal",
+
+                "i0_e2_beq"     : VEER_EXU + "i0_ap_e2.beq",
+                "i0_e2_bge"     : VEER_EXU + "i0_ap_e2.bge",
+                "i0_e2_blt"     : VEER_EXU + "i0_ap_e2.blt",
+                "i0_e2_bne"     : VEER_EXU + "i0_ap_e2.bne",
+                "i0_e2_jal"     : VEER_EXU + "i0_ap_e2.jal",
+
+                "i0_e3_beq"     : VEER_EXU + "i0_ap_e3.beq",
+                "i0_e3_bge"     : VEER_EXU + "i0_ap_e3.bge",
+                "i0_e3_blt"     : VEER_EXU + "i0_ap_e3.blt",
+                "i0_e3_bne"     : VEER_EXU + "i0_ap_e3.bne",
+                "i0_e3_jal"     : VEER_EXU + "i0_ap_e3.jal",
+
+                "i0_e4_beq"     : VEER_EXU + "i0_ap_e4.beq",
+                "i0_e4_bge"     : VEER_EXU + "i0_ap_e4.bge",
+                "i0_e4_blt"     : VEER_EXU + "i0_ap_e4.blt",
+                "i0_e4_bne"     : VEER_EXU + "i0_ap_e4.bne",
+                "i0_e4_jal"     : VEER_EXU + "i0_ap_e4.jal",
+
+                "i1_e1_beq"     : VEER_EXU + "i1_ap_e1.beq",
+                "i1_e1_bge"     : VEER_EXU + "i1_ap_e1.bge",
+                "i1_e1_blt"     : VEER_EXU + "i1_ap_e1.blt",
+                "i1_e1_bne"     : VEER_EXU + "i1_ap_e1.bne",
+                "i1_e1_jal"     : VEER_EXU + "i1_ap_e1.jal",
+
+                "i1_e2_beq"     : VEER_EXU + "i1_ap_e2.beq",
+                "i1_e2_bge"     : VEER_EXU + "i1_ap_e2.bge",
+                "i1_e2_blt"     : VEER_EXU + "i1_ap_e2.blt",
+                "i1_e2_bne"     : VEER_EXU + "i1_ap_e2.bne",
+                "i1_e2_jal"     : VEER_EXU + "i1_ap_e2.jal",
+
+                "i1_e3_beq"     : VEER_EXU + "i1_ap_e3.beq",
+                "i1_e3_bge"     : VEER_EXU + "i1_ap_e3.bge",
+                "i1_e3_blt"     : VEER_EXU + "i1_ap_e3.blt",
+                "i1_e3_bne"     : VEER_EXU + "i1_ap_e3.bne",
+                "i1_e3_jal"     : VEER_EXU + "i1_ap_e3.jal",
+
+                "i1_e4_beq"     : VEER_EXU + "i1_ap_e4.beq",
+                "i1_e4_bge"     : VEER_EXU + "i1_ap_e4.bge",
+                "i1_e4_blt"     : VEER_EXU + "i1_ap_e4.blt",
+                "i1_e4_bne"     : VEER_EXU + "i1_ap_e4.bne",
+                "i1_e4_jal"     : VEER_EXU + "i1_ap_e4.jal",
+            },
+            "LSU" : {
+                "dc1_valid"     : VEER_LSU_CTL + "lsu_pkt_dc1.valid",
+                "dc2_valid"     : VEER_LSU_CTL + "lsu_pkt_dc2.valid",
+                "dc3_valid"     : VEER_LSU_CTL + "lsu_pkt_dc3.valid",
+                "dc4_valid"     : VEER_LSU_CTL + "lsu_pkt_dc4.valid",
+                "dc5_valid"     : VEER_LSU_CTL + "lsu_pkt_dc5.valid",
+
+                "dc1_ldst_bypass"                 : VEER_LSU_CTL + "lsu_pkt_dc1.load_ldst_bypass_c1",
+                "dc1_store_data_bypass_c1"        : VEER_LSU_CTL + "lsu_pkt_dc1.store_data_bypass_c1",
+                "dc2_store_data_bypass_c2"        : VEER_LSU_CTL + "lsu_pkt_dc2.store_data_bypass_c2",
+                "dc2_store_data_bypass_i0_e2_c2"  : VEER_LSU_CTL + "lsu_pkt_dc2.store_data_bypass_i0_e2_c2",
+                "dc1_store_data_bypass_e4_c1"     : VEER_LSU_CTL + "lsu_pkt_dc1.store_data_bypass_e4_c1[1:0]",
+                "dc2_store_data_bypass_e4_c2"     : VEER_LSU_CTL + "lsu_pkt_dc2.store_data_bypass_e4_c2[1:0]",
+                "dc3_store_data_bypass_e4_c3"     : VEER_LSU_CTL + "lsu_pkt_dc3.store_data_bypass_e4_c3[1:0]",
+            },
+            "MUL" : {
+                "valid_e1"               : VEER_EXU + "mul_e1.valid_e1",
+                "valid_e2"               : VEER_EXU + "mul_e1.valid_e2",
+                "valid_e3"               : VEER_EXU + "mul_e1.valid_e3",
+            },
+            "TLU" : {
+                "faultless"     : VEER_TLU + "faultless[1:0]",
+            },
+        }
+        self.signals = {key: signal for group in self.signal_groups.values() for key, signal in group.items()}
+
+    # reader(references) makes a reader whose read(*args) returns {reference: SignalTrack}
+    # of these references, not used if the cache is valid. With groups, the dump is
+    # first read for the signals of these groups only: the values of the other
+    # signals are not parsed (for FST, their handles are not decoded). The remaining
+    # groups stay pending (their keys read as 0 and frames list them in
+    # CycleFrame.pending) until a background thread has read them, built the store
+    # of all signals and saved the cache
+    def _loadTracks(self, file, reader, use_cache, cache_dir, *args, groups=None):
+        cache = TraceCache(file, self.signals.values(), cache_dir) if use_cache else None
+        loaded = cache.load() if cache else None
+        if loaded:
+            tracks, store, meta = loaded
+            self.timescale = meta["timescale"]
+            self._setTracks(tracks, store)
+            return
+
+        if groups is not None:
+            # the clock sets the final time, so it is always part of the first read
+            self.pending_groups = [group for group in self.signal_groups if group not in groups and group != "CLK"]
+        first = reader(self._groupSignals(group for group in self.signal_groups if group not in self.pending_groups))
+        tracks = first.read(*args)
+        self.timescale = first.timescale
+        self._setTracks(tracks, SignalStore.fromTracks(tracks.values()))
+        if self.pending_groups:
+            rest = reader(self._groupSignals(self.pending_groups))
+            self._loader = threading.Thread(target=self._loadPending, args=(tracks, rest, args, cache), daemon=True)
+            self._loader.start()
+        elif cache:
+            cache.save(self.tracks, self.store, {"timescale": self.timescale})
+
+    # The tracks already in use are refrozen into the new store's columns with the
+    # same contents, so readers holding either see the same values
+    def _loadPending(self, tracks, reader, args, cache):
+        try:
+            tracks = dict(tracks)
+            tracks.update(reader.read(*args))
+            store = SignalStore.fromTracks(tracks.values())
+        except Exception as error:
+            self._load_error = error
+            return
+        with self._lock:
+            self.pending_groups = []
+            self._setTracks(tracks, store)
+        if cache:
+            cache.save(self.tracks, self.store, {"timescale": self.timescale})
+
+    def _groupSignals(self, groups):
+        return [signal for group in groups for signal in self.signal_groups[group].values()]
+
+    def _setTracks(self, tracks, store):
+        self.generation += 1
+        self.tracks = tracks
+        self.store = store
+        self.clk_signal = self.tracks[VEER_TOP + "clk"]
+        self.final_time = int(self.clk_signal.times[-1])
+        self._setEdges(_risingEdges(self.clk_signal))
+
+        # store column of every key, so a whole cycle is fetched with one lookup
+        self.loaded_keys = [key for key in self.signals if self.signals[key] in self.tracks]
+        self.key_columns = np.array([self.store.trackIndex(self.tracks[self.signals[key]]) for key in self.loaded_keys], dtype=np.int64)
+        self.wide_keys = [key for key in self.loaded_keys if self.tracks[self.signals[key]].words > 1]
+        self.pending_keys = [key for group in self.pending_groups for key in self.signal_groups[group]]
+
+    def _setEdges(self, edges):
+        if not len(edges):
+            raise ValueError("{} never rises".format(VEER_TOP + "clk"))
+        self.edges = edges
+        self.final_cycle = len(edges) - 1
+
+    # time cycle is sampled at
+    def cycleTime(self, cycle):
+        return int(self.edges[cycle])
+
+    # cycle sampled last at or before time, 0 before the first rising edge
+    def cycleAt(self, time):
+        return max(int(np.searchsorted(self.edges, time, side="right")) - 1, 0)
+
+    def isLoading(self):
+        return self._loader is not None and self._loader.is_alive()
+
+    # blocks until the signals of the given groups are available, raises what
+    # stopped the background read if they never will be
+    def requireGroups(self, groups):
+        if self.isLoading() and any(group in self.pending_groups for group in groups):
+            self._loader.join()
+        if self._load_error is not None and any(group in self.pending_groups for group in groups):
+            raise self._load_error
+
+    def hasSignal(self, signal_name):
+        return signal_name in self.tracks
+
+    # EventIndex of one of EVENT_TYPES, built on first use
+    def getEventIndex(self, event):
+        keys, zero = EVENT_TYPES[event]
+        build = lambda tracks: EventIndex.fromTracks([track for track in tracks if track is not None], zero, self.edges)
+        return self._cachedIndex(self._events, event, keys, build)
+
+    # EventIndex of the cycles a SignalCondition holds, cached by its text
+    def getConditionIndex(self, condition):
+        build = lambda tracks: condition.index(tracks, self.edges)
+        return self._cachedIndex(self._conditions, condition.text, condition.keys, build)
+
+    # (cycles, values) of a SignalCondition's expression at the change points of
+    # its signals, a change counting from the first cycle sampled at or after it
+    def getConditionChanges(self, condition):
+        self._requireKeys(condition.keys)
+        with self._lock:
+            times, values = condition.changes(self._searchTracks(condition.keys))
+        return np.searchsorted(self.edges, times, side="left"), values
+
+    # RetireIndex of the whole run, built on first use
+    def getRetireIndex(self):
+        self._requireKeys(RETIRE_KEYS)
+        generation = self.generation
+        if self._retire is None or self._retire[0] != generation:
+            self._retire = (generation, RetireIndex.fromSource(self))
+        return self._retire[1]
+
+    # GPRWriteIndex of the whole run, built on first use
+    def getGPRWriteIndex(self):
+        self._requireKeys(GPR_WRITE_KEYS)
+        generation = self.generation
+        if self._gpr_writes is None or self._gpr_writes[0] != generation:
+            self._gpr_writes = (generation, GPRWriteIndex.fromSource(self))
+        return self._gpr_writes[1]
+
+    def _cachedIndex(self, cache, name, keys, build):
+        self._requireKeys(keys)
+        with self._lock:
+            cached = cache.get(name)
+            if cached is None or cached[0] != self.generation:
+                cached = cache[name] = (self.generation, build(self._searchTracks(keys)))
+        return cached[1]
+
+    # tracks of the given keys for the event and condition indexes, None for
+    # signals missing from the dump. Called with the lock held
+    def _searchTracks(self, keys):
+        return [self.tracks[self.signals[key]] if key in self.loaded_keys else None for key in keys]
+
+    def _requireKeys(self, keys):
+        self.requireGroups([group for group in self.signal_groups if any(key in self.signal_groups[group] for key in keys)])
+
+    # values of a key at many cycles at once, 0 if the signal is missing from the dump
+    def sampleKey(self, key, cycles):
+        self._requireKeys([key])
+        with self._lock:
+            track = self._searchTracks([key])[0]
+        if track is None:
+            return np.zeros(len(cycles), dtype=np.int64)
+        times, values = _trackChanges(track)
+        return values[np.searchsorted(times, self.edges[cycles], side="right") - 1]
+
+    # values of keys over the cycles first..last (the whole trace by default),
+    # yielded chunk cycles at a time as (cycles, rows) with one int64 column per key
+    def iterColumns(self, keys, first=None, last=None, chunk=VCD_COLUMN_CHUNK):
+        first, last = _cycleWindow(self, first, last)
+        self._requireKeys(keys)
+        with self._lock:
+            changes = [_trackChanges(track) if track is not None else None for track in self._searchTracks(keys)]
+        for start in range(first, last + 1, chunk):
+            cycles = np.arange(start, min(start + chunk, last + 1), dtype=np.int64)
+            rows = np.zeros((len(cycles), len(keys)), dtype=np.int64)
+            for column, change in enumerate(changes):
+                if change is not None:
+                    rows[:, column] = change[1][np.searchsorted(change[0], self.edges[cycles], side="right") - 1]
+            yield cycles, rows
+
+    def nextEvent(self, event, cycle=None):
+        return self.getEventIndex(event).next(self.cycle if cycle is None else cycle)
+
+    def previousEvent(self, event, cycle=None):
+        return self.getEventIndex(event).previous(self.cycle if cycle is None else cycle)
+
+    def nextMatch(self, condition, cycle=None):
+        return self.getConditionIndex(condition).nextActive(self.cycle if cycle is None else cycle)
+
+    def previousMatch(self, condition, cycle=None):
+        return self.getConditionIndex(condition).previousActive(self.cycle if cycle is None else cycle)
+
+    def getSignalValue(self, signal_name, time):
+        with self._lock:
+            return self.tracks[signal_name][time]
+
+    def getSignals(self):
+        return self.signals
+
+    # frame/values of the given cycle, the current one by default
+    def getFrame(self, cycle=None):
+        cycle = self.cycle if cycle is None else cycle
+        # taken before the values, so a frame decoded while loading ends is marked pending rather than not
+        pending = tuple(self.pending_groups)
+        return CycleFrame(self.getValueDict(cycle), self.cycleTime(cycle), pending)
+
+    def getValueDict(self, cycle=None):
+        time = self.cycleTime(self.cycle if cycle is None else cycle)
+        with self._lock:
+            row = self.store.valuesAt(time)[self.key_columns].tolist()
+            values = dict(zip(self.loaded_keys, row))
+            for key in self.wide_keys:
+                values[key] = self.tracks[self.signals[key]][time]
+            for key in self.pending_keys:
+                values[key] = 0
+        return values
+
+    # releases what the backend holds open on the dump
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ===[ VCD Handler Class ]=================================
+class VCDHandler(WaveformSource):
+    def __init__(self, file, use_cache=True, cache_dir=None, indexed=None, index_interval=VCD_INDEX_INTERVAL, workers=1, groups=None):
+        WaveformSource.__init__(self)
+        # the index and parallel parsing need random access into the dump
+        if isCompressed(file):
+            if indexed:
+                raise ValueError("{}: compressed dumps cannot be indexed".format(file))
+            indexed = False
+        if indexed is None:
+            indexed = os.path.getsize(file) > VCD_INDEX_THRESHOLD
+        if indexed:
+            self._loadIndex(file, index_interval)
+        else:
+            self._loadTracks(file, partial(VCDStreamReader, file), use_cache, cache_dir, workers, groups=groups)
+
+    def _loadIndex(self, file, interval):
+        self.index = CheckpointIndex(file, self.signals.values(), VEER_TOP + "clk", interval)
+        # only the signals extracted for event and condition lookups
+        self.tracks = {}
+        self.timescale = self.index.timescale
+        self.final_time = self.index.end_time
+        self._setEdges(self.index.edges)
+        self.loaded_keys = [key for key in self.signals if self.signals[key] in self.index.slots]
+        self.key_slots = [self.index.slots[self.signals[key]] for key in self.loaded_keys]
+
+    def hasSignal(self, signal_name):
+        if self.index:
+            return signal_name in self.index.slots
+        return WaveformSource.hasSignal(self, signal_name)
+
+    def close(self):
+        if self.index:
+            self.index.close()
+
+    def getSignalValue(self, signal_name, time):
+        if self.index:
+            with self._lock:
+                return self.index.valueAt(signal_name, time)
+        return WaveformSource.getSignalValue(self, signal_name, time)
+
+    # with the checkpoint index, the signals of event and condition lookups are
+    # extracted by an extra pass over the dump when first needed. The first pass
+    # takes the few signals of all events along
+    def _searchTracks(self, keys):
+        if not self.index:
+            return WaveformSource._searchTracks(self, keys)
+        references = [self.signals[key] for key in keys]
+        if not self.tracks:
+            references += [self.signals[key] for keys, _ in EVENT_TYPES.values() for key in keys]
+        missing = [reference for reference in set(references) if reference in self.index.slots and reference not in self.tracks]
+        if missing:
+            tracks = VCDStreamReader(self.index.file, missing).read()
+            _freezeTracks(tracks.values())
+            self.tracks.update(tracks)
+        return [self.tracks.get(self.signals[key]) for key in keys]
+
+    # with the checkpoint index, the columns are replayed from the dump cycle by
+    # cycle rather than extracted, so memory stays bounded however long the run
+    def iterColumns(self, keys, first=None, last=None, chunk=VCD_COLUMN_CHUNK):
+        if not self.index:
+            return WaveformSource.iterColumns(self, keys, first, last, chunk)
+        return self._replayColumns(keys, first, last, chunk)
+
+    def _replayColumns(self, keys, first, last, chunk):
+        first, last = _cycleWindow(self, first, last)
+        slots = [self.index.slots.get(self.signals[key]) for key in keys]
+        for start in range(first, last + 1, chunk):
+            cycles = np.arange(start, min(start + chunk, last + 1), dtype=np.int64)
+            rows = np.zeros((len(cycles), len(keys)), dtype=np.int64)
+            with self._lock:
+                for i, time in enumerate(self.edges[cycles].tolist()):
+                    state = self.index.stateAt(time)
+                    rows[i] = [state[slot] & 0x7FFFFFFFFFFFFFFF if slot is not None else 0 for slot in slots]
+            yield cycles, rows
+
+    def getValueDict(self, cycle=None):
+        if self.index:
+            time = self.cycleTime(self.cycle if cycle is None else cycle)
+            with self._lock:
+                state = self.index.stateAt(time)
+                return {key: state[slot] for key, slot in zip(self.loaded_keys, self.key_slots)}
+        return WaveformSource.getValueDict(self, cycle)
+
+# ===[ FST Handler Class ]=================================
+class FSTHandler(WaveformSource):
+    # workers is taken for the same options as VCDHandler, the blocks are read serially
+    def __init__(self, file, use_cache=True, cache_dir=None, workers=1, groups=None):
+        WaveformSource.__init__(self)
+        self._loadTracks(file, partial(FSTReader, file), use_cache, cache_dir, groups=groups)
+
+WAVEFORM_BACKENDS = {".vcd": VCDHandler, ".fst": FSTHandler}
+
+# picks the backend by file extension, VCD for anything unknown
+def openWaveform(file, **options):
+    backend = WAVEFORM_BACKENDS.get(os.path.splitext(file)[1].lower(), VCDHandler)
+    return backend(file, **options)
+
+# ===[ Decoded Cycle Frame ]===============================
+STAGE_CLASSES = ("Other", "ALU", "SEC", "BEQ", "BGE", "BLT", "BNE", "JAL", "LOAD", "MUL")
+STAGE_BRANCHES = ("beq", "bge", "blt", "bne", "jal")
+
+# pipeline state of one cycle, decoded once from the raw signal values.
+# Per-pipe/per-stage fields are indexed [pipe][stage] with pipe 0/1 = i0/i1
+# and stage 0..4 = E1..E5, PCs are byte addresses
+class CycleFrame():
+    def __init__(self, values, time, pending=()):
+        self.time = time
+        # signal groups still loading, their fields read as 0
+        self.pending = pending
+        v = values
+
+        self.ifu_pc = [v["ifu_i0_pc"] << 1, v["ifu_i1_pc"] << 1]
+
+        # instruction buffer
+        ibval = v["ibval"]
+        wen_i0 = v["i0_wen_shifted"]
+        wen_i1 = v["i1_wen_shifted"] << 1
+        self.ib_valid   = [bool((ibval >> i) & 1) for i in range(4)]
+        self.ib_copy    = [bool(v["ic{}".format(i)]) for i in range(4)]
+        self.ib_write   = [[bool((wen_i0 >> i) & 1) for i in range(4)], [bool((wen_i1 >> i) & 1) for i in range(4)]]
+        self.ib_pc      = [v["dec_i0_pc_d"] << 1, v["dec_i1_pc_d"] << 1, v["pc2"] & ~1, v["pc3"] & ~1]
+
+        # decode
+        self.decode     = [bool(v["dec_i0_decode_d"]), bool(v["dec_i1_decode_d"])]
+        self.rs_bypass  = [[v["i0_rs1bypass"], v["i0_rs2bypass"]], [v["i1_rs1bypass"], v["i1_rs2bypass"]]]
+        # GPR index read by [pipe][rs1/rs2], 0 if the operand is bypassed or unused
+        self.gpr_read   = [[0, 0], [0, 0]]
+        for p in range(2):
+            if self.decode[p]:
+                for r in range(2):
+                    name = "i{}_rs{}".format(p, r+1)
+                    if not v[name + "_bypass_en"] and v[name + "_en_d"]:
+                        self.gpr_read[p][r] = v[name]
+
+        # execution stages
+        self.stage_valid = [[bool(v["e{}d.i{}valid".format(s+1, p)]) for s in range(5)] for p in range(2)]
+        self.stage_copy  = [[bool(v["i{}_e{}_copy".format(p, s+1)]) and self.stage_valid[p][s] for s in range(5)] for p in range(2)]
+        self.stage_pc    = [[v["i{}_pc_e{}".format(p, s+1)] << 1 for s in range(5)] for p in range(2)]
+        self.stage_rd    = [[v["e{}_i{}_rd".format(s+1, p)] for s in range(5)] for p in range(2)]
+        self.stage_class = [[self._decodeStageClass(v, "e{}".format(s+1), "i{}".format(p)) for s in range(5)] for p in range(2)]
+
+        self.wb_buffer_valid = [bool(v["i0_wb_buffer_val_q"]), bool(v["i1_wb_buffer_val_q"])]
+        self.wb_buffer_rs1   = [bool(v["i0_rs1_depend_i{}_buf".format(b)] or v["i1_rs1_depend_i{}_buf".format(b)]) for b in range(2)]
+        self.wb_buffer_rs2   = [bool(v["i0_rs2_depend_i{}_buf".format(b)] or v["i1_rs2_depend_i{}_buf".format(b)]) for b in range(2)]
+
+        # E2/E3 bypass selects [pipe][rs1/rs2], the i1 E3 selects only count for a valid instruction
+        self.bype2 = [[v["e2d.i{}rs{}bype2".format(p, r+1)] for r in range(2)] for p in range(2)]
+        self.bype3 = [[v["e3d.i0rs1bype3"], v["e3d.i0rs2bype3"]], [0, 0]]
+        if v["e3d.i1valid"]:
+            self.bype3[1] = [v["e3d.i1rs1bype3"], v["e3d.i1rs2bype3"]]
+
+        # LSU / MUL
+        self.lsu_valid = [bool(v["dc{}_valid".format(i+1)]) for i in range(5)]
+        self.mul_valid = [bool(v["valid_e{}".format(i+1)]) for i in range(3)]
+        self.load_mul_bypass = [bool(v["load_mul_rs1_bypass_e1"]), bool(v["load_mul_rs2_bypass_e1"])]
+        self.dc3_dc2_rs1 = bool(v["dc1_ldst_bypass"]) and self.lsu_valid[0]
+        self.dc3_dc2_rs2 = bool(v["dc1_store_data_bypass_c1"]) and self.lsu_valid[0]
+        self.dc3_dc3     = bool(v["dc2_store_data_bypass_c2"]) and self.lsu_valid[1]
+        self.e2_dc3      = bool(v["dc2_store_data_bypass_i0_e2_c2"]) and self.lsu_valid[1]
+        self.e4_dc       = [bool(v["dc{}_store_data_bypass_e4_c{}".format(i+1, i+1)]) and self.lsu_valid[i] for i in range(3)]
+
+        # control
+        self.freeze         = bool(v["freeze"])
+        self.flush_final_e3 = bool(v["flush_final_e3"])
+        self.flush_lower_wb = bool(v["flush_lower_wb"])
+        self.nonblock_load_wen = bool(v["nonblock_load_wen"])
+        self.faultless      = bool(v["faultless"])
+
+        # GPRs, gpr_write[pipe] is the register written back by that pipe (0 = none)
+        self.gpr = [0] + [v["x{}".format(i)] for i in range(1, 32)]
+        self.gpr_write = [0, 0]
+        for p in range(2):
+            rd = v["e5_i{}_rd".format(p)]
+            if v["i{}_wen_wb".format(p)] and rd and v["x{}_en".format(rd)]:
+                self.gpr_write[p] = rd
+
+    def _decodeStageClass(self, values, stage, pipe):
+        if not values[stage + "d." + pipe + "valid"]:
+            return 0
+        alu = values["{}_{}c.alu".format(pipe, stage)]
+        if alu or values["{}_{}c.sec".format(pipe, stage)]:
+            if (stage != "e5"):
+                for i, branch in enumerate(STAGE_BRANCHES):
+                    if values["{}_{}_{}".format(pipe, stage, branch)]:
+                        return STAGE_CLASSES.index("BEQ") + i
+            return STAGE_CLASSES.index("ALU") if alu else STAGE_CLASSES.index("SEC")
+        if values["{}_{}c.load".format(pipe, stage)]:
+            return STAGE_CLASSES.index("LOAD")
+        if values["{}_{}c.mul".format(pipe, stage)]:
+            return STAGE_CLASSES.index("MUL")
+        return 0
+
+# ===[ Event Index ]=======================================
+# event: (keys of the signals, True if the event is them being 0 rather than non-zero).
+# Several keys count as one event while any of them is active
+EVENT_TYPES = {
+    "flush"         : (("flush_final_e3", "flush_lower_wb"), False),
+    "freeze"        : (("freeze",), False),
+    "stall"         : (("dec_i0_decode_d",), True),
+    "bypass"        : (("e2d.i0rs1bype2", "e2d.i0rs2bype2", "e2d.i1rs1bype2", "e2d.i1rs2bype2",
+                        "e3d.i0rs1bype3", "e3d.i0rs2bype3", "e3d.i1rs1bype3", "e3d.i1rs2bype3"), False),
+    "nonblock_load" : (("nonblock_load_wen",), False),
+    "lsu_bypass"    : (("dc1_ldst_bypass", "dc1_store_data_bypass_c1", "dc2_store_data_bypass_c2", "dc2_store_data_bypass_i0_e2_c2",
+                        "dc1_store_data_bypass_e4_c1", "dc2_store_data_bypass_e4_c2", "dc3_store_data_bypass_e4_c3"), False),
+}
+
+# change times and values of a track as int64 arrays, starting with the 0 the
+# signal reads before its first change. Wide signals keep their low 64 bits
+def _trackChanges(track):
+    values = track.values if track.words == 1 else [value & 0xFFFFFFFFFFFFFFFF for value in track.values]
+    times  = np.asarray(track.times, dtype=np.int64)
+    values = np.asarray(values, dtype=np.uint64).astype(np.int64)
+    if not len(times) or times[0] > 0:
+        times  = np.concatenate((np.zeros(1, dtype=np.int64), times))
+        values = np.concatenate((np.zeros(1, dtype=np.int64), values))
+    return times, values
+
+# times a clock track rises at, from 0 (or x) to 1
+def _risingEdges(track):
+    times, values = _trackChanges(track)
+    rising = values != 0
+    rising[1:] &= values[:-1] == 0
+    return times[rising]
+
+# sorted first and last cycle of every stretch an event is active, built from
+# the change arrays of its tracks; lookups are a single searchsorted
+class EventIndex():
+    def __init__(self, starts, ends):
+        self.starts = starts
+        self.ends   = ends
+
+    @classmethod
+    def fromTracks(cls, tracks, zero, edges):
+        changes = [_trackChanges(track) for track in tracks]
+        actives = [(values == 0) if zero else (values != 0) for _, values in changes]
+        return cls.fromChanges([times for times, _ in changes], actives, edges)
+
+    # from the change times of any number of signals and whether the event is
+    # active from each change until the next one, sampled at the clock edges
+    @classmethod
+    def fromChanges(cls, times_list, active_list, edges):
+        lows, highs = [], []
+        for times, active in zip(times_list, active_list):
+            # first and last cycle whose edge is within [times, next change)
+            low  = np.searchsorted(edges, times, side="left")
+            high = np.append(np.searchsorted(edges, times[1:], side="left"), len(edges)) - 1
+            keep = active & (low <= high)
+            lows.append(low[keep])
+            highs.append(high[keep])
+        low  = np.concatenate(lows) if lows else np.zeros(0, dtype=np.int64)
+        high = np.concatenate(highs) if highs else np.zeros(0, dtype=np.int64)
+        return cls._merged(low, high)
+
+    # stretches active in any of the indexes
+    @classmethod
+    def union(cls, indexes):
+        if not indexes:
+            return cls(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        return cls._merged(np.concatenate([index.starts for index in indexes]), np.concatenate([index.ends for index in indexes]))
+
+    @classmethod
+    def _merged(cls, low, high):
+        order = np.argsort(low, kind="stable")
+        low, high = low[order], high[order]
+
+        # merge stretches that overlap or follow each other without a gap
+        reach = np.maximum.accumulate(high) if len(high) else high
+        begin = np.ones(len(low), dtype=bool)
+        begin[1:] = low[1:] > reach[:-1] + 1
+        last = np.append(np.flatnonzero(begin)[1:] - 1, len(low) - 1) if len(low) else np.zeros(0, dtype=np.int64)
+        return cls(low[begin], reach[last])
+
+    def __len__(self):
+        return len(self.starts)
+
+    # first cycle of the next event starting after cycle, None if there is none
+    def next(self, cycle):
+        i = int(np.searchsorted(self.starts, cycle, side="right"))
+        return int(self.starts[i]) if i < len(self.starts) else None
+
+    # first cycle of the last event starting before cycle
+    def previous(self, cycle):
+        i = int(np.searchsorted(self.starts, cycle, side="left")) - 1
+        return int(self.starts[i]) if i >= 0 else None
+
+    def active(self, cycle):
+        i = int(np.searchsorted(self.starts, cycle, side="right")) - 1
+        return i >= 0 and self.ends[i] >= cycle
+
+    # number of cycles inside the stretches, and the cycles themselves.
+    # first/last limit the count to a window of cycles
+    def count(self, first=None, last=None):
+        starts = self.starts if first is None else np.maximum(self.starts, first)
+        ends   = self.ends if last is None else np.minimum(self.ends, last)
+        return int(np.maximum(ends - starts + 1, 0).sum())
+
+    def cycles(self):
+        counts = self.ends - self.starts + 1
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(self.starts, counts) + offsets
+
+    # next/previous cycle inside any stretch, None if there is none
+    def nextActive(self, cycle):
+        i = int(np.searchsorted(self.ends, cycle, side="right"))
+        return max(int(self.starts[i]), cycle + 1) if i < len(self.starts) else None
+
+    def previousActive(self, cycle):
+        i = int(np.searchsorted(self.starts, cycle, side="left")) - 1
+        return min(int(self.ends[i]), cycle - 1) if i >= 0 else None
+
+# ===[ Condition Search ]==================================
+# A search query: a PC, a disassembly symbol or a boolean expression over the
+# signal keys, e.g. "e4d.i0valid and i0_e4_beq". PCs and symbols match the cycles
+# an instruction at that address is decoded. Expressions are evaluated on whole
+# columns, once per change point of their signals
+class SignalCondition():
+    BINARY = {
+        ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.FloorDiv: np.floor_divide, ast.Mod: np.mod,
+        ast.BitAnd: np.bitwise_and, ast.BitOr: np.bitwise_or, ast.BitXor: np.bitwise_xor,
+        ast.LShift: np.left_shift, ast.RShift: np.right_shift,
+    }
+    COMPARE = {
+        ast.Eq: np.equal, ast.NotEq: np.not_equal, ast.Lt: np.less, ast.LtE: np.less_equal,
+        ast.Gt: np.greater, ast.GtE: np.greater_equal,
+    }
+
+    def __init__(self, text, keys):
+        self.text = text
+        # keys referenced by the expression, each replaced by a placeholder _<n>
+        # since keys like "e4d.i0valid" are not Python names
+        self.keys = []
+        def placeholder(match):
+            word = match.group()
+            if word in ("and", "or", "not"):
+                return word
+            if word not in keys:
+                raise ValueError("Unknown signal: " + word)
+            if word not in self.keys:
+                self.keys.append(word)
+            return "_{}".format(self.keys.index(word))
+        source = re.sub(r"(?<![\w.])[A-Za-z_][\w.]*", placeholder, text.strip())
+        try:
+            self._tree = ast.parse(source, mode="eval").body
+        except SyntaxError:
+            raise ValueError("Invalid expression: " + text)
+        # rejects unsupported syntax right away rather than on first search
+        self._evaluate(self._tree, [np.zeros(1, dtype=np.int64)] * len(self.keys))
+
+    # a PC written 0x... and a word naming a symbol of the disassembly (see queryPC)
+    # are searched as PCs, anything else as an expression. A hex word that is
+    # neither would be a constant, it is rejected as a PC missing its 0x
+    @classmethod
+    def fromQuery(cls, query, keys, disassembly=None):
+        query = query.strip()
+        if query not in keys:
+            pc = queryPC(query, disassembly) if re.fullmatch(DISASSEMBLY_SYMBOL, query) else None
+            if pc is not None:
+                return cls.fromPC(pc, keys)
+            if re.fullmatch("[0-9a-fA-F]+", query):
+                raise ValueError("Not a signal or symbol: {0}, PCs are written 0x{0}".format(query))
+        return cls(query, keys)
+
+    @classmethod
+    def fromPC(cls, pc, keys):
+        # the decode PCs hold bits [31:1]
+        return cls("(dec_i0_decode_d and dec_i0_pc_d == {0}) or (dec_i1_decode_d and dec_i1_pc_d == {0})".format(pc >> 1), keys)
+
+    # EventIndex of the stretches the condition holds, tracks given in the order
+    # of self.keys, None for a signal missing from the dump (reads as 0)
+    def index(self, tracks, edges):
+        times, values = self.changes(tracks)
+        return EventIndex.fromChanges([times], [values != 0], edges)
+
+    # value of the expression at every change point of its signals, as (times, values)
+    def changes(self, tracks):
+        changes = [_trackChanges(track) if track is not None else None for track in tracks]
+        times = np.unique(np.concatenate([np.zeros(1, dtype=np.int64)] + [change[0] for change in changes if change is not None]))
+        columns = []
+        for change in changes:
+            if change is None:
+                columns.append(np.zeros(len(times), dtype=np.int64))
+            else:
+                columns.append(change[1][np.searchsorted(change[0], times, side="right") - 1])
+        with np.errstate(all="ignore"):
+            values = np.broadcast_to(self._evaluate(self._tree, columns), times.shape)
+        return times, values
+
+    def _evaluate(self, node, columns):
+        if isinstance(node, ast.Name):
+            return columns[int(node.id[1:])]
+        if isinstance(node, ast.Constant) and isinstance(node.value, int):
+            return np.int64(node.value)
+        if isinstance(node, ast.BoolOp):
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return reduce(combine, [self._evaluate(value, columns) != 0 for value in node.values]).astype(np.int64)
+        if isinstance(node, ast.UnaryOp):
+            operand = self._evaluate(node.operand, columns)
+            if isinstance(node.op, ast.Not):
+                return (operand == 0).astype(np.int64)
+            if isinstance(node.op, ast.Invert):
+                return np.invert(operand)
+            if isinstance(node.op, ast.USub):
+                return np.negative(operand)
+        if isinstance(node, ast.BinOp) and type(node.op) in self.BINARY:
+            return self.BINARY[type(node.op)](self._evaluate(node.left, columns), self._evaluate(node.right, columns))
+        if isinstance(node, ast.Compare) and all(type(op) in self.COMPARE for op in node.ops):
+            left = self._evaluate(node.left, columns)
+            result = True
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._evaluate(comparator, columns)
+                result = np.logical_and(result, self.COMPARE[type(op)](left, right))
+                left = right
+            return np.asarray(result).astype(np.int64)
+        raise ValueError("Unsupported expression: " + self.text)
+
+# PC a query names, an address written 0x... or a symbol of the disassembly, None if
+# it names neither. Raises ValueError while the disassembly is still loading rather
+# than waiting for it on the caller's thread, unless the query is an address
+def queryPC(query, disassembly=None):
+    if re.fullmatch("0x[0-9a-fA-F]+", query):
+        return int(query, 16)
+    if disassembly is None:
+        return None
+    if disassembly.isLoading():
+        raise ValueError("Disassembly is still loading")
+    return disassembly.symbols.get(query)
+
+# ===[ Pipeline Statistics ]===============================
+# statistic: condition counted over the sampled cycles. An instruction retires
+# when it is valid in E5 (writeback) while the pipeline is not frozen
+PIPELINE_CONDITIONS = {
+    "i0_retired"     : "e5d.i0valid and not freeze",
+    "i1_retired"     : "e5d.i1valid and not freeze",
+    "i0_decode_low"  : "not dec_i0_decode_d",
+    "i1_decode_low"  : "not dec_i1_decode_d",
+    "freeze"         : "freeze",
+    "flush_final_e3" : "flush_final_e3",
+    "flush_lower_wb" : "flush_lower_wb",
+    "dc1_valid"      : "dc1_valid",
+    "dc2_valid"      : "dc2_valid",
+    "dc3_valid"      : "dc3_valid",
+    "dc4_valid"      : "dc4_valid",
+    "dc5_valid"      : "dc5_valid",
+}
+
+# forwarding path drawn in the scene: condition under which it is used in a
+# cycle, decoded like CycleFrame does for the arrows
+def _bypassPaths():
+    paths = {}
+    for p in range(2):
+        for r in range(1, 3):
+            # decode bypass, bit 9-i selects the i0 (odd i) or i1 (even i) stage i/2
+            for i in range(10):
+                paths["i{}_rs{}_from_i{}_e{}".format(p, r, 0 if i % 2 else 1, i // 2 + 1)] = "dec_i{}_decode_d and (i{}_rs{}bypass >> {}) & 1".format(p, p, r, 9 - i)
+            # E2 bypass into E3, bit 0/1 from the i0/i1 WB
+            for b in range(2):
+                paths["i{}_e3_rs{}_from_i{}_wb".format(p, r, b)] = "(e2d.i{}rs{}bype2 >> {}) & 1".format(p, r, b)
+            # E3 bypass into E4, the i1 selects only count for a valid instruction
+            valid = "e3d.i1valid and " if p else ""
+            for b, source in enumerate(("i0_wb", "i1_wb", "i0_e4", "i1_e4")):
+                paths["i{}_e4_rs{}_from_{}".format(p, r, source)] = valid + "(e3d.i{}rs{}bype3 >> {}) & 1".format(p, r, b)
+    for r in range(1, 3):
+        paths["i1_e4_rs{}_intra".format(r)] = "e3d.i1valid and (e3d.i1rs{}bype3 >> 4) & 7".format(r)
+    paths.update({
+        "dc3_m2_rs1"  : "load_mul_rs1_bypass_e1",
+        "dc3_m2_rs2"  : "load_mul_rs2_bypass_e1",
+        "dc3_dc2_rs1" : "dc1_valid and dc1_ldst_bypass",
+        "dc3_dc2_rs2" : "dc1_valid and dc1_store_data_bypass_c1",
+        "dc3_dc3"     : "dc2_valid and dc2_store_data_bypass_c2",
+        "e2_dc3"      : "dc2_valid and dc2_store_data_bypass_i0_e2_c2",
+        "e4_dc1"      : "dc1_valid and dc1_store_data_bypass_e4_c1",
+        "e4_dc2"      : "dc2_valid and dc2_store_data_bypass_e4_c2",
+        "e4_dc3"      : "dc3_valid and dc3_store_data_bypass_e4_c3",
+    })
+    return paths
+
+BYPASS_PATHS = _bypassPaths()
+
+# first and last cycle of a window, the whole trace by default
+def _cycleWindow(source, first=None, last=None):
+    first = 0 if first is None else max(0, first)
+    last = source.final_cycle if last is None else min(source.final_cycle, last)
+    return first, last
+
+# cycles each forwarding path of BYPASS_PATHS is used in, within a window of
+# cycles or the whole trace
+def bypassStatistics(source, first=None, last=None):
+    first, last = _cycleWindow(source, first, last)
+    return {name: source.getConditionIndex(SignalCondition(text, source.signals)).count(first, last) for name, text in BYPASS_PATHS.items()}
+
+# statistics of a run, or of a window of its cycles, counted on the change arrays
+# of the signals rather than cycle by cycle. With a disassembly, retired
+# instructions are also counted by mnemonic
+def pipelineStatistics(source, disassembly=None, first=None, last=None):
+    first, last = _cycleWindow(source, first, last)
+    cycles = max(last - first + 1, 0)
+    indexes = {name: source.getConditionIndex(SignalCondition(text, source.signals)) for name, text in PIPELINE_CONDITIONS.items()}
+    counts = {name: index.count(first, last) for name, index in indexes.items()}
+    events = lambda index: int(((index.starts >= first) & (index.starts <= last)).sum())
+    ratio = lambda count: count / cycles if cycles > 0 else 0.0
+
+    stats = {
+        "first_cycle" : first,
+        "last_cycle"  : last,
+        "cycles"      : cycles,
+        "ipc" : {
+            "i0"    : ratio(counts["i0_retired"]),
+            "i1"    : ratio(counts["i1_retired"]),
+            "total" : ratio(counts["i0_retired"] + counts["i1_retired"]),
+        },
+        "decode_low" : {
+            "i0" : ratio(counts["i0_decode_low"]),
+            "i1" : ratio(counts["i1_decode_low"]),
+        },
+        "freeze" : {
+            "count"  : events(indexes["freeze"]),
+            "cycles" : counts["freeze"],
+        },
+        "flush" : {
+            "final_e3" : events(indexes["flush_final_e3"]),
+            "lower_wb" : events(indexes["flush_lower_wb"]),
+        },
+        "lsu_occupancy" : {"dc{}".format(i): ratio(counts["dc{}_valid".format(i)]) for i in range(1, 6)},
+        "bypass" : bypassStatistics(source, first, last),
+    }
+
+    if disassembly is not None:
+        mnemonics = {}
+        for p in range(2):
+            retired = indexes["i{}_retired".format(p)].cycles()
+            retired = retired[(retired >= first) & (retired <= last)]
+            pcs, amounts = np.unique(source.sampleKey("i{}_pc_e5".format(p), retired) << 1, return_counts=True)
+            for pc, count in zip(pcs.tolist(), amounts.tolist()):
+                mnemonic = disassembly.getMnemonic(pc)
+                mnemonics[mnemonic] = mnemonics.get(mnemonic, 0) + count
+        stats["retired_mnemonics"] = dict(sorted(mnemonics.items(), key=lambda item: -item[1]))
+    return stats
+
+# ===[ Cycle Table ]=======================================
+# The decoded pipeline state of a range of cycles as a structured array, one row
+# per cycle with the fields of CycleFrame (and their [pipe][stage] shapes) plus
+# the cycle, its time and whether each path of BYPASS_PATHS is used. Decoded on
+# whole columns of the signals, CYCLE_TABLE_CHUNK cycles at a time
+CYCLE_TABLE_CHUNK = 4096
+
+CYCLE_TABLE_DTYPE = np.dtype([
+    ("cycle", np.int64), ("time", np.int64),
+    ("ifu_pc", np.uint32, (2,)),
+    ("ib_valid", np.bool_, (4,)), ("ib_copy", np.bool_, (4,)), ("ib_write", np.bool_, (2, 4)), ("ib_pc", np.uint64, (4,)),
+    ("decode", np.bool_, (2,)), ("rs_bypass", np.uint16, (2, 2)), ("gpr_read", np.uint8, (2, 2)),
+    ("stage_valid", np.bool_, (2, 5)), ("stage_copy", np.bool_, (2, 5)), ("stage_pc", np.uint32, (2, 5)),
+    ("stage_rd", np.uint8, (2, 5)), ("stage_class", np.uint8, (2, 5)),
+    ("wb_buffer_valid", np.bool_, (2,)), ("wb_buffer_rs1", np.bool_, (2,)), ("wb_buffer_rs2", np.bool_, (2,)),
+    ("bype2", np.uint8, (2, 2)), ("bype3", np.uint8, (2, 2)),
+    ("lsu_valid", np.bool_, (5,)), ("mul_valid", np.bool_, (3,)), ("load_mul_bypass", np.bool_, (2,)),
+    ("dc3_dc2_rs1", np.bool_), ("dc3_dc2_rs2", np.bool_), ("dc3_dc3", np.bool_), ("e2_dc3", np.bool_), ("e4_dc", np.bool_, (3,)),
+    ("freeze", np.bool_), ("flush_final_e3", np.bool_), ("flush_lower_wb", np.bool_), ("nonblock_load_wen", np.bool_), ("faultless", np.bool_),
+    ("gpr", np.uint32, (32,)), ("gpr_write", np.uint8, (2,)),
+    ("bypass", np.bool_, (len(BYPASS_PATHS),)),
+])
+
+# rows of the cycles first..last (the whole trace by default)
+def cycleTable(source, first=None, last=None):
+    first, last = _cycleWindow(source, first, last)
+    keys = list(source.signals)
+    paths = [SignalCondition(text, source.signals) for text in BYPASS_PATHS.values()]
+    table = np.zeros(max(last - first + 1, 0), dtype=CYCLE_TABLE_DTYPE)
+    for cycles, rows in source.iterColumns(keys, first, last, CYCLE_TABLE_CHUNK):
+        columns = dict(zip(keys, rows.T))
+        block = table[cycles[0] - first:cycles[-1] - first + 1]
+        block["cycle"] = cycles
+        block["time"] = source.edges[cycles]
+        _decodeColumns(block, columns)
+        with np.errstate(all="ignore"):
+            for i, path in enumerate(paths):
+                block["bypass"][:, i] = path._evaluate(path._tree, [columns[key] for key in path.keys]) != 0
+    return table
+
+# fills the CycleFrame fields of block from the signal columns, see CycleFrame
+def _decodeColumns(block, c):
+    stack = lambda names: np.stack([c[name] for name in names], axis=-1)
+    bits = lambda column, count: ((column[:, None] >> np.arange(count)) & 1).astype(bool)
+    pipes = lambda form: np.stack([stack([form(p, s) for s in range(1, 6)]) for p in range(2)], axis=1)
+
+    block["ifu_pc"] = stack(["ifu_i0_pc", "ifu_i1_pc"]) << 1
+
+    # instruction buffer
+    block["ib_valid"] = bits(c["ibval"], 4)
+    block["ib_copy"]  = stack(["ic{}".format(i) for i in range(4)]) != 0
+    block["ib_write"] = np.stack([bits(c["i0_wen_shifted"], 4), bits(c["i1_wen_shifted"] << 1, 4)], axis=1)
+    block["ib_pc"]    = np.stack([c["dec_i0_pc_d"] << 1, c["dec_i1_pc_d"] << 1, c["pc2"] & ~1, c["pc3"] & ~1], axis=-1)
+
+    # decode
+    decode = stack(["dec_i0_decode_d", "dec_i1_decode_d"]) != 0
+    block["decode"] = decode
+    block["rs_bypass"] = np.stack([stack(["i0_rs1bypass", "i0_rs2bypass"]), stack(["i1_rs1bypass", "i1_rs2bypass"])], axis=1)
+    for p in range(2):
+        for r in range(2):
+            name = "i{}_rs{}".format(p, r+1)
+            read = decode[:, p] & (c[name + "_bypass_en"] == 0) & (c[name + "_en_d"] != 0)
+            block["gpr_read"][:, p, r] = np.where(read, c[name], 0)
+
+    # execution stages
+    valid = pipes(lambda p, s: "e{}d.i{}valid".format(s, p)) != 0
+    block["stage_valid"] = valid
+    block["stage_copy"]  = (pipes(lambda p, s: "i{}_e{}_copy".format(p, s)) != 0) & valid
+    block["stage_pc"]    = pipes(lambda p, s: "i{}_pc_e{}".format(p, s)) << 1
+    block["stage_rd"]    = pipes(lambda p, s: "e{}_i{}_rd".format(s, p))
+    for p in range(2):
+        for s in range(5):
+            block["stage_class"][:, p, s] = _decodeStageClasses(c, "e{}".format(s+1), "i{}".format(p))
+
+    block["wb_buffer_valid"] = stack(["i0_wb_buffer_val_q", "i1_wb_buffer_val_q"]) != 0
+    for r in range(2):
+        block["wb_buffer_rs{}".format(r+1)] = np.stack([(c["i0_rs{}_depend_i{}_buf".format(r+1, b)] != 0) | (c["i1_rs{}_depend_i{}_buf".format(r+1, b)] != 0) for b in range(2)], axis=-1)
+
+    # E2/E3 bypass selects, the i1 E3 selects only count for a valid instruction
+    block["bype2"] = np.stack([stack(["e2d.i{}rs{}bype2".format(p, r+1) for r in range(2)]) for p in range(2)], axis=1)
+    block["bype3"][:, 0] = stack(["e3d.i0rs1bype3", "e3d.i0rs2bype3"])
+    block["bype3"][:, 1] = np.where((c["e3d.i1valid"] != 0)[:, None], stack(["e3d.i1rs1bype3", "e3d.i1rs2bype3"]), 0)
+
+    # LSU / MUL
+    lsu_valid = stack(["dc{}_valid".format(i+1) for i in range(5)]) != 0
+    block["lsu_valid"] = lsu_valid
+    block["mul_valid"] = stack(["valid_e{}".format(i+1) for i in range(3)]) != 0
+    block["load_mul_bypass"] = stack(["load_mul_rs1_bypass_e1", "load_mul_rs2_bypass_e1"]) != 0
+    block["dc3_dc2_rs1"] = (c["dc1_ldst_bypass"] != 0) & lsu_valid[:, 0]
+    block["dc3_dc2_rs2"] = (c["dc1_store_data_bypass_c1"] != 0) & lsu_valid[:, 0]
+    block["dc3_dc3"]     = (c["dc2_store_data_bypass_c2"] != 0) & lsu_valid[:, 1]
+    block["e2_dc3"]      = (c["dc2_store_data_bypass_i0_e2_c2"] != 0) & lsu_valid[:, 1]
+    block["e4_dc"]       = (stack(["dc{}_store_data_bypass_e4_c{}".format(i+1, i+1) for i in range(3)]) != 0) & lsu_valid[:, :3]
+
+    # control
+    for name in ("freeze", "flush_final_e3", "flush_lower_wb", "nonblock_load_wen", "faultless"):
+        block[name] = c[name] != 0
+
+    # GPRs and the register written back by each pipe (0 = none)
+    block["gpr"][:, 1:] = stack(["x{}".format(i) for i in range(1, 32)])
+    enabled = np.concatenate((np.zeros((len(block), 1), dtype=bool), stack(["x{}_en".format(i) for i in range(1, 32)]) != 0), axis=1)
+    rows = np.arange(len(block))
+    for p in range(2):
+        rd = c["e5_i{}_rd".format(p)]
+        write = (c["i{}_wen_wb".format(p)] != 0) & (rd != 0) & enabled[rows, rd & 31]
+        block["gpr_write"][:, p] = np.where(write, rd, 0)
+
+# CycleFrame._decodeStageClass on columns
+def _decodeStageClasses(c, stage, pipe):
+    alu = c["{}_{}c.alu".format(pipe, stage)] != 0
+    sec = c["{}_{}c.sec".format(pipe, stage)] != 0
+    conditions, choices = [c[stage + "d." + pipe + "valid"] == 0], [0]
+    if stage != "e5":
+        for i, branch in enumerate(STAGE_BRANCHES):
+            conditions.append((alu | sec) & (c["{}_{}_{}".format(pipe, stage, branch)] != 0))
+            choices.append(STAGE_CLASSES.index("BEQ") + i)
+    conditions += [alu, sec, c["{}_{}c.load".format(pipe, stage)] != 0, c["{}_{}c.mul".format(pipe, stage)] != 0]
+    choices += [STAGE_CLASSES.index("ALU"), STAGE_CLASSES.index("SEC"), STAGE_CLASSES.index("LOAD"), STAGE_CLASSES.index("MUL")]
+    return np.select(conditions, choices, 0)
+
+# ===[ Retire Index ]======================================
+# Every retired instruction in program order, i0 before i1 of the same cycle:
+# the cycle it retires in, its PC and the GPR it writes back (0 for none).
+# Position and cycle lookups are a single searchsorted, PC lookups search the
+# retirements of that PC in a copy sorted by PC
+RETIRE_KEYS = ("e5d.i0valid", "e5d.i1valid", "freeze", "i0_pc_e5", "i1_pc_e5", "e5_i0_rd", "e5_i1_rd", "i0_wen_wb", "i1_wen_wb")
+
+class RetireIndex():
+    def __init__(self, cycles, pcs, rds):
+        self.cycles = cycles
+        self.pcs = pcs
+        self.rds = rds
+        # positions grouped by PC, in program order within a PC
+        order = np.argsort(pcs, kind="stable")
+        self._pc_sorted = pcs[order]
+        self._pc_cycles = cycles[order]
+        self._pc_positions = order
+
+    @classmethod
+    def fromSource(cls, source):
+        cycles, pcs, rds, pipes = [], [], [], []
+        for p in range(2):
+            retired = source.getConditionIndex(SignalCondition(PIPELINE_CONDITIONS["i{}_retired".format(p)], source.signals)).cycles()
+            written = source.sampleKey("i{}_wen_wb".format(p), retired) != 0
+            cycles.append(retired)
+            pcs.append((source.sampleKey("i{}_pc_e5".format(p), retired) << 1) & 0xFFFFFFFF)
+            rds.append(np.where(written, source.sampleKey("e5_i{}_rd".format(p), retired) & 31, 0))
+            pipes.append(np.full(len(retired), p))
+        order = np.lexsort((np.concatenate(pipes), np.concatenate(cycles)))
+        return cls(np.concatenate(cycles)[order], np.concatenate(pcs)[order].astype(np.uint32), np.concatenate(rds)[order].astype(np.uint8))
+
+    def __len__(self):
+        return len(self.cycles)
+
+    # (cycle, PC, written GPR) of the instruction retired at a position
+    def entry(self, position):
+        return int(self.cycles[position]), int(self.pcs[position]), int(self.rds[position])
+
+    # cycle the Nth instruction (from 0) retires in, None past the last one
+    def nth(self, position):
+        return int(self.cycles[position]) if 0 <= position < len(self.cycles) else None
+
+    # number of instructions retired before cycle, the position of the first
+    # one retiring at or after it
+    def position(self, cycle):
+        return int(np.searchsorted(self.cycles, cycle, side="left"))
+
+    # position of the next instruction at pc retiring after cycle (the previous
+    # one retiring before it), None if there is none
+    def nextPC(self, pc, cycle):
+        low, high = self._pcRange(pc)
+        i = low + int(np.searchsorted(self._pc_cycles[low:high], cycle, side="right"))
+        return int(self._pc_positions[i]) if i < high else None
+
+    def previousPC(self, pc, cycle):
+        low, high = self._pcRange(pc)
+        i = low + int(np.searchsorted(self._pc_cycles[low:high], cycle, side="left")) - 1
+        return int(self._pc_positions[i]) if i >= low else None
+
+    def _pcRange(self, pc):
+        return int(np.searchsorted(self._pc_sorted, pc, side="left")), int(np.searchsorted(self._pc_sorted, pc, side="right"))
+
+# ===[ GPR Write Index ]===================================
+# Every write of x1..x31: the cycles its write enable is high in, the value it
+# reads the cycle after and the PC of the instruction writing it back, -1 when
+# neither pipe does (non-blocking loads). Lookups are a searchsorted over the
+# write cycles of the register
+GPR_WRITE_KEYS = tuple("x{}{}".format(i, suffix) for i in range(1, 32) for suffix in ("", "_en")) + \
+                 ("i0_pc_e5", "i1_pc_e5", "e5_i0_rd", "e5_i1_rd", "i0_wen_wb", "i1_wen_wb")
+
+class GPRWriteIndex():
+    def __init__(self, cycles, values, pcs):
+        # per register, x0 is never written
+        self.cycles = cycles
+        self.values = values
+        self.pcs = pcs
+
+    @classmethod
+    def fromSource(cls, source):
+        cycles, values, pcs = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+        for i in range(1, 32):
+            written = source.getConditionIndex(SignalCondition("x{}_en".format(i), source.signals)).cycles()
+            cycles.append(written)
+            values.append(source.sampleKey("x{}".format(i), np.minimum(written + 1, source.final_cycle)))
+            # the younger i1 wins when both pipes write the register
+            pc = np.full(len(written), -1, dtype=np.int64)
+            for p in range(2):
+                writes = (source.sampleKey("i{}_wen_wb".format(p), written) != 0) & (source.sampleKey("e5_i{}_rd".format(p), written) & 31 == i)
+                pc = np.where(writes, (source.sampleKey("i{}_pc_e5".format(p), written) << 1) & 0xFFFFFFFF, pc)
+            pcs.append(pc)
+        return cls(cycles, values, pcs)
+
+    # (cycle, value, PC) of the write the value a register holds at cycle comes
+    # from, the last one before it, None if it was not written before
+    def lastWrite(self, register, cycle):
+        i = int(np.searchsorted(self.cycles[register], cycle, side="left")) - 1
+        return self._write(register, i) if i >= 0 else None
+
+    # (cycles, values, PCs) of the writes of a register in the cycles first..last
+    def writes(self, register, first=None, last=None):
+        cycles = self.cycles[register]
+        low = int(np.searchsorted(cycles, first, side="left")) if first is not None else 0
+        high = int(np.searchsorted(cycles, last, side="right")) if last is not None else len(cycles)
+        return cycles[low:high], self.values[register][low:high], self.pcs[register][low:high]
+
+    def count(self, register):
+        return len(self.cycles[register])
+
+    def _write(self, register, i):
+        return int(self.cycles[register][i]), int(self.values[register][i]), int(self.pcs[register][i])
+
+# ===[ Trace Diff ]========================================
+# Where two runs of the same program diverge. Aligned by cycle, the fields of
+# DIFF_FIELDS are compared by a merge of the change points of both runs, so only
+# cycles where a field changes in either run are looked at. Aligned by retired
+# instructions, the retired PCs are compared in order and the GPRs after every
+# cycle both runs end with the same instruction retired.
+# Either way each field gets an EventIndex of the cycles (of the first run) it
+# differs in
+def _diffFields():
+    fields = {}
+    # IB slots: 0 while empty, PC + 1 otherwise
+    for i, pc in enumerate(("dec_i0_pc_d", "dec_i1_pc_d", "pc2 >> 1", "pc3 >> 1")):
+        fields["ib{}".format(i)] = "(ibval >> {} & 1) * (({}) + 1)".format(i, pc)
+    fields.update({"e{}d.i{}valid".format(s, p): "e{}d.i{}valid".format(s, p) for p in range(2) for s in range(1, 6)})
+    fields.update({"x{}".format(i): "x{}".format(i) for i in range(1, 32)})
+    for p in range(2):
+        for r in range(1, 3):
+            fields["i{}_rs{}bypass".format(p, r)] = "i{}_rs{}bypass".format(p, r)
+            fields["e2d.i{}rs{}bype2".format(p, r)] = "e2d.i{}rs{}bype2".format(p, r)
+            # the i1 E3 selects only count for a valid instruction, as in CycleFrame
+            fields["e3d.i{}rs{}bype3".format(p, r)] = "e3d.i0rs{}bype3".format(r) if p == 0 else "e3d.i1valid * e3d.i1rs{}bype3".format(r)
+    return fields
+
+DIFF_FIELDS = _diffFields()
+DIFF_ALIGNMENTS = ("cycle", "retire")
+
+class TraceDiff():
+    def __init__(self, first, second, align="cycle"):
+        if align not in DIFF_ALIGNMENTS:
+            raise ValueError("Unknown alignment: {}".format(align))
+        self.first = first
+        self.second = second
+        self.align = align
+        # cycles of the first run compared with the second
+        self.cycles = np.arange(min(first.final_cycle, second.final_cycle) + 1, dtype=np.int64)
+        if align == "cycle":
+            self.fields = self._diffCycles()
+        else:
+            self.fields = self._diffRetired()
+        self.index = EventIndex.union(list(self.fields.values()))
+
+    def _diffCycles(self):
+        fields = {}
+        for name, text in DIFF_FIELDS.items():
+            changes = [source.getConditionChanges(SignalCondition(text, source.signals)) for source in (self.first, self.second)]
+            # merge of the change points of both runs, the fields only differ from one of them on
+            points = np.unique(np.concatenate([np.zeros(1, dtype=np.int64)] + [cycles for cycles, _ in changes]))
+            points = points[points < len(self.cycles)]
+            values = [change[1][np.searchsorted(change[0], points, side="right") - 1] for change in changes]
+            fields[name] = EventIndex.fromChanges([points], [values[0] != values[1]], self.cycles)
+        return fields
+
+    def _diffRetired(self):
+        retired, other_retired = self.first.getRetireIndex(), self.second.getRetireIndex()
+        cycles, pcs, other_cycles, other_pcs = retired.cycles, retired.pcs, other_retired.cycles, other_retired.pcs
+        self._retired = (cycles, other_cycles)
+        count = min(len(cycles), len(other_cycles))
+        fields = {}
+
+        # retired PCs in order
+        fields["retired_pc"] = self._retiredIndex(cycles[:count], pcs[:count] != other_pcs[:count])
+        # from the first instruction only one of the runs retires
+        if len(cycles) > count:
+            extra = cycles[count:count+1]
+        elif len(other_cycles) > count:
+            extra = cycles[-1:] + 1 if count else np.zeros(1, dtype=np.int64)
+        else:
+            extra = np.zeros(0, dtype=np.int64)
+        fields["retired_count"] = self._retiredIndex(np.append(np.zeros(1, dtype=np.int64), extra), np.array([False] + [True] * len(extra)))
+
+        # GPRs the cycle after a retirement that is the last of its cycle in both runs
+        last = np.ones(count, dtype=bool)
+        last[:-1] = (cycles[1:count] != cycles[:count-1]) & (other_cycles[1:count] != other_cycles[:count-1])
+        after = np.minimum(cycles[:count][last] + 1, self.first.final_cycle)
+        other_after = np.minimum(other_cycles[:count][last] + 1, self.second.final_cycle)
+        for i in range(1, 32):
+            key = "x{}".format(i)
+            differs = self.first.sampleKey(key, after) != self.second.sampleKey(key, other_after)
+            fields[key] = self._retiredIndex(after, differs)
+        return fields
+
+    # EventIndex of the stretches from each compared cycle of the first run to the
+    # next, differing if any comparison of the cycle does
+    def _retiredIndex(self, cycles, differs):
+        keep = cycles < len(self.cycles)
+        cycles, starts = np.unique(cycles[keep], return_index=True)
+        differs = np.logical_or.reduceat(differs[keep], starts) if len(cycles) else differs[keep]
+        return EventIndex.fromChanges([cycles], [differs], self.cycles)
+
+    # first cycle of the first run either field differs from, after cycle
+    def nextDivergence(self, cycle=-1):
+        return self.index.next(cycle)
+
+    def previousDivergence(self, cycle):
+        return self.index.previous(cycle)
+
+    # names of the fields differing at a cycle of the first run
+    def fieldsAt(self, cycle):
+        return [name for name, index in self.fields.items() if index.active(cycle)]
+
+    # cycle of the second run shown next to a cycle of the first: the same one, or
+    # the one as far past the same number of retired instructions
+    def alignedCycle(self, cycle):
+        if self.align == "cycle":
+            return min(cycle, self.second.final_cycle)
+        cycles, other_cycles = self._retired
+        count = int(np.searchsorted(cycles, cycle, side="left"))
+        if count == 0:
+            return min(cycle, int(other_cycles[0]) if len(other_cycles) else self.second.final_cycle)
+        if count > len(other_cycles):
+            return self.second.final_cycle
+        since = cycle - int(cycles[count-1])
+        until = int(other_cycles[count]) - int(other_cycles[count-1]) if count < len(other_cycles) else since
+        return min(int(other_cycles[count-1]) + min(since, until), self.second.final_cycle)
+
+# ===[ Kanata Export ]=====================================
+# Lifetime of every instruction (IB slot, E1-E5 of its pipe, writeback) as a
+# Kanata log for pipeline viewers such as Konata. Instructions are followed from
+# cycle to cycle by their PC: every occupied position takes the instruction with
+# that PC from the position feeding it (the IB slot it shifts up from, the
+# previous stage) or keeps its own, oldest positions first. A flush kills the
+# instructions younger than the flushing one (E3 or E5). Instructions leaving
+# E5 retire, any other that disappears is flushed. The run is streamed once,
+# only the instructions in flight are held and cycles where none of the signals
+# change are skipped
+class KanataExporter():
+    def __init__(self, source, disassembly=None):
+        self.source = source
+        self.disassembly = disassembly
+        # positions oldest first: E5..E1 of i0 and i1, then IB0..IB3
+        self.stages = ["E{}".format(s) for s in range(5, 0, -1) for p in range(2)] + ["IB"] * 4
+        self.keys = []
+        for s in range(5, 0, -1):
+            for p in range(2):
+                self.keys += ["e{}d.i{}valid".format(s, p), "i{}_pc_e{}".format(p, s)]
+        self.keys += ["ibval", "dec_i0_pc_d", "dec_i1_pc_d", "pc2", "pc3", "dec_i0_decode_d", "dec_i1_decode_d",
+                      "freeze", "i0_wen_wb", "i1_wen_wb", "e5_i0_rd", "e5_i1_rd", "flush_final_e3", "flush_lower_wb"]
+        # column of every key in the rows of iterColumns
+        self.column = {key: i for i, key in enumerate(self.keys)}
+        # columns of the valid bit and PC of positions E5..E1, IB PCs and per slot signals
+        self._valid  = [self.column["e{}d.i{}valid".format(s, p)] for s in range(5, 0, -1) for p in range(2)]
+        self._pc     = [self.column["i{}_pc_e{}".format(p, s)] for s in range(5, 0, -1) for p in range(2)]
+        self._ib     = [self.column[key] for key in ("dec_i0_pc_d", "dec_i1_pc_d", "pc2", "pc3")]
+        self._decode = [self.column["dec_i{}_decode_d".format(p)] for p in range(2)]
+        self._wen    = [self.column["i{}_wen_wb".format(p)] for p in range(2)]
+        self._rd     = [self.column["e5_i{}_rd".format(p)] for p in range(2)]
+
+    # PC at every position of a row, None where it is empty
+    def _occupancy(self, row):
+        pcs = [(row[self._pc[i]] << 1) & 0xFFFFFFFF if row[self._valid[i]] else None for i in range(10)]
+        ibval = row[self.column["ibval"]]
+        ib = [row[self._ib[0]] << 1, row[self._ib[1]] << 1, row[self._ib[2]] & ~1, row[self._ib[3]] & ~1]
+        return pcs + [ib[k] & 0xFFFFFFFF if (ibval >> k) & 1 else None for k in range(4)]
+
+    # previous positions an instruction at pos may come from, most likely first
+    def _sources(self, pos, previous):
+        if pos < 10:
+            # the previous stage of the pipe, for E1 the IB slot it decodes from
+            move = [pos + 2]
+        else:
+            # the IB shifts up by the instructions decoded the cycle before
+            decoded = [previous[column] for column in self._decode]
+            shift = decoded[0] + decoded[1] if decoded[0] else 0
+            k = pos - 10
+            move = [10 + k + n for n in (shift, 1, 2) if n and k + n < 4]
+        frozen = previous[self.column["freeze"]] if pos < 10 else not any(previous[column] for column in self._decode)
+        return [pos] + move if frozen else move + [pos]
+
+    def _label(self, pc):
+        if self.disassembly is None:
+            return "{:08x}".format(pc)
+        symbol = self.disassembly.getSymbolText(pc)
+        return "{:08x}{}: {}".format(pc, " <{}>".format(symbol) if symbol else "", self.disassembly._getInstruction(pc))
+
+    # writes the log of cycles first..last (the whole trace by default) to fd,
+    # returns the number of instructions seen
+    def export(self, fd, first=None, last=None):
+        live = [None] * 14          # [id, stage, written back] per position
+        pcs = [None] * 14
+        previous = None
+        shown = None                # cycle of the last written line
+        created = retired = 0
+
+        for cycles, rows in self.source.iterColumns(self.keys, first, last):
+            changed = np.ones(len(rows), dtype=bool)
+            changed[1:] = (rows[1:] != rows[:-1]).any(axis=1)
+            if previous is not None:
+                changed[0] = bool((rows[0] != np.asarray(previous)).any())
+            for i in np.flatnonzero(changed).tolist():
+                row = rows[i].tolist()
+                cycle = int(cycles[i])
+                lines = ["C=\t{}".format(cycle)] if shown is None else ["C\t{}".format(cycle - shown)]
+                if shown is None:
+                    lines.insert(0, "Kanata\t0004")
+                current = self._occupancy(row)
+                claimed = [False] * 14
+                moved = [None] * 14
+                # positions flushed the cycle before: IB to E2 or IB to E4
+                flush_e3 = previous is not None and previous[self.column["flush_final_e3"]]
+                flush_wb = previous is not None and previous[self.column["flush_lower_wb"]]
+                if flush_e3 or flush_wb:
+                    for pos in range(2 if flush_wb else 6, 14):
+                        claimed[pos] = True
+                for pos in range(14):
+                    pc = current[pos]
+                    if pc is None:
+                        continue
+                    instruction = None
+                    if previous is not None:
+                        for source in self._sources(pos, previous):
+                            if not claimed[source] and live[source] is not None and pcs[source] == pc:
+                                claimed[source] = True
+                                instruction = live[source]
+                                break
+                    if instruction is None:
+                        instruction = [created, self.stages[pos], False]
+                        lines += ["I\t{0}\t{0}\t0".format(created), "L\t{}\t0\t{}".format(created, self._label(pc)),
+                                  "S\t{}\t0\t{}".format(created, self.stages[pos])]
+                        created += 1
+                    elif instruction[1] != self.stages[pos]:
+                        instruction[1] = self.stages[pos]
+                        lines.append("S\t{}\t0\t{}".format(instruction[0], instruction[1]))
+                    # writeback of E5, positions 0 and 1
+                    if pos < 2 and row[self._wen[pos]] and not instruction[2]:
+                        instruction[2] = True
+                        lines.append("L\t{}\t1\twb x{}".format(instruction[0], row[self._rd[pos]]))
+                    moved[pos] = instruction
+                for pos in range(14):
+                    if live[pos] is not None and live[pos] not in moved:
+                        if pos < 2:
+                            lines.append("R\t{}\t{}\t0".format(live[pos][0], retired))
+                            retired += 1
+                        else:
+                            lines.append("R\t{}\t0\t1".format(live[pos][0]))
+                live, pcs, previous = moved, current, row
+                if len(lines) > 1:
+                    fd.write("\n".join(lines) + "\n")
+                    shown = cycle
+        return created
+
+# ===[ Disassembly parser ]================================
+# objdump disassembly as integer PCs sorted in an array, with parallel arrays of
+# instruction sizes, mnemonics and operands. A lookup is a bisect and also finds
+# the instruction a PC points into. Symbols (<label>: lines) are kept sorted by
+# address as well, so the function enclosing a PC is a range search.
+# The file is read in blocks and every line is matched once by DISASSEMBLY_LINE,
+# either as a symbol (first two groups) or as an instruction (last four groups)
+DISASSEMBLY_LINE  = re.compile(r"^(?:([0-9a-fA-F]+) <(.+)>:|[ \t]*([0-9a-fA-F]+):[ \t]+([0-9a-fA-F]+)[ \t]+(\w\S*)(.*))", re.M)
+DISASSEMBLY_BLOCK = 4 * 1024 * 1024
+# what a query naming a symbol looks like
+DISASSEMBLY_SYMBOL = r"[\w.$@]+"
+
+class DisassemblyHandler():
+    # with background, the file is parsed by a thread and every instruction
+    # reads as "loading…" until it is done, see isLoading()
+    def __init__(self, file, background=False):
+        # address of every <label>: line
+        self.symbols = {}
+        self._setInstructions(array('Q'), array('B'), [], [])
+        self._loader = None
+        if background:
+            self._loader = threading.Thread(target=self._parseFile, args=(file,), daemon=True)
+            self._loader.start()
+        else:
+            self._parseFile(file)
+
+    def _parseFile(self, file):
+        symbols = {}
+        pcs, sizes, mnemonics, operands = array('Q'), array('B'), [], []
+        rest = ""
+        with open(file, "r") as fd:
+            while True:
+                block = fd.read(DISASSEMBLY_BLOCK)
+                if block:
+                    # the last line of a block may be cut, it is completed by the next one
+                    block = rest + block
+                    end = block.rfind("\n") + 1
+                    block, rest = block[:end], block[end:]
+                else:
+                    block, rest = rest, ""
+                for symbol_pc, symbol, pc, encoding, mnemonic, rest_of_line in DISASSEMBLY_LINE.findall(block):
+                    if symbol_pc:
+                        symbols[symbol] = int(symbol_pc, 16)
+                    else:
+                        pcs.append(int(pc, 16))
+                        # encodings are printed as one hex word, 4 digits for compressed instructions
+                        sizes.append(len(encoding) // 2)
+                        mnemonics.append(mnemonic)
+                        operands.append(" ".join(rest_of_line.split()))
+                if not block and not rest:
+                    break
+
+        # objdump prints sections in address order, anything else is sorted here
+        addresses = np.frombuffer(pcs, dtype=np.uint64)
+        if (addresses[1:] < addresses[:-1]).any():
+            order = np.argsort(addresses, kind="stable").tolist()
+            pcs = array('Q', [pcs[i] for i in order])
+            sizes = array('B', [sizes[i] for i in order])
+            mnemonics = [mnemonics[i] for i in order]
+            operands = [operands[i] for i in order]
+        self.symbols = symbols
+        self._setInstructions(pcs, sizes, mnemonics, operands)
+
+    def _setInstructions(self, pcs, sizes, mnemonics, operands):
+        self.pcs       = pcs
+        self.sizes     = sizes
+        self.mnemonics = mnemonics
+        self.operands  = operands
+        symbols = sorted(self.symbols.items(), key=lambda symbol: symbol[1])
+        self.symbol_names = [name for name, _ in symbols]
+        self.symbol_pcs   = array('Q', [pc for _, pc in symbols])
+
+    def isLoading(self):
+        return self._loader is not None and self._loader.is_alive()
+
+    # blocks until the whole file is parsed
+    def requireLoaded(self):
+        if self.isLoading():
+            self._loader.join()
+
+    # index of the instruction covering pc, None if there is none
+    def _find(self, pc):
+        i = bisect.bisect_right(self.pcs, pc) - 1
+        if i >= 0 and pc < self.pcs[i] + self.sizes[i]:
+            return i
+        return None
+
+    def _getInstruction(self, pc):
+        if self.isLoading():
+            return "loading…"
+        i = self._find(pc)
+        if i is None:
+            return "invalid"
+        return self.mnemonics[i] + " " + self.operands[i] if self.operands[i] else self.mnemonics[i]
+
+    def getMnemonic(self, pc):
+        if self.isLoading():
+            return "loading…"
+        i = self._find(pc)
+        return self.mnemonics[i] if i is not None else "invalid"
+
+    # function enclosing pc as (name, offset), None before the first symbol
+    def getSymbol(self, pc):
+        if self.isLoading():
+            return None
+        i = bisect.bisect_right(self.symbol_pcs, pc) - 1
+        return (self.symbol_names[i], pc - self.symbol_pcs[i]) if i >= 0 else None
+
+    # "name+0x10" like objdump prints it, "" without a symbol
+    def getSymbolText(self, pc):
+        symbol = self.getSymbol(pc)
+        if symbol is None:
+            return ""
+        return symbol[0] + "+0x{:x}".format(symbol[1]) if symbol[1] else symbol[0]